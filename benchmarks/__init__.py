@@ -0,0 +1,7 @@
+"""
+Benchmark suite for the analyst service.
+
+``synthetic`` generates deterministic parking data at fixed scales, ``loader``
+puts it into a local Postgres, ``standin`` serves it from memory when no
+database is available and ``run`` times the hot paths and writes a JSON report.
+"""
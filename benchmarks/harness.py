@@ -0,0 +1,128 @@
+"""
+Timing, reporting and regression checks for the benchmark runner.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark; ``stats`` is empty when it was skipped or failed."""
+
+    name: str
+    group: str
+    repeat: int
+    timings: List[float] = field(default_factory=list)
+    stats: Dict[str, float] = field(default_factory=dict)
+    params: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    skipped: Optional[str] = None
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Summary statistics in seconds (plus throughput) for a list of timings"""
+
+    values = np.asarray(timings, dtype=float)
+    median = float(np.median(values))
+    return {
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+        "median": median,
+        "p95": float(np.percentile(values, 95)),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "ops_per_second": 1.0 / median if median > 0 else 0.0,
+    }
+
+
+async def measure(
+    name: str,
+    group: str,
+    func: Callable[[], Awaitable[Any]],
+    repeat: int = 5,
+    warmup: int = 1,
+    params: Optional[Dict[str, Any]] = None
+) -> BenchmarkResult:
+    """Await ``func`` ``warmup`` times untimed, then ``repeat`` times timed"""
+
+    result = BenchmarkResult(name=name, group=group, repeat=repeat, params=params or {})
+    try:
+        for _ in range(warmup):
+            await func()
+        for _ in range(repeat):
+            start = perf_counter()
+            await func()
+            result.timings.append(perf_counter() - start)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+
+    result.stats = summarize(result.timings)
+    return result
+
+
+def _git_sha() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_info() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_sha": _git_sha(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def build_report(results: List[BenchmarkResult], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "metadata": {**environment_info(), **metadata},
+        "results": [asdict(result) for result in results],
+    }
+
+
+def write_report(report: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, default=str))
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Benchmarks whose median got slower than ``baseline`` by more than ``threshold`` (0.2 = 20%)"""
+
+    previous = {
+        (result["group"], result["name"]): result["stats"]
+        for result in baseline.get("results", []) if result.get("stats")
+    }
+
+    regressions = []
+    for result in current.get("results", []):
+        before = previous.get((result["group"], result["name"]))
+        if not before or not result.get("stats") or not before.get("median"):
+            continue
+        change = result["stats"]["median"] / before["median"] - 1.0
+        if change > threshold:
+            regressions.append({
+                "group": result["group"],
+                "name": result["name"],
+                "baseline_median": before["median"],
+                "median": result["stats"]["median"],
+                "change": change,
+            })
+    return regressions
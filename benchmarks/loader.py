@@ -0,0 +1,126 @@
+"""
+Load a synthetic dataset into a disposable Postgres.
+
+Applies the repo migrations, the knowledge base schema files and
+``benchmarks/schema.sql``, streams transactions in with ``COPY`` and derives
+``mart_metrics_daily``/``mart_metrics_hourly`` the way the dbt models do.
+Only ever point this at a throwaway database: ``reset`` drops the public schema.
+"""
+import io
+import logging
+from pathlib import Path
+from time import perf_counter
+from typing import Dict
+
+import asyncpg
+
+from .synthetic import (
+    LOCATION_COLUMNS,
+    TRANSACTION_COLUMNS,
+    SyntheticSpec,
+    generate_knowledge,
+    generate_locations,
+    generate_transactions,
+    transactions_table,
+)
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCHEMA_FILES = [
+    "migrations/0001_core.sql",
+    "migrations/0002_rls_policies.sql",
+    "migrations/0003_elasticity_probe.sql",
+    "migrations/0003_general_threads.sql",
+    "migrations/0005_memory_search.sql",
+    "migrations/0006_price_change_auto_revert.sql",
+    "migrations/0007_rate_change_outbox.sql",
+    "migrations/0008_probe_evaluation.sql",
+    "migrations/0009_probe_runner.sql",
+    "example_industry_knowledge_schema.sql",
+    "parking_kpi_knowledge_schema.sql",
+    "parking_expert_knowledge_schema.sql",
+    "populate_expert_knowledge.sql",
+    "benchmarks/schema.sql",
+]
+
+AMOUNT_SQL = """
+    CASE WHEN ht.parking_amount ~ '^\\$?[0-9]+\\.?[0-9]*$'
+         THEN REPLACE(ht.parking_amount, '$', '')::numeric END
+"""
+
+DAILY_MART_QUERY = f"""
+    INSERT INTO mart_metrics_daily (date, location_id, zone_id, rev, occupancy_pct, avg_ticket)
+    SELECT ht.start_park_date,
+           l.id,
+           'z-' || ht.zone::text,
+           COALESCE(SUM({AMOUNT_SQL}), 0),
+           LEAST(SUM(ht.paid_minutes) / NULLIF(1440.0 * l.capacity, 0), 1),
+           AVG({AMOUNT_SQL})
+    FROM historical_transactions ht
+    LEFT JOIN locations l ON l.zone_id = ht.zone::text
+    GROUP BY ht.start_park_date, l.id, l.capacity, ht.zone
+"""
+
+HOURLY_MART_QUERY = f"""
+    INSERT INTO mart_metrics_hourly (ts, location_id, zone_id, rev, occupancy_pct, avg_ticket)
+    SELECT date_trunc('hour', ht.start_park_date + ht.start_park_time) AT TIME ZONE $1,
+           l.id,
+           'z-' || ht.zone::text,
+           COALESCE(SUM({AMOUNT_SQL}), 0),
+           LEAST(SUM(LEAST(ht.paid_minutes, 60)) / NULLIF(60.0 * l.capacity, 0), 1),
+           AVG({AMOUNT_SQL})
+    FROM historical_transactions ht
+    LEFT JOIN locations l ON l.zone_id = ht.zone::text
+    WHERE ht.start_park_date >= $2::date - 30
+    GROUP BY 1, l.id, l.capacity, ht.zone
+"""
+
+
+async def _copy_frame(conn: asyncpg.Connection, table: str, frame, columns) -> None:
+    buffer = io.BytesIO(frame.to_csv(index=False, header=False, columns=columns).encode())
+    await conn.copy_to_table(table, source=buffer, columns=columns, format="csv")
+
+
+async def load_dataset(dsn: str, spec: SyntheticSpec, tz: str, reset: bool = False) -> Dict[str, float]:
+    """Create the schema and load ``spec``; returns seconds spent per phase"""
+
+    timings: Dict[str, float] = {}
+    conn = await asyncpg.connect(dsn)
+    try:
+        exists = await conn.fetchval("SELECT to_regclass('public.historical_transactions') IS NOT NULL")
+        if exists and not reset:
+            raise RuntimeError("Benchmark database is not empty; pass --reset to recreate it")
+
+        start = perf_counter()
+        await conn.execute("DROP SCHEMA IF EXISTS public CASCADE; CREATE SCHEMA public;")
+        for name in SCHEMA_FILES:
+            await conn.execute((ROOT / name).read_text())
+        timings["schema"] = perf_counter() - start
+
+        start = perf_counter()
+        await _copy_frame(conn, "locations", generate_locations(spec), LOCATION_COLUMNS)
+        for frame in generate_transactions(spec):
+            await _copy_frame(conn, "historical_transactions", transactions_table(frame), TRANSACTION_COLUMNS)
+        timings["transactions"] = perf_counter() - start
+
+        start = perf_counter()
+        for table, rows in generate_knowledge(spec).items():
+            columns = list(rows[0])
+            await conn.copy_records_to_table(
+                table, records=[tuple(row[c] for c in columns) for row in rows], columns=columns
+            )
+        timings["knowledge"] = perf_counter() - start
+
+        start = perf_counter()
+        await conn.execute(DAILY_MART_QUERY)
+        await conn.execute(HOURLY_MART_QUERY, tz, spec.anchor)
+        await conn.execute("ANALYZE")
+        timings["marts"] = perf_counter() - start
+
+        logger.info(f"Loaded {spec.transactions} synthetic transactions ({spec.scale}) in {sum(timings.values()):.1f}s")
+    finally:
+        await conn.close()
+
+    return timings
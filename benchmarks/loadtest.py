@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+HTTP load test for the analyst API with a card-like traffic mix.
+
+Drives ``analyst.main:app`` in-process through ``httpx.ASGITransport`` (the app
+lifespan runs with the scheduler disabled) or a running server via
+``--base-url``. Reports p50/p95/p99 latency, throughput and error rate per
+route template so ``GUNICORN_WORKERS`` and ``DB_POOL_MAX_SIZE`` can be sized
+from measurements.
+
+Usage:
+    # In-process, 20 virtual users for 30s (uses SUPABASE_DB_URL or --dsn)
+    python -m benchmarks.loadtest --users=20 --duration=30
+
+    # Against gunicorn on a local port at a fixed arrival rate
+    python -m benchmarks.loadtest --base-url=http://localhost:8088 --rate=50 --duration=60
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent / 'services' / 'analyst'
+
+# Add services path to allow imports
+sys.path.insert(0, str(SERVICE_DIR))
+
+from analyst.config import settings
+
+from .harness import environment_info, write_report
+
+Request = Tuple[str, str, Dict[str, Any]]
+
+
+@dataclass
+class Session:
+    """Per-run state shared by the route builders."""
+
+    zone_ids: List[str]
+    thread_id: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Route:
+    """A weighted entry in the traffic mix; ``name`` is the route template used for reporting."""
+
+    name: str
+    weight: float
+    build: Callable[[random.Random, Session], Request]
+
+
+def _zone_number(rng: random.Random, session: Session) -> str:
+    return rng.choice(session.zone_ids).replace("z-", "")
+
+
+def _session_counts(rng: random.Random, session: Session) -> Request:
+    filters = rng.choice([
+        {},
+        {"time_filter": rng.choice(["friday_evening", "weekday", "weekend"])},
+        {"day_of_week": rng.choice(["1", "5", "1,2,3,4,5", "0,6"]), "hour_start": 7, "hour_end": 10},
+        {"zone_filter": _zone_number(rng, session)},
+    ])
+    return "GET", "/analytics/session-counts", {"params": filters}
+
+
+def _thread_messages(rng: random.Random, session: Session) -> Request:
+    content = rng.choice([
+        "Why did occupancy drop on Friday evening?",
+        "What rate change would you suggest for mornings?",
+        "Compare this zone to the downtown benchmark.",
+    ])
+    return "POST", f"/threads/{session.thread_id}/messages", {"json": {"role": "user", "content": content}}
+
+
+# Weights approximate what the card issues on load and while a user explores it
+CARD_MIX = [
+    Route("GET /insights/", 25, lambda rng, s: ("GET", "/insights/", {"params": {"limit": 50}})),
+    Route("GET /recommendations/", 20, lambda rng, s: ("GET", "/recommendations/", {"params": {"limit": 50}})),
+    Route("GET /analytics/session-counts", 15, _session_counts),
+    Route("GET /analytics/zone-summary", 5, lambda rng, s: ("GET", "/analytics/zone-summary", {})),
+    Route("GET /analytics/time-patterns", 5, lambda rng, s: (
+        "GET", "/analytics/time-patterns", {"params": {"zone": _zone_number(rng, s)}})),
+    Route("GET /analytics/occupancy-analysis", 4, lambda rng, s: ("GET", "/analytics/occupancy-analysis", {})),
+    Route("GET /analytics/kpi-knowledge", 3, lambda rng, s: (
+        "GET", "/analytics/kpi-knowledge", {"params": {"context": "occupancy,revenue"}})),
+    Route("GET /analytics/expert-analysis/{zone_id}", 4, lambda rng, s: (
+        "GET", f"/analytics/expert-analysis/{rng.choice(s.zone_ids)}", {})),
+    Route("GET /threads/{thread_id}", 6, lambda rng, s: ("GET", f"/threads/{s.thread_id}", {})),
+    Route("POST /threads/{thread_id}/messages", 8, _thread_messages),
+]
+
+
+class LatencyRecorder:
+    """Collects latencies and outcomes per route."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+
+    def record(self, route: str, latency: float, status: Optional[int]) -> None:
+        self.latencies[route].append(latency)
+        self.statuses[route][str(status) if status is not None else "exception"] += 1
+        if status is None or status >= 400:
+            self.errors[route] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        routes = {}
+        for route, values in sorted(self.latencies.items()):
+            routes[route] = _route_stats(values, self.errors[route], elapsed, self.statuses[route])
+
+        all_values = [value for values in self.latencies.values() for value in values]
+        total = _route_stats(all_values, sum(self.errors.values()), elapsed, Counter()) if all_values else {}
+        total.pop("statuses", None)
+        return {"routes": routes, "total": total}
+
+
+def _route_stats(values: List[float], errors: int, elapsed: float, statuses: Counter) -> Dict[str, Any]:
+    ms = np.asarray(values) * 1000
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "error_rate": errors / len(values),
+        "throughput_rps": len(values) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        "max_ms": float(ms.max()),
+        "statuses": dict(statuses),
+    }
+
+
+class LoadTest:
+    """Runs a weighted route mix closed-loop (``users``) or open-loop (``rate`` per second)."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        session: Session,
+        routes: List[Route],
+        users: int = 10,
+        rate: Optional[float] = None,
+        duration: float = 30.0,
+        think_time: float = 0.0,
+        seed: int = 0
+    ):
+        self.client = client
+        self.session = session
+        self.routes = [route for route in routes if self._available(route)]
+        self.weights = [route.weight for route in self.routes]
+        self.users = users
+        self.rate = rate
+        self.duration = duration
+        self.think_time = think_time
+        self.seed = seed
+        self.recorder = LatencyRecorder()
+
+    def _available(self, route: Route) -> bool:
+        return self.session.thread_id is not None or "{thread_id}" not in route.name
+
+    async def _send(self, rng: random.Random, scheduled: Optional[float] = None) -> None:
+        route = rng.choices(self.routes, weights=self.weights)[0]
+        method, path, kwargs = route.build(rng, self.session)
+
+        start = perf_counter() if scheduled is None else scheduled
+        status = None
+        try:
+            response = await self.client.request(method, path, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            pass
+        self.recorder.record(route.name, perf_counter() - start, status)
+
+    async def _user(self, index: int, deadline: float) -> None:
+        rng = random.Random(self.seed + index)
+        while perf_counter() < deadline:
+            await self._send(rng)
+            if self.think_time:
+                await asyncio.sleep(rng.expovariate(1.0 / self.think_time))
+
+    async def _open_loop(self, deadline: float) -> None:
+        # Latency is measured from the scheduled send time so a slow server cannot hide queueing
+        rng = random.Random(self.seed)
+        in_flight = asyncio.Semaphore(self.users)
+        tasks = set()
+        start = perf_counter()
+        sent = 0
+
+        async def _one(scheduled: float):
+            async with in_flight:
+                await self._send(rng, scheduled)
+
+        while True:
+            scheduled = start + sent / self.rate
+            if scheduled >= deadline:
+                break
+            await asyncio.sleep(max(0.0, scheduled - perf_counter()))
+            task = asyncio.create_task(_one(scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            sent += 1
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def run(self) -> Dict[str, Any]:
+        start = perf_counter()
+        deadline = start + self.duration
+        if self.rate:
+            await self._open_loop(deadline)
+        else:
+            await asyncio.gather(*(self._user(i, deadline) for i in range(self.users)))
+        return self.recorder.summary(perf_counter() - start)
+
+
+def dev_token(zone_ids: List[str], ttl_seconds: int = 3600) -> str:
+    from jose import jwt
+
+    now = int(time.time())
+    return jwt.encode(
+        {
+            "sub": "dev-user",
+            "org_id": settings.org_id,
+            "roles": ["admin", "analyst"],
+            "zone_ids": zone_ids,
+            "iss": settings.jwt_issuer,
+            "iat": now,
+            "exp": now + ttl_seconds,
+        },
+        settings.dev_jwt_hs256_secret,
+        algorithm="HS256",
+    )
+
+
+async def _open_client(stack: AsyncExitStack, args: argparse.Namespace, headers: Dict[str, str]) -> httpx.AsyncClient:
+    timeout = httpx.Timeout(args.timeout)
+    if args.base_url:
+        limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+        return await stack.enter_async_context(
+            httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=timeout, limits=limits)
+        )
+
+    if args.dsn:
+        settings.supabase_db_url = args.dsn
+    if args.pool_size:
+        settings.db_pool_max_size = args.pool_size
+    settings.scheduler_enabled = False
+
+    # The app mounts static directories relative to the service directory
+    os.chdir(SERVICE_DIR)
+    from analyst.main import app
+
+    await stack.enter_async_context(app.router.lifespan_context(app))
+    return await stack.enter_async_context(
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://analyst.test",
+                          headers=headers, timeout=timeout)
+    )
+
+
+def _print_summary(summary: Dict[str, Any]) -> None:
+    print(f"{'route':<42} {'reqs':>7} {'err%':>6} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    rows = list(summary["routes"].items())
+    if summary["total"]:
+        rows.append(("TOTAL", summary["total"]))
+    for route, stats in rows:
+        print(f"{route:<42} {stats['requests']:>7} {stats['error_rate'] * 100:>5.1f}% {stats['throughput_rps']:>8.1f} "
+              f"{stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Analyst API load test')
+    parser.add_argument('--base-url', help='Target a running server instead of the in-process app')
+    parser.add_argument('--dsn', default=os.getenv('SUPABASE_DB_URL'), help='Database for the in-process app')
+    parser.add_argument('--pool-size', type=int, help='Override DB_POOL_MAX_SIZE for the in-process app')
+    parser.add_argument('--users', type=int, default=10, help='Virtual users (max in flight with --rate)')
+    parser.add_argument('--rate', type=float, help='Open-loop arrival rate in requests/second')
+    parser.add_argument('--duration', type=float, default=30.0, help='Test duration in seconds')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Mean pause between a user\'s requests (s)')
+    parser.add_argument('--zones', help='Comma-separated zone ids for the token (default DEV_ZONE_IDS)')
+    parser.add_argument('--token', help='Bearer token to use instead of minting a dev token')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the request mix')
+    parser.add_argument('--output', type=Path, help='Write the JSON report here')
+
+    args = parser.parse_args()
+
+    zone_ids = [zone.strip() for zone in args.zones.split(',')] if args.zones else settings.dev_zone_ids_list
+    headers = {"Authorization": f"Bearer {args.token or dev_token(zone_ids)}"}
+    session = Session(zone_ids=zone_ids)
+
+    async with AsyncExitStack() as stack:
+        client = await _open_client(stack, args, headers)
+
+        # The general thread is get-or-create, so every run reuses the same one
+        response = await client.post("/threads/", json={"thread_type": "general"})
+        if response.status_code == 200:
+            session.thread_id = response.json()["id"]
+        else:
+            print(f"⚠️  Could not open a thread ({response.status_code}); thread routes excluded from the mix")
+
+        load_test = LoadTest(client, session, CARD_MIX, users=args.users, rate=args.rate,
+                             duration=args.duration, think_time=args.think_time, seed=args.seed)
+        summary = await load_test.run()
+
+    _print_summary(summary)
+
+    if args.output:
+        write_report({
+            "metadata": {
+                **environment_info(),
+                "target": args.base_url or "in-process",
+                "users": args.users,
+                "rate": args.rate,
+                "duration": args.duration,
+                "think_time": args.think_time,
+                "zones": len(zone_ids),
+            },
+            **summary,
+        }, args.output)
+        print(f"✓ Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
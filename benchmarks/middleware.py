@@ -0,0 +1,83 @@
+"""
+Per-request overhead of the HTTP metrics middleware.
+
+Every case sends ``REQUESTS`` sequential requests to a minimal app over httpx's
+in-process ASGI transport, so the difference between cases is the middleware:
+none, the previous ``BaseHTTPMiddleware`` implementation, and the pure ASGI one.
+"""
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from analyst.observability import REQUEST_COUNTER, REQUEST_LATENCY, RequestMetricsMiddleware
+
+from .harness import BenchmarkResult
+
+REQUESTS = 200
+BASELINE_CASE = "no_middleware"
+
+
+class BaseHTTPMetricsMiddleware(BaseHTTPMiddleware):
+    """The metrics middleware as it was before it became pure ASGI (raw path labels)."""
+
+    async def dispatch(self, request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        elapsed = time.perf_counter() - start
+
+        path = request.url.path
+        REQUEST_COUNTER.labels(request.method, path, response.status_code).inc()
+        REQUEST_LATENCY.labels(request.method, path).observe(elapsed)
+        return response
+
+
+async def _insight(request: Request):
+    return JSONResponse({"id": request.path_params["insight_id"], "status": "draft"})
+
+
+def _app(middleware: Optional[type]) -> Starlette:
+    app = Starlette(routes=[Route("/insights/{insight_id}", _insight)])
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+def middleware_cases() -> List[Tuple[str, Callable[[], Awaitable[Any]], Dict[str, Any]]]:
+    paths = [f"/insights/{uuid.uuid4()}" for _ in range(REQUESTS)]
+
+    def case(middleware: Optional[type]):
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=_app(middleware)), base_url="http://bench")
+
+        async def _run():
+            for path in paths:
+                response = await client.get(path)
+                response.raise_for_status()
+        return _run
+
+    params = {"requests": REQUESTS}
+    return [
+        (BASELINE_CASE, case(None), params),
+        ("base_http_middleware", case(BaseHTTPMetricsMiddleware), params),
+        ("asgi_middleware", case(RequestMetricsMiddleware), params),
+    ]
+
+
+def overhead_per_request(results: List[BenchmarkResult]) -> Dict[str, float]:
+    """Median added latency per request (microseconds) of each middleware over no middleware"""
+
+    medians = {result.name: result.stats["median"] for result in results if result.stats}
+    if BASELINE_CASE not in medians:
+        return {}
+
+    baseline = medians.pop(BASELINE_CASE)
+    return {
+        name: round((median - baseline) / REQUESTS * 1e6, 1)
+        for name, median in medians.items()
+    }
@@ -0,0 +1,23 @@
+-- Source tables the analyst reads but does not own; shaped like production
+create table if not exists historical_transactions(
+  id bigint primary key,
+  zone integer,
+  start_park_date date,
+  start_park_time time,
+  stop_park_date date,
+  stop_park_time time,
+  paid_minutes integer,
+  parking_amount text,
+  payment_amount text
+);
+
+create table if not exists locations(
+  id uuid primary key,
+  name text,
+  zone_id text,
+  capacity integer
+);
+
+create index if not exists idx_historical_transactions_zone on historical_transactions(zone);
+create index if not exists idx_historical_transactions_start on historical_transactions(start_park_date);
+create index if not exists idx_locations_zone on locations(zone_id);
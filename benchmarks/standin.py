@@ -0,0 +1,143 @@
+"""
+In-memory stand-in for :class:`analyst.db.Database` backed by synthetic data.
+
+Used when no Postgres is available. It answers the knowledge and mart queries
+issued by ``RateInference`` and ``ParkingExpertAI`` from generated rows, so
+the Python side of those paths (row handling, JSON decoding, pandas work) can
+be timed. It does not execute SQL: any query it does not recognise raises, and
+benchmarks over ``historical_transactions`` aggregates need a real database.
+"""
+import json
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .synthetic import SyntheticSpec, aggregate, generate_knowledge
+
+FOUNDATIONAL_PRINCIPLE = {
+    "detailed_explanation": (
+        "Industry-standard target where most spaces are utilized but enough remain available "
+        "for customer convenience."
+    ),
+    "threshold_values": json.dumps({
+        "target": 85,
+        "acceptable_range": {"min": 80, "max": 90},
+        "action_thresholds": {"price_increase": 90, "price_decrease_consideration": 50, "capacity_constraint": 95},
+    }),
+    "context_triggers": ["occupancy", "utilization", "capacity", "target", "optimal"],
+}
+
+_FROM = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+
+
+class StandInDatabase:
+    """Serves the subset of queries the stand-in benchmarks issue."""
+
+    def __init__(self, spec: SyntheticSpec):
+        self.spec = spec
+        self.zone_stats, marts = aggregate(spec)
+        self.knowledge = generate_knowledge(spec)
+        self._rng = spec.rng(4)
+        self.daily = {
+            zone_id: rows.sort_values("date", ascending=False).to_dict("records")
+            for zone_id, rows in marts.groupby("zone_id")
+        }
+        self._handlers: Dict[str, Callable[[str, tuple], List[Dict[str, Any]]]] = {
+            "mart_metrics_daily": self._mart_metrics_daily,
+            "parking_principles": self._parking_principles,
+            "industry_knowledge": self._industry_knowledge,
+            "decision_frameworks": self._decision_frameworks,
+            "operational_tactics": self._operational_tactics,
+            "market_behavior": self._market_behavior,
+        }
+
+    async def initialize(self):
+        return None
+
+    async def close(self):
+        return None
+
+    def _dispatch(self, query: str, args: tuple) -> List[Dict[str, Any]]:
+        match = _FROM.search(query)
+        handler = self._handlers.get(match.group(1).lower()) if match else None
+        if handler is None:
+            raise NotImplementedError(f"Stand-in database cannot answer: {' '.join(query.split())[:120]}")
+        return handler(query, args)
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        # Writes are accepted and dropped so write paths can be timed without a database
+        return f"{query.split()[0].upper()} 0"
+
+    async def fetch(self, query: str, *args, **kwargs) -> List[Dict[str, Any]]:
+        return self._dispatch(query, args)
+
+    async def fetchrow(self, query: str, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        rows = self._dispatch(query, args)
+        return rows[0] if rows else None
+
+    async def fetchval(self, query: str, *args, **kwargs):
+        row = await self.fetchrow(query, *args)
+        return next(iter(row.values())) if row else None
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield self
+
+    def _mart_metrics_daily(self, query: str, args: tuple) -> List[Dict[str, Any]]:
+        since = self.spec.anchor - timedelta(days=30)
+        rows = [row for row in self.daily.get(args[0], []) if row["date"] >= since][:1000]
+
+        # Mirrors the simulated duration/rate columns RateInference selects
+        occupancy = np.array([row["occupancy_pct"] for row in rows], dtype=float)
+        draw = self._rng.random((2, len(rows)))
+        duration = np.select([occupancy > 0.8, occupancy > 0.5], [45 + draw[0] * 60, 60 + draw[0] * 120],
+                             90 + draw[0] * 180)
+        rate = np.select([occupancy > 0.8, occupancy > 0.5], [8 + draw[1] * 4, 5 + draw[1] * 3], 3 + draw[1] * 2)
+
+        return [
+            {
+                "created_at": datetime.combine(row["date"], datetime.min.time()),
+                "zone_id": row["zone_id"],
+                "location_id": None,
+                "total_amount": Decimal(str(row["rev"])),
+                "occupancy_pct": Decimal(str(row["occupancy_pct"])),
+                "duration_minutes": float(duration[i]),
+                "rate_per_hour": float(rate[i]),
+            }
+            for i, row in enumerate(rows)
+        ]
+
+    def _parking_principles(self, query: str, args: tuple) -> List[Dict[str, Any]]:
+        if "85% Occupancy Rule" in query:
+            return [dict(FOUNDATIONAL_PRINCIPLE)]
+        return [dict(row) for row in self.knowledge["parking_principles"]]
+
+    def _industry_knowledge(self, query: str, args: tuple) -> List[Dict[str, Any]]:
+        rows = [
+            row for row in self.knowledge["industry_knowledge"]
+            if row["category"] == "revenue" and row["knowledge_type"] == "benchmark"
+        ]
+        rows.sort(key=lambda row: row["confidence_level"], reverse=True)
+        return [{"quantitative_benchmarks": row["quantitative_benchmarks"], "content": row["content"]} for row in rows[:1]]
+
+    def _decision_frameworks(self, query: str, args: tuple) -> List[Dict[str, Any]]:
+        rows = [row for row in self.knowledge["decision_frameworks"] if row["decision_type"] in ("pricing", "comprehensive")]
+        return sorted((dict(row) for row in rows), key=lambda row: row["framework_name"])
+
+    def _operational_tactics(self, query: str, args: tuple) -> List[Dict[str, Any]]:
+        occupancy = float(args[0]) if args else 0.0
+        rows = [
+            row for row in self.knowledge["operational_tactics"]
+            if (row["tactic_category"] == "pricing" and occupancy > 85)
+            or (row["tactic_category"] == "marketing" and occupancy < 60)
+            or row["tactic_category"] == "operations"
+        ]
+        return sorted((dict(row) for row in rows), key=lambda row: (row["tactic_category"], row["tactic_name"]))
+
+    def _market_behavior(self, query: str, args: tuple) -> List[Dict[str, Any]]:
+        rows = [row for row in self.knowledge["market_behavior"] if row["behavior_type"] in ("elasticity", "benchmark", "seasonality")]
+        return sorted((dict(row) for row in rows), key=lambda row: row["behavior_type"])
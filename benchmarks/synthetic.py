@@ -0,0 +1,387 @@
+"""
+Deterministic synthetic parking data for benchmarks.
+
+Everything is derived from ``(seed, stream, chunk)`` so the same spec always
+produces byte-identical rows, whatever is consumed first. Transactions follow
+the layout of ``historical_transactions`` (integer ``zone``, split date/time
+columns, free-text amounts including ``$``-prefixed, ``-`` and empty values)
+and are generated in chunks so the 10M scale never has to fit in memory.
+"""
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+SCALES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+ZONES_PER_SCALE = {"10k": 8, "1m": 40, "10m": 120}
+KNOWLEDGE_PER_SCALE = {"10k": 20, "1m": 200, "10m": 2_000}
+
+DEFAULT_SEED = 20240901
+CHUNK_ROWS = 250_000
+
+# Relative demand by local start hour: commuter morning peak, evening/event peak
+HOURLY_WEIGHTS = np.array([
+    0.2, 0.1, 0.1, 0.1, 0.2, 0.5, 1.2, 2.6, 3.4, 2.8, 2.0, 1.8,
+    2.2, 2.0, 1.7, 1.6, 1.9, 2.6, 3.0, 2.7, 2.1, 1.5, 0.9, 0.4,
+])
+# Monday..Sunday (Python weekday order)
+DOW_WEIGHTS = np.array([1.0, 1.05, 1.1, 1.15, 1.3, 0.9, 0.6])
+
+EVENING_HOUR = 16
+EVENING_PREMIUM = 1.2
+
+TRANSACTION_COLUMNS = [
+    "id", "zone", "start_park_date", "start_park_time", "stop_park_date",
+    "stop_park_time", "paid_minutes", "parking_amount", "payment_amount",
+]
+LOCATION_COLUMNS = ["id", "name", "zone_id", "capacity"]
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Size and seed of one synthetic dataset."""
+
+    scale: str
+    transactions: int
+    zones: int
+    knowledge_rows: int
+    days: int = 120
+    seed: int = DEFAULT_SEED
+    anchor: date = field(default_factory=date.today)
+
+    @classmethod
+    def for_scale(
+        cls,
+        scale: str,
+        seed: int = DEFAULT_SEED,
+        anchor: Optional[date] = None,
+        days: int = 120
+    ) -> "SyntheticSpec":
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale '{scale}' (expected one of {', '.join(SCALES)})")
+        return cls(
+            scale=scale,
+            transactions=SCALES[scale],
+            zones=ZONES_PER_SCALE[scale],
+            knowledge_rows=KNOWLEDGE_PER_SCALE[scale],
+            days=days,
+            seed=seed,
+            anchor=anchor or date.today(),
+        )
+
+    def rng(self, *stream: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, *stream])
+
+    @property
+    def chunks(self) -> int:
+        return -(-self.transactions // CHUNK_ROWS)
+
+
+def zone_profiles(spec: SyntheticSpec) -> pd.DataFrame:
+    """One row per zone: demand weight, hourly rate, capacity and whether it has a location"""
+
+    rng = spec.rng(0)
+    zones = np.sort(rng.choice(np.arange(10_000, 100_000), spec.zones, replace=False))
+
+    # Zipf-like demand: a few busy zones and a long tail
+    weight = 1.0 / np.arange(1, spec.zones + 1) ** 0.8
+    weight = rng.permutation(weight)
+    weight /= weight.sum()
+
+    hourly_rate = np.round(rng.uniform(2.5, 6.5, spec.zones) * 4) / 4
+
+    # Size lots so average daily occupancy spans under-used to over-capacity zones
+    daily_sessions = spec.transactions * weight / spec.days
+    turnover = rng.uniform(0.3, 1.15, spec.zones)
+    capacity = np.maximum(10, np.round(daily_sessions / turnover)).astype(int)
+
+    return pd.DataFrame({
+        "zone": zones,
+        "weight": weight,
+        "hourly_rate": hourly_rate,
+        "capacity": capacity,
+        "has_location": rng.random(spec.zones) >= 0.1,
+    })
+
+
+def generate_locations(spec: SyntheticSpec) -> pd.DataFrame:
+    """``locations`` rows for the zones that have a lot (about 90% of them)"""
+
+    profiles = zone_profiles(spec)
+    profiles = profiles[profiles["has_location"]]
+    rng = spec.rng(3)
+
+    return pd.DataFrame({
+        "id": [str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in range(len(profiles))],
+        "name": [f"Lot {zone}" for zone in profiles["zone"]],
+        "zone_id": profiles["zone"].astype(str).to_numpy(),
+        "capacity": profiles["capacity"].to_numpy(),
+    })
+
+
+def _format_amounts(rng: np.random.Generator, amount: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    text = np.char.mod("%.2f", amount).astype(object)
+    draw = rng.random(len(amount))
+
+    dollar = draw < 0.10
+    text[dollar] = "$" + text[dollar]
+    text[(draw >= 0.10) & (draw < 0.13)] = "-"
+    text[(draw >= 0.13) & (draw < 0.15)] = ""
+
+    # Payment amounts are always numeric; the routes cast them without a guard
+    payment = np.char.mod("%.2f", np.where((draw < 0.10) | (draw >= 0.15), amount + 0.35, 0.0)).astype(object)
+    return text, payment
+
+
+def generate_transactions(spec: SyntheticSpec) -> Iterator[pd.DataFrame]:
+    """Yield transaction chunks with ``start_ts``/``stop_ts`` and a numeric ``amount``"""
+
+    profiles = zone_profiles(spec)
+    zones = profiles["zone"].to_numpy()
+    rates = profiles["hourly_rate"].to_numpy()
+
+    # Days run from anchor - days up to (not including) the anchor date
+    first_day = spec.anchor - timedelta(days=spec.days)
+    day_dow = np.array([(first_day + timedelta(days=d)).weekday() for d in range(spec.days)])
+    day_weights = DOW_WEIGHTS[day_dow] / DOW_WEIGHTS[day_dow].sum()
+    hour_weights = HOURLY_WEIGHTS / HOURLY_WEIGHTS.sum()
+    base = np.datetime64(first_day, "m")
+
+    for chunk in range(spec.chunks):
+        rng = spec.rng(1, chunk)
+        offset = chunk * CHUNK_ROWS
+        n = min(CHUNK_ROWS, spec.transactions - offset)
+
+        zone_index = rng.choice(spec.zones, n, p=profiles["weight"].to_numpy())
+        day = rng.choice(spec.days, n, p=day_weights)
+        hour = rng.choice(24, n, p=hour_weights)
+        minute = rng.integers(0, 60, n)
+
+        minutes = np.clip(np.round(rng.lognormal(np.log(90), 0.6, n) / 15) * 15, 15, 720).astype(int)
+        premium = np.where(hour >= EVENING_HOUR, EVENING_PREMIUM, 1.0)
+        amount = np.round(rates[zone_index] * minutes / 60 * premium * 4) / 4
+
+        start = base + (day * 1440 + hour * 60 + minute).astype("timedelta64[m]")
+        stop = start + minutes.astype("timedelta64[m]")
+        parking_amount, payment_amount = _format_amounts(rng, amount)
+
+        yield pd.DataFrame({
+            "id": np.arange(offset + 1, offset + n + 1),
+            "zone": zones[zone_index],
+            "start_ts": start,
+            "stop_ts": stop,
+            "paid_minutes": minutes,
+            "amount": np.where((parking_amount == "-") | (parking_amount == ""), np.nan, amount),
+            "parking_amount": parking_amount,
+            "payment_amount": payment_amount,
+        })
+
+
+def transactions_table(frame: pd.DataFrame) -> pd.DataFrame:
+    """Project a generated chunk onto the ``historical_transactions`` columns"""
+
+    start = frame["start_ts"].dt
+    stop = frame["stop_ts"].dt
+    return pd.DataFrame({
+        "id": frame["id"],
+        "zone": frame["zone"],
+        "start_park_date": start.strftime("%Y-%m-%d"),
+        "start_park_time": start.strftime("%H:%M:%S"),
+        "stop_park_date": stop.strftime("%Y-%m-%d"),
+        "stop_park_time": stop.strftime("%H:%M:%S"),
+        "paid_minutes": frame["paid_minutes"],
+        "parking_amount": frame["parking_amount"],
+        "payment_amount": frame["payment_amount"],
+    })[TRANSACTION_COLUMNS]
+
+
+def aggregate(spec: SyntheticSpec) -> Tuple[Dict[str, Dict[str, Any]], pd.DataFrame]:
+    """Per-zone statistics (as the insight generator computes them) and daily mart rows"""
+
+    profiles = zone_profiles(spec).set_index("zone")
+    daily_parts = []
+
+    for frame in generate_transactions(spec):
+        daily_parts.append(
+            frame.assign(date=frame["start_ts"].dt.normalize())
+            .groupby(["zone", "date"])
+            .agg(
+                sessions=("id", "size"),
+                minutes=("paid_minutes", "sum"),
+                min_minutes=("paid_minutes", "min"),
+                max_minutes=("paid_minutes", "max"),
+                rev=("amount", "sum"),
+                paid=("amount", "count"),
+            )
+        )
+
+    daily = pd.concat(daily_parts).groupby(level=["zone", "date"]).agg({
+        "sessions": "sum", "minutes": "sum", "min_minutes": "min",
+        "max_minutes": "max", "rev": "sum", "paid": "sum",
+    }).reset_index()
+
+    stats: Dict[str, Dict[str, Any]] = {}
+    for zone, rows in daily.groupby("zone"):
+        profile = profiles.loc[zone]
+        capacity = int(profile["capacity"]) if profile["has_location"] else None
+        active_days = len(rows)
+        sessions = int(rows["sessions"].sum())
+        stats[f"z-{zone}"] = {
+            "zone_id": f"z-{zone}",
+            "total_transactions": sessions,
+            "avg_duration_minutes": float(rows["minutes"].sum() / sessions),
+            "min_duration_minutes": int(rows["min_minutes"].min()),
+            "max_duration_minutes": int(rows["max_minutes"].max()),
+            "avg_amount": float(rows["rev"].sum() / max(rows["paid"].sum(), 1)),
+            "total_revenue": float(rows["rev"].sum()),
+            "active_days": active_days,
+            "active_weekdays": int(rows["date"].dt.dayofweek.nunique()),
+            "first_transaction": rows["date"].min().date(),
+            "last_transaction": rows["date"].max().date(),
+            "capacity": capacity,
+            "location_name": f"Lot {zone}" if capacity else None,
+            "avg_daily_occupancy_ratio": (
+                round(sessions / active_days / capacity * 100, 2) if capacity else None
+            ),
+            "avg_utilization_ratio": (
+                round(float(rows["minutes"].sum()) / (active_days * 1440.0 * capacity) * 100, 2) if capacity else None
+            ),
+        }
+
+    capacity = daily["zone"].map(profiles["capacity"])
+    marts = pd.DataFrame({
+        "date": daily["date"].dt.date,
+        "zone_id": "z-" + daily["zone"].astype(str),
+        "rev": daily["rev"].round(2),
+        "occupancy_pct": (daily["minutes"] / (1440.0 * capacity)).clip(upper=1.0).round(4),
+        "avg_ticket": (daily["rev"] / daily["paid"].where(daily["paid"] > 0)).round(2),
+    })
+    return stats, marts
+
+
+_TRIGGERS = [
+    "occupancy", "revenue", "pricing", "efficiency", "turnover", "capacity", "demand",
+    "performance", "duration", "weekend", "evening", "morning", "optimization", "underutilized",
+]
+_CATEGORIES = ["pricing", "occupancy", "revenue", "operations"]
+_VERTICALS = ["downtown", "airport", "retail", "residential", "hospital", None]
+
+
+def _triggers(rng: np.random.Generator) -> List[str]:
+    return sorted(rng.choice(_TRIGGERS, int(rng.integers(2, 6)), replace=False).tolist())
+
+
+def _pick(rng: np.random.Generator, values: List[Any]) -> Any:
+    return values[int(rng.integers(0, len(values)))]
+
+
+def generate_knowledge(spec: SyntheticSpec) -> Dict[str, List[Dict[str, Any]]]:
+    """Rows for the knowledge tables, keyed by table; JSONB values are JSON strings"""
+
+    n = spec.knowledge_rows
+    rows: Dict[str, List[Dict[str, Any]]] = {}
+
+    rng = spec.rng(2, 0)
+    rows["industry_knowledge"] = [
+        {
+            "knowledge_type": _pick(rng, ["benchmark", "best_practice", "seasonal_pattern"]),
+            "category": _pick(rng, _CATEGORIES),
+            "industry_vertical": _pick(rng, _VERTICALS),
+            "title": f"Synthetic industry knowledge {i}",
+            "content": f"Observed range {rng.integers(40, 70)}-{rng.integers(75, 95)}% across comparable lots.",
+            "context_triggers": _triggers(rng),
+            "confidence_level": Decimal(f"{rng.uniform(0.5, 0.95):.2f}"),
+            "quantitative_benchmarks": json.dumps({
+                "excellent": round(float(rng.uniform(2.2, 3.0)), 2),
+                "good": round(float(rng.uniform(1.3, 1.8)), 2),
+                "concerning": 0.75,
+            }),
+        }
+        for i in range(n)
+    ]
+
+    rng = spec.rng(2, 1)
+    rows["parking_kpis"] = [
+        {
+            "kpi_name": f"Synthetic KPI {i}",
+            "kpi_category": _pick(rng, ["efficiency", "revenue", "utilization", "performance"]),
+            "calculation_formula": "sessions / (days * capacity)",
+            "interpretation_rules": json.dumps({"high": int(rng.integers(80, 95)), "low": int(rng.integers(30, 55))}),
+            "context_triggers": _triggers(rng),
+            "industry_benchmarks": json.dumps({"typical": [60, 85]}),
+            "recommended_actions": json.dumps({"high": "raise rates", "low": "review pricing"}),
+        }
+        for i in range(n)
+    ]
+
+    rng = spec.rng(2, 2)
+    rows["analytical_patterns"] = [
+        {
+            "pattern_name": f"Synthetic pattern {i}",
+            "pattern_type": _pick(rng, ["seasonal", "behavioral", "revenue", "operational"]),
+            "description": "Demand shifts between dayparts without a matching price change.",
+            "detection_criteria": json.dumps({"min_change_pct": int(rng.integers(5, 30))}),
+            "significance_level": _pick(rng, ["critical", "important", "informational"]),
+            "context_triggers": _triggers(rng),
+        }
+        for i in range(n)
+    ]
+
+    rng = spec.rng(2, 3)
+    rows["parking_principles"] = [
+        {
+            "principle_name": f"Synthetic principle {i}",
+            "principle_type": _pick(rng, ["rule", "threshold", "guideline", "best_practice"]),
+            "core_concept": "Price to keep a few spaces open on every block.",
+            "detailed_explanation": "Occupancy above the target makes spaces hard to find.",
+            "threshold_values": json.dumps({"target": int(rng.integers(80, 90))}),
+            "context_triggers": _triggers(rng),
+            "is_foundational": False,
+        }
+        for i in range(n)
+    ]
+
+    rng = spec.rng(2, 4)
+    rows["decision_frameworks"] = [
+        {
+            "framework_name": f"Synthetic framework {i}",
+            "decision_type": _pick(rng, ["pricing", "comprehensive", "capacity", "operations", "marketing"]),
+            "decision_matrix": json.dumps({
+                "high_occupancy": {"condition": "occupancy > 85", "action": "increase_rates"},
+                "low_occupancy": {"condition": "occupancy < 60", "action": "analyze_barriers"},
+            }),
+            "expected_outcomes": json.dumps({"revenue_change_pct": round(float(rng.uniform(-5, 15)), 1)}),
+            "context_triggers": _triggers(rng),
+        }
+        for i in range(n)
+    ]
+
+    rng = spec.rng(2, 5)
+    rows["market_behavior"] = [
+        {
+            "behavior_type": _pick(rng, ["elasticity", "benchmark", "seasonality", "anomaly_pattern"]),
+            "behavior_description": "Drivers respond to price changes within two weeks.",
+            "quantitative_data": json.dumps({"elasticity": round(float(rng.uniform(-0.6, -0.1)), 2)}),
+            "context_triggers": _triggers(rng),
+        }
+        for i in range(n)
+    ]
+
+    rng = spec.rng(2, 6)
+    rows["operational_tactics"] = [
+        {
+            "tactic_name": f"Synthetic tactic {i}",
+            "tactic_category": _pick(rng, ["pricing", "marketing", "operations", "enforcement"]),
+            "implementation_details": "Roll out over two weeks and monitor daily occupancy.",
+            "expected_impact": json.dumps({"occupancy_change_pct": round(float(rng.uniform(-10, 10)), 1)}),
+            "context_triggers": _triggers(rng),
+        }
+        for i in range(n)
+    ]
+
+    return rows
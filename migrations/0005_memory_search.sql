@@ -0,0 +1,37 @@
+-- Migration 0005: Indexed search for feedback memories
+-- Replaces ILIKE / scope_ref::text LIKE scans with a weighted tsvector (GIN),
+-- a trigram index for topic filters and a typed zone_id column (btree).
+
+create extension if not exists pg_trgm;
+
+-- Zone ids are text ('z-110', '69701'), so they cannot live in the uuid scope_ref column.
+alter table feedback_memories
+add column if not exists zone_id text;
+
+update feedback_memories
+set zone_id = scope_ref::text
+where scope = 'zone' and zone_id is null and scope_ref is not null;
+
+-- Topic matches rank above body matches
+alter table feedback_memories
+add column if not exists search_tsv tsvector
+generated always as (
+  setweight(to_tsvector('english', coalesce(topic, '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(content, '')), 'B')
+) stored;
+
+create index if not exists idx_memories_search_tsv
+  on feedback_memories using gin (search_tsv)
+  where is_active;
+
+create index if not exists idx_memories_topic_trgm
+  on feedback_memories using gin (topic gin_trgm_ops)
+  where is_active;
+
+create index if not exists idx_memories_zone_active_created
+  on feedback_memories (zone_id, created_at desc)
+  where is_active and scope = 'zone';
+
+create index if not exists idx_memories_global_active_created
+  on feedback_memories (created_at desc)
+  where is_active and scope = 'global';
@@ -0,0 +1,20 @@
+-- Migration 0006: Expiry / conditional auto-revert for price_changes
+-- Partial indexes keep the evaluator's scans proportional to applied changes
+-- that can actually revert, not to the whole price_changes history.
+
+alter table price_changes
+add column if not exists reverted_at timestamptz;
+
+alter table price_changes
+add column if not exists revert_reason text;
+
+-- Due expiries: WHERE status = 'applied' AND expires_at <= now() ORDER BY expires_at
+create index if not exists idx_price_changes_applied_expires
+  on price_changes (expires_at)
+  where status = 'applied' and expires_at is not null;
+
+-- Conditional reverts: applied changes carrying a revert_if rule
+create index if not exists idx_price_changes_applied_revert_if
+  on price_changes (applied_at)
+  where status = 'applied' and revert_if is not null;
+
@@ -0,0 +1,26 @@
+-- Migration 0007: Transactional outbox for pushing applied/reverted rates
+-- Rows are written in the same transaction as the price_changes status update
+-- and drained in batches by the rates publisher.
+
+create table if not exists rate_change_outbox(
+  id bigserial primary key,
+  change_id uuid not null references price_changes(id) on delete cascade,
+  zone_id text not null,
+  action text not null check (action in ('apply', 'revert')),
+  payload jsonb not null,
+  idempotency_key text not null unique,
+  status text not null default 'pending' check (status in ('pending', 'sent', 'failed')),
+  attempts int not null default 0,
+  next_attempt_at timestamptz not null default now(),
+  last_error text,
+  created_at timestamptz default now(),
+  sent_at timestamptz
+);
+
+-- Publisher claim scan: pending rows whose lease/backoff has elapsed
+create index if not exists idx_rate_change_outbox_pending
+  on rate_change_outbox (next_attempt_at, id)
+  where status = 'pending';
+
+create index if not exists idx_rate_change_outbox_change
+  on rate_change_outbox (change_id);
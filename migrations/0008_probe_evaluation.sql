@@ -0,0 +1,14 @@
+-- Migration 0008: Bootstrap confidence intervals for elasticity probe results
+-- and an index for the per-arm hourly window scan.
+
+ALTER TABLE pricing_experiment_results
+    ADD COLUMN IF NOT EXISTS lift_rev_psh_ci_low numeric;
+
+ALTER TABLE pricing_experiment_results
+    ADD COLUMN IF NOT EXISTS lift_rev_psh_ci_high numeric;
+
+ALTER TABLE pricing_experiment_results
+    ADD COLUMN IF NOT EXISTS samples int;
+
+CREATE INDEX IF NOT EXISTS idx_mart_hourly_zone_ts
+    ON mart_metrics_hourly(zone_id, ts);
@@ -0,0 +1,6 @@
+-- Migration 0009: Probe runner status transitions
+-- The runner scans active experiments by ends_at to find those that are due.
+
+CREATE INDEX IF NOT EXISTS idx_pricing_experiments_active_ends_at
+    ON pricing_experiments(ends_at)
+    WHERE status IN ('scheduled', 'running');
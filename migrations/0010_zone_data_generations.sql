@@ -0,0 +1,74 @@
+-- Migration 0010: Per-zone data generations for conditional GETs
+-- Triggers bump a counter whenever a table the card reads changes, so list
+-- endpoints can derive a strong ETag from one indexed lookup and answer 304
+-- without running their list queries. Tables without a zone_id (and bulk
+-- loaded ones) bump a single '*' row once per statement.
+
+create table if not exists zone_data_generations(
+  zone_id text not null,
+  source text not null,
+  generation bigint not null default 1,
+  updated_at timestamptz not null default now(),
+  primary key (source, zone_id)
+);
+
+create or replace function bump_zone_generation() returns trigger
+language plpgsql as $$
+declare
+  zones text[];
+begin
+  if TG_OP = 'INSERT' then
+    zones := array[NEW.zone_id];
+  elsif TG_OP = 'DELETE' then
+    zones := array[OLD.zone_id];
+  else
+    zones := array[NEW.zone_id, OLD.zone_id];
+  end if;
+
+  insert into zone_data_generations(zone_id, source)
+  select distinct zone, TG_TABLE_NAME from unnest(zones) as zone where zone is not null
+  on conflict (source, zone_id) do update
+    set generation = zone_data_generations.generation + 1, updated_at = now();
+  return null;
+end $$;
+
+create or replace function bump_table_generation() returns trigger
+language plpgsql as $$
+begin
+  insert into zone_data_generations(zone_id, source)
+  values ('*', TG_TABLE_NAME)
+  on conflict (source, zone_id) do update
+    set generation = zone_data_generations.generation + 1, updated_at = now();
+  return null;
+end $$;
+
+drop trigger if exists trg_insights_generation on insights;
+create trigger trg_insights_generation
+  after insert or update or delete on insights
+  for each row execute function bump_zone_generation();
+
+drop trigger if exists trg_recommendations_generation on recommendations;
+create trigger trg_recommendations_generation
+  after insert or update or delete on recommendations
+  for each row execute function bump_zone_generation();
+
+drop trigger if exists trg_price_changes_generation on price_changes;
+create trigger trg_price_changes_generation
+  after insert or update or delete on price_changes
+  for each row execute function bump_zone_generation();
+
+drop trigger if exists trg_agent_guardrails_generation on agent_guardrails;
+create trigger trg_agent_guardrails_generation
+  after insert or update or delete or truncate on agent_guardrails
+  for each statement execute function bump_table_generation();
+
+-- historical_transactions is loaded outside these migrations
+do $$
+begin
+  if to_regclass('historical_transactions') is not null then
+    drop trigger if exists trg_historical_transactions_generation on historical_transactions;
+    create trigger trg_historical_transactions_generation
+      after insert or update or delete or truncate on historical_transactions
+      for each statement execute function bump_table_generation();
+  end if;
+end $$;
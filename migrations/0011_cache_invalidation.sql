@@ -0,0 +1,17 @@
+-- Migration 0011: Cache invalidation notifications for tables edited outside the app
+-- Workers LISTEN on analyst_invalidate and drop the named process-local caches
+-- (see services/analyst/analyst/invalidation.py). Guardrails are only ever
+-- edited directly in the database, so the notification comes from a trigger;
+-- it is delivered when the editing transaction commits.
+
+create or replace function notify_cache_invalidation() returns trigger
+language plpgsql as $$
+begin
+  perform pg_notify('analyst_invalidate', json_build_object('names', json_build_array(TG_ARGV[0]))::text);
+  return null;
+end $$;
+
+drop trigger if exists trg_agent_guardrails_invalidate on agent_guardrails;
+create trigger trg_agent_guardrails_invalidate
+  after insert or update or delete or truncate on agent_guardrails
+  for each statement execute function notify_cache_invalidation('guardrails');
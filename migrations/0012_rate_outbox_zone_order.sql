@@ -0,0 +1,8 @@
+-- Migration 0012: Per-zone ordering for the rate change outbox
+-- The publisher only claims a row when no earlier pending row for the same
+-- zone is leased or backing off (see services/analyst/analyst/core/rates_publisher.py),
+-- so an apply and its revert cannot reach the rates API out of order.
+
+create index if not exists idx_rate_change_outbox_zone_pending
+  on rate_change_outbox (zone_id, id)
+  where status = 'pending';
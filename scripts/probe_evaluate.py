@@ -47,7 +47,7 @@ async def main():
         await db.initialize()
 
         # Check experiment exists and is accessible
-        experiment = await db.pool.fetchrow(
+        experiment = await db.fetchrow(
             "SELECT zone_id, daypart, dow, status FROM pricing_experiments WHERE id = $1",
             uuid.UUID(args.experiment_id)
         )
@@ -61,7 +61,7 @@ async def main():
             sys.exit(1)
 
         # Evaluate the experiment
-        result = await evaluate_probe(db.pool, args.experiment_id)
+        result = await evaluate_probe(db, args.experiment_id)
 
         if args.format == 'json':
             print(json.dumps(result, indent=2, default=str))
@@ -77,33 +77,41 @@ async def main():
 
             if result['results']:
                 print("Results by arm:")
-                print(f"{'Delta':<8} {'Control':<7} {'Rev/PSH':<8} {'Occupancy':<10} {'Rev Lift':<9} {'Occ Lift':<9}")
-                print("─" * 60)
+                print(f"{'Delta':<8} {'Control':<7} {'Hours':<6} {'Rev/PSH':<8} {'Occupancy':<10} {'Rev Lift':<9} {'Lift CI':<17} {'Occ Lift':<9}")
+                print("─" * 80)
 
                 for res in result['results']:
                     delta_str = "0.0%" if res['control'] else f"{res['delta']:+.1%}"
                     control_str = "YES" if res['control'] else "NO"
-                    rev_psh = f"${res['rev_psh']:.2f}"
-                    occupancy = f"{res['occupancy']:.1%}"
-                    rev_lift = f"{res['lift_rev_psh']:+.1%}" if not res['control'] else "-"
-                    occ_lift = f"{res['lift_occupancy']:+.1%}" if not res['control'] else "-"
+                    rev_psh = f"${res['rev_psh']:.2f}" if res['rev_psh'] is not None else "-"
+                    occupancy = f"{res['occupancy']:.1%}" if res['occupancy'] is not None else "-"
+                    measured = not res['control'] and res['lift_rev_psh'] is not None
+                    rev_lift = f"{res['lift_rev_psh']:+.1%}" if measured else "-"
+                    low, high = res['lift_rev_psh_ci']
+                    ci = f"[{low:+.1%}, {high:+.1%}]" if measured and low is not None else "-"
+                    occ_lift = f"{res['lift_occupancy']:+.1%}" if measured and res['lift_occupancy'] is not None else "-"
 
-                    print(f"{delta_str:<8} {control_str:<7} {rev_psh:<8} {occupancy:<10} {rev_lift:<9} {occ_lift:<9}")
+                    print(f"{delta_str:<8} {control_str:<7} {res['samples']:<6} {rev_psh:<8} {occupancy:<10} {rev_lift:<9} {ci:<17} {occ_lift:<9}")
 
                 # Summary insights
-                non_control_results = [r for r in result['results'] if not r['control']]
+                non_control_results = [
+                    r for r in result['results']
+                    if not r['control'] and r['lift_rev_psh'] is not None
+                ]
                 if non_control_results:
                     best_rev_arm = max(non_control_results, key=lambda x: x['lift_rev_psh'])
-                    best_occ_arm = max(non_control_results, key=lambda x: x['lift_occupancy'])
 
                     print(f"\n💡 Insights:")
-                    print(f"   Best revenue lift: {best_rev_arm['delta']:+.1%} (+{best_rev_arm['lift_rev_psh']:.1%})")
-                    print(f"   Best occupancy lift: {best_occ_arm['delta']:+.1%} (+{best_occ_arm['lift_occupancy']:.1%})")
-
-                    # Check for statistical significance (simplified)
-                    significant_arms = [r for r in non_control_results if abs(r['lift_rev_psh']) > 0.02]  # >2% change
+                    print(f"   Best revenue lift: {best_rev_arm['delta']:+.1%} ({best_rev_arm['lift_rev_psh']:+.1%})")
+
+                    # Significant when the bootstrap CI excludes zero
+                    significant_arms = [
+                        r for r in non_control_results
+                        if r['lift_rev_psh_ci'][0] is not None
+                        and (r['lift_rev_psh_ci'][0] > 0 or r['lift_rev_psh_ci'][1] < 0)
+                    ]
                     if significant_arms:
-                        print(f"   Significant arms (>2% revenue change): {len(significant_arms)}")
+                        print(f"   Significant arms (lift CI excludes zero): {len(significant_arms)}")
                     else:
                         print(f"   No statistically significant revenue changes detected")
 
@@ -90,7 +90,7 @@ async def main():
         """
         params.append(args.limit)
 
-        rows = await db.pool.fetch(query, *params)
+        rows = await db.fetch(query, *params)
 
         if args.format == 'json':
             experiments = [
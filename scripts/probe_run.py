@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+CLI script to schedule probes in bulk and evaluate due experiments.
+
+Usage:
+    python scripts/probe_run.py schedule --zones=z-110,z-221 --dayparts=morning,evening --dows=0-6
+    python scripts/probe_run.py evaluate [--include-running] [--workers=4]
+"""
+import asyncio
+import argparse
+import json
+import sys
+import os
+
+# Add services path to allow imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../services/analyst'))
+
+from analyst.db import db
+from analyst.deps.auth import UserContext
+from analyst.core.probe_runner import ProbeRunner
+from analyst.config import settings
+
+
+def parse_dows(value: str):
+    """Parse '0-6' or '1,3,5' into a list of days of week."""
+    dows = []
+    for part in value.split(','):
+        part = part.strip()
+        if '-' in part:
+            start, end = part.split('-', 1)
+            dows.extend(range(int(start), int(end) + 1))
+        elif part:
+            dows.append(int(part))
+    if any(dow < 0 or dow > 6 for dow in dows):
+        raise ValueError("days of week must be between 0 and 6")
+    return dows
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Bulk elasticity probe runner')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    schedule_parser = subparsers.add_parser('schedule', help='Schedule probes for many zones/dayparts/dows')
+    schedule_parser.add_argument('--zones', help='Comma-separated zone IDs (default: dev zones)')
+    schedule_parser.add_argument('--dayparts', default='morning,evening', help='Comma-separated dayparts')
+    schedule_parser.add_argument('--dows', default='0-6', help='Days of week, e.g. 0-6 or 1,3,5 (0=Sunday)')
+    schedule_parser.add_argument('--deltas', help='Comma-separated delta values (e.g., -0.05,0.02,0.05)')
+    schedule_parser.add_argument('--horizon', type=int, default=settings.analyst_probe_horizon_days,
+                                 help='Experiment duration in days')
+
+    evaluate_parser = subparsers.add_parser('evaluate', help='Evaluate due experiments and mark them complete')
+    evaluate_parser.add_argument('--include-running', action='store_true',
+                                 help='Also refresh interim results for running experiments')
+    evaluate_parser.add_argument('--workers', type=int, default=settings.analyst_probe_runner_workers,
+                                 help='Maximum concurrent evaluation workers')
+
+    for subparser in (schedule_parser, evaluate_parser):
+        subparser.add_argument('--format', choices=['json', 'table'], default='table', help='Output format')
+
+    args = parser.parse_args()
+
+    # Create user context (use dev zones for CLI)
+    ctx = UserContext(
+        sub="00000000-0000-0000-0000-000000000000",
+        zone_ids=settings.dev_zone_ids_list,
+        org_id=settings.org_id
+    )
+
+    try:
+        await db.initialize()
+
+        if args.command == 'schedule':
+            zones = [z.strip() for z in args.zones.split(',')] if args.zones else ctx.zone_ids
+            dayparts = [d.strip() for d in args.dayparts.split(',') if d.strip()]
+            deltas = [float(d.strip()) for d in args.deltas.split(',')] if args.deltas else []
+
+            result = await ProbeRunner(db).schedule(
+                ctx, zones, dayparts, parse_dows(args.dows), deltas, args.horizon
+            )
+
+            if args.format == 'json':
+                print(json.dumps(result, indent=2, default=str))
+            else:
+                print(f"✅ Scheduled {len(result)} elasticity probes")
+                for item in result:
+                    print(f"   • {item['experiment_id']}  {item['zone_id']:<8} {item['daypart']:<8} "
+                          f"dow={item['dow']}  arms={len(item['arms'])}")
+        else:
+            result = await ProbeRunner(db, max_workers=args.workers).run_once(
+                include_running=args.include_running
+            )
+
+            if args.format == 'json':
+                print(json.dumps(result, indent=2, default=str))
+            else:
+                print(f"📈 Probe runner finished in {result['duration_seconds']:.2f}s")
+                print(f"   Started: {result['started']}")
+                print(f"   Evaluated: {result['evaluated']}")
+                print(f"   Completed: {result['completed']}")
+                if result['failed']:
+                    print(f"   Failed: {', '.join(result['failed'])}")
+
+    except Exception as e:
+        print(f"❌ Error running probes: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -54,7 +54,7 @@ async def main():
 
         # Schedule the probe
         result = await schedule_probe(
-            db=db.pool,
+            db=db,
             ctx=ctx,
             zone_id=args.zone_id,
             daypart=args.daypart,
@@ -0,0 +1,225 @@
+"""
+Admission control for heavy requests.
+
+Forced refreshes (``refresh=true``), ``/analytics/*`` scans and
+``/analytics/expert-analysis/{zone_id}`` each get their own concurrency
+budget and a bounded wait queue, so a burst of them cannot take every pooled
+connection away from cheap endpoints (threads, messages, card lists). Other
+requests are never held back.
+
+Past the budget a request waits in FIFO order for up to
+``admission_queue_timeout_seconds``. A full queue answers
+``429 Too Many Requests`` right away; running out of wait time answers
+``503 Service Unavailable``. Both carry ``Retry-After``, estimated from the
+class's recent hold times and queue length. Budgets are per worker, like the
+pool they protect.
+
+``/events/stream?refresh=true`` is admitted by its route rather than here: the
+slot belongs to the background refresh, not to the long-lived stream.
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+from urllib.parse import parse_qsl
+
+from fastapi import FastAPI, HTTPException
+from starlette.responses import JSONResponse
+
+from .config import settings
+from .observability import record_admission_rejected, record_admission_state, record_admission_wait
+
+logger = logging.getLogger(__name__)
+
+REFRESH = "refresh"
+ANALYTICS = "analytics"
+EXPERT = "expert"
+
+_TRUE_VALUES = {"1", "true", "on", "yes", "t", "y"}
+# Weight of the latest hold time in the moving average behind Retry-After
+_HOLD_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, request_class: str, reason: str, status_code: int, retry_after: int):
+        super().__init__(f"Too many {request_class} requests in progress ({reason})")
+        self.request_class = request_class
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(self.retry_after)}
+
+    def http_exception(self) -> HTTPException:
+        return HTTPException(status_code=self.status_code, detail=str(self), headers=self.headers)
+
+
+class AdmissionLimiter:
+    """At most ``max_concurrent`` holders; up to ``max_queue`` more wait in FIFO order."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._avg_hold_seconds = 1.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free for a new arrival"""
+        return max(1, math.ceil(self._avg_hold_seconds * (self.queued + 1) / self.max_concurrent))
+
+    def _rejected(self, reason: str, status_code: int) -> AdmissionRejected:
+        record_admission_rejected(self.name, reason)
+        return AdmissionRejected(self.name, reason, status_code, self.retry_after())
+
+    def _report(self) -> None:
+        record_admission_state(self.name, self.in_flight, self.queued)
+
+    async def acquire(self) -> float:
+        """Take a slot, waiting in line if needed; returns the monotonic time it was granted"""
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            self._report()
+            return time.monotonic()
+
+        if len(self._waiters) >= self.max_queue:
+            raise self._rejected("queue_full", 429)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._report()
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # handed a slot just as the wait ended; pass it on
+                self._release_slot()
+            if isinstance(exc, asyncio.TimeoutError):
+                raise self._rejected("timeout", 503) from None
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self._report()
+
+        granted_at = time.monotonic()
+        record_admission_wait(self.name, granted_at - queued_at)
+        return granted_at
+
+    def release(self, granted_at: float) -> None:
+        held = time.monotonic() - granted_at
+        self._avg_hold_seconds += _HOLD_SMOOTHING * (held - self._avg_hold_seconds)
+        self._release_slot()
+        self._report()
+
+    def _release_slot(self) -> None:
+        # hand the slot straight to the next waiter so late arrivals cannot jump the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        granted_at = await self.acquire()
+        try:
+            yield
+        finally:
+            self.release(granted_at)
+
+
+class AdmissionController:
+    """Maps requests to classes and holds one limiter per budgeted class."""
+
+    def __init__(self, limiters: Dict[str, AdmissionLimiter]):
+        self.limiters = limiters
+
+    @classmethod
+    def from_settings(cls) -> "AdmissionController":
+        budgets = {
+            REFRESH: (settings.admission_refresh_concurrency, settings.admission_refresh_queue),
+            ANALYTICS: (settings.admission_analytics_concurrency, settings.admission_analytics_queue),
+            EXPERT: (settings.admission_expert_concurrency, settings.admission_expert_queue),
+        }
+        return cls({
+            name: AdmissionLimiter(name, concurrency, queue, settings.admission_queue_timeout_seconds)
+            for name, (concurrency, queue) in budgets.items()
+            # a budget of 0 leaves the class unlimited
+            if concurrency > 0
+        })
+
+    def limiter(self, request_class: Optional[str]) -> Optional[AdmissionLimiter]:
+        if request_class is None or not settings.admission_control_enabled:
+            return None
+        return self.limiters.get(request_class)
+
+    @staticmethod
+    def classify(path: str, query_string: bytes) -> Optional[str]:
+        if path.startswith("/analytics/expert-analysis/"):
+            return EXPERT
+        if path.startswith("/analytics/"):
+            return ANALYTICS
+        if path.startswith("/events/"):
+            return None
+        for key, value in parse_qsl(query_string.decode("latin-1")):
+            if key == "refresh" and value.lower() in _TRUE_VALUES:
+                return REFRESH
+        return None
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware; the slot is held until the response body has been sent."""
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.controller.limiter(self.controller.classify(scope["path"], scope.get("query_string", b"")))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            granted_at = await limiter.acquire()
+        except AdmissionRejected as rejected:
+            logger.warning(f"Rejected {scope['method']} {scope['path']}: {str(rejected)}")
+            response = JSONResponse({"detail": str(rejected)}, rejected.status_code, headers=rejected.headers)
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(granted_at)
+
+
+admission_controller = AdmissionController.from_settings()
+
+
+def configure_admission(app: FastAPI) -> None:
+    if not settings.admission_control_enabled:
+        logger.info("Admission control disabled via configuration")
+        return
+
+    app.add_middleware(AdmissionMiddleware)
+    budgets = {name: (limiter.max_concurrent, limiter.max_queue) for name, limiter in admission_controller.limiters.items()}
+    logger.info(f"Admission control enabled (concurrency, queue) per worker: {budgets}")
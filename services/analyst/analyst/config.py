@@ -10,9 +10,19 @@ class Settings(BaseSettings):
 
     supabase_db_url: Optional[str] = None
     supabase_db_url_ro: Optional[str] = None
+    # Per-process asyncpg pool; total connections = workers x max size
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 10
+    # Separate pool for queries run with numeric_as_float=True (analytics aggregates)
+    db_float_pool_max_size: int = 4
 
     jwt_issuer: str = "app.lvlparking.com"
     jwt_public_key_base64: Optional[str] = None
+    # RS256 keys from a JWKS endpoint instead of one static key (see deps/jwt_keys.py)
+    jwt_jwks_url: Optional[str] = None
+    jwt_jwks_refresh_seconds: float = 3600.0
+    # Tokens that passed verification are trusted until exp without re-checking the signature
+    jwt_verified_cache_size: int = 10_000
     dev_jwt_hs256_secret: str = "dev-local-please-rotate-9b1b7df7b6f54c8bbf7a9c"
     dev_zone_ids: str = "z-110,z-221"
     org_id: str = "org-demo"
@@ -23,6 +33,17 @@ class Settings(BaseSettings):
 
     rates_api_base_url: Optional[str] = None
     rates_api_token: Optional[str] = None
+    rates_api_batch_path: str = "/rates/batch"
+    # Outbox publisher draining applied/reverted rates to the rates API
+    rates_publisher_batch_size: int = 100
+    rates_publisher_max_in_flight: int = 4
+    rates_publisher_poll_seconds: float = 5.0
+    rates_publisher_lease_seconds: int = 120
+    rates_publisher_timeout_seconds: float = 10.0
+    rates_publisher_max_retries: int = 3
+    rates_publisher_max_attempts: int = 10
+    rates_publisher_backoff_seconds: float = 1.0
+    rates_publisher_max_backoff_seconds: float = 300.0
 
     api_port: int = 8088
     cors_allow_origins: str = "http://localhost:5173,https://app.lvlparking.com,https://analyst.yourdomain.com"
@@ -35,11 +56,27 @@ class Settings(BaseSettings):
     analyst_probe_max_delta: float = 0.10
     analyst_probe_default_deltas: str = "[-0.05,-0.02,0.02,0.05]"
     analyst_probe_horizon_days: int = 14
+    analyst_probe_bootstrap_samples: int = 2000
+    analyst_probe_ci_level: float = 0.95
+    analyst_probe_bootstrap_seed: Optional[int] = None
+    analyst_probe_runner_workers: int = 4
+    analyst_probe_runner_chunk_size: int = 10
+
+    # Compiled prompt templates and guardrail rules; invalidation notifications are the primary
+    # path (analyst/invalidation.py), the TTL only bounds staleness while a listener is down
+    prompt_template_cache_ttl_seconds: int = 300
+    guardrail_cache_ttl_seconds: int = 300
 
     scheduler_enabled: bool = True
     scheduler_daily_refresh_hour_utc: int = 9  # Defaults to 09:00 UTC (~4am Central)
     scheduler_daily_refresh_minute_utc: int = 0
     scheduler_zone_ids: Optional[str] = None
+    # Expiry / revert_if sweep over applied price changes
+    scheduler_auto_revert_interval_minutes: int = 5
+    scheduler_probe_runner_interval_minutes: int = 60
+    auto_revert_batch_size: int = 500
+    auto_revert_max_batches: int = 20
+    auto_revert_default_window_days: int = 3
 
     log_level: str = "INFO"
     log_json: bool = False
@@ -52,6 +89,45 @@ class Settings(BaseSettings):
     otel_exporter_insecure: bool = True
     otel_service_name: str = "level-analyst"
 
+    # On-demand request profiling (see analyst/profiling.py); nothing is installed when disabled
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_slow_ms: Optional[float] = None
+    profiling_header: str = "X-Analyst-Profile"
+    profiling_token: Optional[str] = None
+    profiling_interval_ms: float = 1.0
+    profiling_dir: str = "/tmp/analyst-profiles"
+    profiling_max_files: int = 50
+    profiling_max_bytes: int = 50_000_000
+
+    # List endpoints encode trusted rows with orjson instead of validating response models
+    fast_json_responses: bool = True
+
+    # Server-Timing header on every response (see analyst/server_timing.py)
+    server_timing_enabled: bool = True
+    server_timing_debug_envelope: bool = False
+
+    # Per-worker concurrency budgets and wait queues for heavy requests (see analyst/admission.py);
+    # a concurrency of 0 leaves that class unlimited
+    admission_control_enabled: bool = True
+    admission_refresh_concurrency: int = 2
+    admission_refresh_queue: int = 4
+    admission_analytics_concurrency: int = 4
+    admission_analytics_queue: int = 16
+    admission_expert_concurrency: int = 2
+    admission_expert_queue: int = 4
+    admission_queue_timeout_seconds: float = 10.0
+
+    # Strong ETags / 304 on card list endpoints from zone_data_generations (migration 0010)
+    conditional_get_enabled: bool = True
+
+    # Refresh progress / new insight events for the SSE stream, shared across workers via
+    # LISTEN/NOTIFY on one dedicated connection per worker (see analyst/events.py)
+    events_listener_enabled: bool = True
+    events_queue_size: int = 256
+    events_keepalive_seconds: float = 15.0
+    events_listener_ping_seconds: float = 30.0
+
     @property
     def cors_origins(self) -> List[str]:
         return [origin.strip() for origin in self.cors_allow_origins.split(",")]
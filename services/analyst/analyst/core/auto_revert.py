@@ -0,0 +1,228 @@
+"""
+Expiry and conditional auto-revert for applied price changes.
+
+``expires_at`` reverts a change once it is due. ``revert_if`` reverts it when
+a condition over the zone's daily metrics holds, e.g.::
+
+    {"metric": "occupancy_pct", "op": "lt", "threshold": 0.45, "window_days": 3}
+    {"any": [{...}, {...}]}    {"all": [{...}, {...}]}
+
+Metrics are averaged from ``mart_metrics_daily`` over the last ``window_days``
+days (never before the change was applied). Missing data never triggers a revert.
+"""
+import json
+import logging
+import operator
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import settings
+from ..db import Database
+from ..observability import record_auto_revert
+from .rates_publisher import enqueue_rate_changes, rates_publisher
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_METRICS = ("rev", "occupancy_pct", "avg_ticket")
+
+OPERATORS: Dict[str, Callable[[float, float], bool]] = {
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+}
+
+# SKIP LOCKED lets concurrent workers (and the batch endpoints) share the backlog
+DUE_EXPIRIES_QUERY = """
+    SELECT id, expires_at
+    FROM price_changes
+    WHERE status = 'applied' AND expires_at IS NOT NULL AND expires_at <= NOW()
+    ORDER BY expires_at
+    LIMIT $1
+    FOR UPDATE SKIP LOCKED
+"""
+
+CONDITIONAL_CANDIDATES_QUERY = """
+    SELECT id, zone_id, applied_at, revert_if
+    FROM price_changes
+    WHERE status = 'applied' AND revert_if IS NOT NULL AND applied_at IS NOT NULL
+        AND (applied_at, id) > ($1::timestamptz, $2::uuid)
+    ORDER BY applied_at, id
+    LIMIT $3
+    FOR UPDATE SKIP LOCKED
+"""
+
+WINDOW_METRICS_QUERY = """
+    SELECT c.id,
+           AVG(m.rev)::float8 AS rev,
+           AVG(m.occupancy_pct)::float8 AS occupancy_pct,
+           AVG(m.avg_ticket)::float8 AS avg_ticket,
+           COUNT(m.date) AS days
+    FROM unnest($1::uuid[], $2::text[], $3::date[]) AS c(id, zone_id, since)
+    LEFT JOIN mart_metrics_daily m ON m.zone_id = c.zone_id AND m.date >= c.since
+    GROUP BY c.id
+"""
+
+BULK_REVERT_QUERY = """
+    UPDATE price_changes p
+    SET status = 'reverted', reverted_at = NOW(), revert_reason = r.reason
+    FROM unnest($1::uuid[], $2::text[]) AS r(id, reason)
+    WHERE p.id = r.id AND p.status = 'applied'
+    RETURNING p.id, p.zone_id, p.location_id, p.prev_price, p.revert_to, p.expires_at
+"""
+
+MIN_UUID = "00000000-0000-0000-0000-000000000000"
+START_CURSOR: Tuple[datetime, str] = (datetime.min.replace(tzinfo=timezone.utc), MIN_UUID)
+
+
+def _parse_condition(revert_if: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(revert_if, str):
+        try:
+            revert_if = json.loads(revert_if)
+        except json.JSONDecodeError:
+            return None
+    return revert_if if isinstance(revert_if, dict) else None
+
+
+def condition_window_days(condition: Dict[str, Any]) -> int:
+    """Largest metric window referenced by a (possibly nested) condition"""
+
+    for key in ("any", "all"):
+        if key in condition:
+            return max((condition_window_days(c) for c in condition[key] if isinstance(c, dict)), default=0)
+    return int(condition.get("window_days", settings.auto_revert_default_window_days))
+
+
+def evaluate_revert_condition(condition: Dict[str, Any], metrics: Dict[str, Optional[float]]) -> bool:
+    """True when ``condition`` holds for the window metrics of one change"""
+
+    if "any" in condition:
+        return any(evaluate_revert_condition(c, metrics) for c in condition["any"] if isinstance(c, dict))
+    if "all" in condition:
+        parts = [c for c in condition["all"] if isinstance(c, dict)]
+        return bool(parts) and all(evaluate_revert_condition(c, metrics) for c in parts)
+
+    metric = condition.get("metric")
+    compare = OPERATORS.get(condition.get("op"))
+    threshold = condition.get("threshold")
+
+    if metric not in SUPPORTED_METRICS or compare is None or threshold is None:
+        return False
+
+    value = metrics.get(metric)
+    if value is None:
+        return False
+
+    return compare(float(value), float(threshold))
+
+
+class RevertEvaluator:
+    """Sweeps due and conditional price changes and reverts them in bulk.
+
+    A sweep scans at most ``max_batches`` batches of ``revert_if`` candidates.
+    The keyset cursor is kept between sweeps and wraps around once the scan
+    reaches the end, so every candidate is evaluated in turn however large the
+    backlog; reuse one evaluator across runs.
+    """
+
+    def __init__(self, db: Database, batch_size: Optional[int] = None, max_batches: Optional[int] = None):
+        self.db = db
+        self.batch_size = batch_size or settings.auto_revert_batch_size
+        self.max_batches = max_batches or settings.auto_revert_max_batches
+        self._conditional_cursor = START_CURSOR
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Run one sweep; returns counts per revert reason"""
+
+        start = perf_counter()
+        evaluated = {"expired": 0, "condition": 0}
+        reverted = {"expired": 0, "condition": 0}
+        lags: List[float] = []
+
+        for _ in range(self.max_batches):
+            scanned, count, batch_lags = await self._revert_expired_batch()
+            evaluated["expired"] += scanned
+            reverted["expired"] += count
+            lags.extend(batch_lags)
+            if scanned < self.batch_size:
+                break
+
+        for _ in range(self.max_batches):
+            scanned, count, self._conditional_cursor = await self._revert_conditional_batch(self._conditional_cursor)
+            evaluated["condition"] += scanned
+            reverted["condition"] += count
+            if scanned < self.batch_size:
+                # Reached the end; the next sweep starts over from the oldest candidate
+                self._conditional_cursor = START_CURSOR
+                break
+
+        duration = perf_counter() - start
+        record_auto_revert(evaluated, reverted, lags, duration)
+
+        if reverted["expired"] or reverted["condition"]:
+            rates_publisher.notify()
+            logger.info(
+                f"Auto-revert sweep reverted {reverted['expired']} expired and "
+                f"{reverted['condition']} conditional changes in {duration:.2f}s"
+            )
+
+        return {"evaluated": evaluated, "reverted": reverted, "duration_seconds": duration}
+
+    async def _revert_expired_batch(self) -> Tuple[int, int, List[float]]:
+        async with self.db.transaction() as conn:
+            async with conn.transaction():
+                due = await conn.fetch(DUE_EXPIRIES_QUERY, self.batch_size)
+                if not due:
+                    return 0, 0, []
+
+                ids = [row["id"] for row in due]
+                reverted = await conn.fetch(BULK_REVERT_QUERY, ids, ["expired"] * len(ids))
+                await enqueue_rate_changes(conn, [dict(row) for row in reverted], "revert")
+
+        now = datetime.now(timezone.utc)
+        lags = [
+            max((now - row["expires_at"]).total_seconds(), 0.0)
+            for row in reverted if row["expires_at"] is not None
+        ]
+        return len(due), len(reverted), lags
+
+    async def _revert_conditional_batch(
+        self,
+        cursor: Tuple[datetime, str]
+    ) -> Tuple[int, int, Tuple[datetime, str]]:
+        async with self.db.transaction() as conn:
+            async with conn.transaction():
+                candidates = await conn.fetch(
+                    CONDITIONAL_CANDIDATES_QUERY, cursor[0], cursor[1], self.batch_size
+                )
+                if not candidates:
+                    return 0, 0, cursor
+
+                today = datetime.now(timezone.utc).date()
+                conditions: Dict[Any, Dict[str, Any]] = {}
+                ids, zones, since = [], [], []
+                for row in candidates:
+                    condition = _parse_condition(row["revert_if"])
+                    if not condition:
+                        continue
+                    window_start = today - timedelta(days=condition_window_days(condition))
+                    conditions[row["id"]] = condition
+                    ids.append(row["id"])
+                    zones.append(row["zone_id"])
+                    since.append(max(row["applied_at"].date(), window_start))
+
+                eligible = []
+                if ids:
+                    # One metrics query for the whole batch
+                    for metrics in await conn.fetch(WINDOW_METRICS_QUERY, ids, zones, since):
+                        if metrics["days"] and evaluate_revert_condition(conditions[metrics["id"]], metrics):
+                            eligible.append(metrics["id"])
+
+                reverted = []
+                if eligible:
+                    reverted = await conn.fetch(BULK_REVERT_QUERY, eligible, ["condition"] * len(eligible))
+                    await enqueue_rate_changes(conn, [dict(row) for row in reverted], "revert")
+
+        last = candidates[-1]
+        return len(candidates), len(reverted), (last["applied_at"], str(last["id"]))
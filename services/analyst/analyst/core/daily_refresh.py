@@ -1,8 +1,10 @@
 import logging
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from ..db import Database
+from ..events import event_bus, new_run_id, refresh_run_id
+from ..observability import start_span
 from .expert_recommendation_engine import ExpertRecommendationEngine
 from .insight_generator import InsightGenerator
 
@@ -31,86 +33,127 @@ async def _get_latest_timestamp(
     return await db.fetchval(query, zone_ids)
 
 
+async def _stale_data(db: Database, zone_ids: List[str], today: datetime) -> Tuple[bool, bool]:
+    """Whether insights and expert recommendations predate today"""
+
+    with start_span("daily_refresh.freshness_check"):
+        latest_insight = await _get_latest_timestamp(db, 'insights', zone_ids)
+        latest_recommendation = await _get_latest_timestamp(
+            db,
+            'recommendations',
+            zone_ids,
+            restrict_to_expert=True
+        )
+
+    refresh_insights = latest_insight is None or latest_insight < today
+    refresh_recommendations = (
+        latest_recommendation is None or latest_recommendation < today
+    )
+    return refresh_insights, refresh_recommendations
+
+
 async def ensure_daily_refresh(
     db: Database,
     zone_ids: List[str],
-    force_refresh: bool
+    force_refresh: bool,
+    run_id: Optional[str] = None
 ):
-    """Ensure insights and recommendations refresh at most once per day."""
+    """Ensure insights and recommendations refresh at most once per day.
+
+    Events are only published for a run that actually regenerates data; their
+    ``run_id`` is ``run_id`` or a fresh one.
+    """
 
     if not zone_ids:
         return
 
+    token = refresh_run_id.set(run_id or new_run_id())
+    try:
+        with start_span("daily_refresh", {
+            "refresh.zone_count": len(zone_ids),
+            "refresh.force": force_refresh,
+        }) as span:
+            outcome = await _run_daily_refresh(db, zone_ids, force_refresh, span)
+            span.set_attribute("refresh.outcome", outcome)
+            if outcome == "refreshed":
+                await event_bus.publish("refresh.completed", zone_ids, {"outcome": outcome})
+    finally:
+        refresh_run_id.reset(token)
+
+
+async def _run_daily_refresh(db: Database, zone_ids: List[str], force_refresh: bool, span) -> str:
     today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
 
     refresh_insights = force_refresh
     refresh_recommendations = force_refresh
 
     if not force_refresh:
-        latest_insight = await _get_latest_timestamp(db, 'insights', zone_ids)
-        latest_recommendation = await _get_latest_timestamp(
-            db,
-            'recommendations',
-            zone_ids,
-            restrict_to_expert=True
-        )
-
-        refresh_insights = latest_insight is None or latest_insight < today
-        refresh_recommendations = (
-            latest_recommendation is None or latest_recommendation < today
-        )
+        refresh_insights, refresh_recommendations = await _stale_data(db, zone_ids, today)
 
         if not (refresh_insights or refresh_recommendations):
             logger.info("Daily refresh skipped – existing data is current")
-            return
-
-    async with db.transaction() as conn:
-        await conn.execute(
-            "SELECT pg_advisory_lock($1)", DAILY_REFRESH_LOCK_ID
-        )
-
-        try:
-            if not force_refresh:
-                latest_insight = await _get_latest_timestamp(db, 'insights', zone_ids)
-                latest_recommendation = await _get_latest_timestamp(
-                    db,
-                    'recommendations',
-                    zone_ids,
-                    restrict_to_expert=True
-                )
-
-                refresh_insights = latest_insight is None or latest_insight < today
-                refresh_recommendations = (
-                    latest_recommendation is None or latest_recommendation < today
+            return "current"
+
+    refresh_started = False
+    try:
+        async with db.transaction() as conn:
+            with start_span("daily_refresh.lock_wait"):
+                await conn.execute(
+                    "SELECT pg_advisory_lock($1)", DAILY_REFRESH_LOCK_ID
                 )
 
-                if not (refresh_insights or refresh_recommendations):
-                    logger.info("Data became fresh while waiting for lock; skipping refresh")
-                    return
-
-            if refresh_insights:
-                logger.info("Starting insight regeneration job")
-                insight_generator = InsightGenerator(db)
-                try:
-                    fresh_insights = await insight_generator.generate_insights_for_all_zones(zone_ids)
-                    if fresh_insights:
-                        await insight_generator.save_insights(fresh_insights)
-                    else:
-                        logger.warning("Insight regeneration produced no results")
-                except Exception as exc:
-                    logger.error("Insight regeneration failed: %s", exc, exc_info=True)
-                    if force_refresh:
-                        raise
-
-            if refresh_recommendations:
-                logger.info("Starting expert recommendation regeneration job")
-                expert_engine = ExpertRecommendationEngine(db)
-                try:
-                    await expert_engine.generate_recommendations_for_all_zones(zone_ids)
-                except Exception as exc:
-                    logger.error("Expert recommendation regeneration failed: %s", exc, exc_info=True)
-                    if force_refresh:
-                        raise
-
-        finally:
-            await conn.fetchval("SELECT pg_advisory_unlock($1)", DAILY_REFRESH_LOCK_ID)
+            try:
+                if not force_refresh:
+                    refresh_insights, refresh_recommendations = await _stale_data(db, zone_ids, today)
+
+                    if not (refresh_insights or refresh_recommendations):
+                        logger.info("Data became fresh while waiting for lock; skipping refresh")
+                        return "current_after_lock"
+
+                span.set_attributes({
+                    "refresh.insights": refresh_insights,
+                    "refresh.recommendations": refresh_recommendations,
+                })
+                await event_bus.publish("refresh.started", zone_ids, {
+                    "insights": refresh_insights,
+                    "recommendations": refresh_recommendations,
+                })
+                refresh_started = True
+
+                if refresh_insights:
+                    logger.info("Starting insight regeneration job")
+                    insight_generator = InsightGenerator(db)
+                    try:
+                        with start_span("daily_refresh.generate_insights") as stage:
+                            fresh_insights = await insight_generator.generate_insights_for_all_zones(zone_ids)
+                            stage.set_attribute("insights.count", len(fresh_insights))
+                        if fresh_insights:
+                            with start_span("daily_refresh.save_insights"):
+                                await insight_generator.save_insights(fresh_insights)
+                        else:
+                            logger.warning("Insight regeneration produced no results")
+                    except Exception as exc:
+                        logger.error("Insight regeneration failed: %s", exc, exc_info=True)
+                        if force_refresh:
+                            raise
+
+                if refresh_recommendations:
+                    logger.info("Starting expert recommendation regeneration job")
+                    expert_engine = ExpertRecommendationEngine(db)
+                    try:
+                        with start_span("daily_refresh.generate_recommendations"):
+                            await expert_engine.generate_recommendations_for_all_zones(zone_ids)
+                    except Exception as exc:
+                        logger.error("Expert recommendation regeneration failed: %s", exc, exc_info=True)
+                        if force_refresh:
+                            raise
+
+                return "refreshed"
+
+            finally:
+                await conn.fetchval("SELECT pg_advisory_unlock($1)", DAILY_REFRESH_LOCK_ID)
+    except Exception as exc:
+        # a failed freshness re-check or lock wait stays silent unless this run was forced
+        if force_refresh or refresh_started:
+            await event_bus.publish("refresh.failed", zone_ids, {"error": str(exc)})
+        raise
@@ -0,0 +1,200 @@
+"""
+Streaming exports of raw zone data.
+
+Rows are read with ``Database.stream`` and encoded batch by batch, so memory
+stays bounded by ``batch_size`` however many rows are exported. CSV needs no
+extra packages; Parquet needs pyarrow and writes one row group per batch.
+"""
+import csv
+import io
+import logging
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from ..db import Database
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    table: str
+    # (select expression, output column, arrow type name)
+    columns: Tuple[Tuple[str, str, str], ...]
+    date_column: str
+    order_by: str
+    # historical_transactions stores the bare zone, the marts "z-<zone>"
+    bare_zone: bool
+
+    def arrow_schema(self):
+        return pa.schema([(name, _ARROW_TYPES[type_name]()) for _, name, type_name in self.columns])
+
+
+_ARROW_TYPES = {
+    "int": lambda: pa.int64(),
+    "float": lambda: pa.float64(),
+    "string": lambda: pa.string(),
+    "date": lambda: pa.date32(),
+    "time": lambda: pa.time64("us"),
+    "timestamp": lambda: pa.timestamp("us", tz="UTC"),
+}
+
+_MART_COLUMNS = (
+    ("location_id::text", "location_id", "string"),
+    ("zone_id", "zone_id", "string"),
+    ("rev", "rev", "float"),
+    ("occupancy_pct", "occupancy_pct", "float"),
+    ("avg_ticket", "avg_ticket", "float"),
+)
+
+EXPORT_DATASETS: Dict[str, ExportDataset] = {
+    "transactions": ExportDataset(
+        table="historical_transactions",
+        columns=(
+            ("id", "id", "int"),
+            ("zone", "zone", "int"),
+            ("start_park_date", "start_park_date", "date"),
+            ("start_park_time", "start_park_time", "time"),
+            ("stop_park_date", "stop_park_date", "date"),
+            ("stop_park_time", "stop_park_time", "time"),
+            ("paid_minutes", "paid_minutes", "int"),
+            ("parking_amount", "parking_amount", "string"),
+            ("payment_amount", "payment_amount", "string"),
+        ),
+        date_column="start_park_date",
+        order_by="start_park_date, start_park_time, id",
+        bare_zone=True,
+    ),
+    "daily": ExportDataset(
+        table="mart_metrics_daily",
+        columns=(("date", "date", "date"),) + _MART_COLUMNS,
+        date_column="date",
+        order_by="date, zone_id",
+        bare_zone=False,
+    ),
+    "hourly": ExportDataset(
+        table="mart_metrics_hourly",
+        columns=(("ts", "ts", "timestamp"),) + _MART_COLUMNS,
+        date_column="ts",
+        order_by="ts, zone_id",
+        bare_zone=False,
+    ),
+}
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def build_export_query(
+    dataset: ExportDataset,
+    zone_ids: List[str],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Tuple[str, List[Any]]:
+    """SELECT for ``dataset`` restricted to ``zone_ids`` (``z-<zone>`` form) and an inclusive date range"""
+
+    if dataset.bare_zone:
+        # Compared as text like the analytics queries, so non-numeric zones cannot break the cast
+        zones = [zone[2:] for zone in zone_ids if zone.startswith("z-")]
+        where = ["zone::text = ANY($1::text[])"]
+    else:
+        zones = list(zone_ids)
+        where = ["zone_id = ANY($1::text[])"]
+    params: List[Any] = [zones]
+
+    if start_date:
+        params.append(start_date)
+        where.append(f"{dataset.date_column} >= ${len(params)}::date")
+    if end_date:
+        params.append(end_date)
+        where.append(f"{dataset.date_column} < ${len(params)}::date + 1")
+
+    select = ", ".join(
+        expression if expression == name else f"{expression} AS {name}"
+        for expression, name, _ in dataset.columns
+    )
+    query = f"SELECT {select} FROM {dataset.table} WHERE {' AND '.join(where)} ORDER BY {dataset.order_by}"
+    return query, params
+
+
+async def _batches(db: Database, query: str, params: List[Any], batch_size: int):
+    async with aclosing(db.stream(query, *params, batch_size=batch_size, columnar=True,
+                                  numeric_as_float=True)) as batches:
+        async for batch in batches:
+            yield batch
+
+
+async def stream_csv(
+    db: Database, dataset: ExportDataset, query: str, params: List[Any], batch_size: int
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for _, name, _ in dataset.columns])
+    yield buffer.getvalue().encode()
+
+    async for columns in _batches(db, query, params, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(zip(*columns.values()))
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting what the Parquet writer emits between batches."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+async def stream_parquet(
+    db: Database, dataset: ExportDataset, query: str, params: List[Any], batch_size: int
+) -> AsyncIterator[bytes]:
+    schema = dataset.arrow_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for columns in _batches(db, query, params, batch_size):
+            writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_export(
+    db: Database, dataset_name: str, export_format: str, zone_ids: List[str],
+    start_date: Optional[date] = None, end_date: Optional[date] = None, batch_size: int = 5000
+) -> AsyncIterator[bytes]:
+    dataset = EXPORT_DATASETS[dataset_name]
+    query, params = build_export_query(dataset, zone_ids, start_date, end_date)
+    logger.info(f"Exporting {dataset_name} as {export_format} for {len(zone_ids)} zones")
+    encode = stream_parquet if export_format == "parquet" else stream_csv
+    return encode(db, dataset, query, params, batch_size)
@@ -5,7 +5,9 @@ import json
 import uuid
 from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
 
 from ..config import settings
 from ..deps.auth import UserContext
@@ -96,9 +98,29 @@ async def schedule_probe(
 
     Returns dict with experiment_id, arms, status, and ends_at.
     """
+    scheduled = await schedule_probes(
+        db, ctx, [{'zone_id': zone_id, 'daypart': daypart, 'dow': dow}], deltas, horizon_days
+    )
+    return scheduled[0]
+
+
+async def schedule_probes(
+    db,
+    ctx: UserContext,
+    targets: List[Dict[str, Any]],
+    deltas: List[float],
+    horizon_days: int
+) -> List[Dict[str, Any]]:
+    """
+    Schedule one experiment per zone/daypart/dow target.
+
+    All experiments and all of their arms are written with one statement each,
+    inside a single transaction.
+    """
     # Validate zone access
-    if zone_id not in ctx.zone_ids:
-        raise ValueError(f"Zone {zone_id} not accessible to user")
+    for target in targets:
+        if target['zone_id'] not in ctx.zone_ids:
+            raise ValueError(f"Zone {target['zone_id']} not accessible to user")
 
     # Parse default deltas if none provided
     if not deltas:
@@ -121,61 +143,285 @@ async def schedule_probe(
         'created_at': datetime.utcnow().isoformat()
     }
 
-    # Build experiment arms
-    arms = build_probe_arms(zone_id, daypart, dow, base_tiers, deltas, guardrails_snapshot)
-
     # Calculate end time
     ends_at = datetime.utcnow() + timedelta(days=horizon_days)
 
-    # Insert experiment
-    experiment_id = str(uuid.uuid4())
+    scheduled = []
+    arm_rows = []
+    for target in targets:
+        experiment_id = str(uuid.uuid4())
+        arms = build_probe_arms(
+            target['zone_id'], target['daypart'], target['dow'], base_tiers, deltas, guardrails_snapshot
+        )
+        for arm in arms:
+            arm_rows.append((uuid.uuid4(), experiment_id, arm))
+
+        scheduled.append({
+            'experiment_id': experiment_id,
+            'zone_id': target['zone_id'],
+            'daypart': target['daypart'],
+            'dow': target['dow'],
+            'arms': arms,
+            'status': 'scheduled',
+            'ends_at': ends_at.isoformat(),
+            'horizon_days': horizon_days
+        })
+
+    if not scheduled:
+        return []
+
     experiment_query = """
         INSERT INTO pricing_experiments
         (id, zone_id, daypart, dow, deltas, guardrails_snapshot, horizon_days, ends_at, created_by)
-        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-        RETURNING id
+        SELECT e.id, e.zone_id, e.daypart, e.dow, $5::numeric[], $6::jsonb, $7, $8, $9
+        FROM unnest($1::uuid[], $2::text[], $3::text[], $4::int[]) AS e(id, zone_id, daypart, dow)
     """
 
-    await db.execute(
-        experiment_query,
-        experiment_id,
-        zone_id,
-        daypart,
-        dow,
-        deltas,
-        json.dumps(guardrails_snapshot),
-        horizon_days,
-        ends_at,
-        uuid.UUID(ctx.sub)
+    arm_query = """
+        INSERT INTO pricing_experiment_arms
+        (id, experiment_id, delta, proposal, control)
+        SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::numeric[], $4::jsonb[], $5::boolean[])
+    """
+
+    async with db.transaction() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                experiment_query,
+                [uuid.UUID(item['experiment_id']) for item in scheduled],
+                [item['zone_id'] for item in scheduled],
+                [item['daypart'] for item in scheduled],
+                [item['dow'] for item in scheduled],
+                deltas,
+                guardrails_snapshot,
+                horizon_days,
+                ends_at,
+                uuid.UUID(ctx.sub) if ctx.sub != "dev-user" else None
+            )
+
+            if arm_rows:
+                await conn.execute(
+                    arm_query,
+                    [arm_id for arm_id, _, _ in arm_rows],
+                    [uuid.UUID(experiment_id) for _, experiment_id, _ in arm_rows],
+                    [arm['delta'] for _, _, arm in arm_rows],
+                    [arm['proposal'] for _, _, arm in arm_rows],
+                    [arm['control'] for _, _, arm in arm_rows]
+                )
+
+    return scheduled
+
+
+# Per-arm hourly samples for every requested experiment in one pass over the mart.
+# A treatment arm is measured only while its price change (applied_change_id) was
+# live; an arm that was never applied gets no samples, so no lift is reported for
+# it. The control arm covers the rest of the experiment window. Both are limited
+# to the probe's dow/daypart.
+ARM_WINDOWS_QUERY = """
+    WITH arms AS (
+        SELECT a.id AS arm_id, a.experiment_id, a.delta, a.control,
+               e.zone_id, e.location_id, e.daypart, e.dow,
+               COALESCE(e.started_at, e.created_at) AS window_start,
+               COALESCE(e.ends_at, COALESCE(e.started_at, e.created_at) + make_interval(days => e.horizon_days))
+                   AS window_end,
+               pc.applied_at AS applied_start,
+               COALESCE(pc.reverted_at, pc.expires_at, 'infinity') AS applied_end
+        FROM pricing_experiment_arms a
+        JOIN pricing_experiments e ON e.id = a.experiment_id
+        LEFT JOIN price_changes pc ON pc.id = a.applied_change_id AND NOT a.control
+        WHERE a.experiment_id = ANY($1::uuid[])
     )
+    SELECT arms.arm_id, arms.experiment_id, arms.delta::float8 AS delta, arms.control,
+           arms.window_start, arms.window_end,
+           COALESCE(array_agg(h.rev::float8 ORDER BY h.ts) FILTER (WHERE h.ts IS NOT NULL), '{}') AS rev,
+           COALESCE(array_agg(h.occupancy_pct::float8 ORDER BY h.ts) FILTER (WHERE h.ts IS NOT NULL), '{}') AS occupancy
+    FROM arms
+    LEFT JOIN mart_metrics_hourly h
+        ON h.zone_id = arms.zone_id
+        AND (arms.location_id IS NULL OR h.location_id = arms.location_id)
+        AND h.ts >= arms.window_start AND h.ts < LEAST(arms.window_end, NOW())
+        AND EXTRACT(dow FROM h.ts AT TIME ZONE $2)::int = arms.dow
+        AND (EXTRACT(hour FROM h.ts AT TIME ZONE $2) < 16) = (arms.daypart = 'morning')
+        AND CASE
+            WHEN arms.control THEN NOT EXISTS (
+                SELECT 1 FROM arms t
+                WHERE t.experiment_id = arms.experiment_id AND t.applied_start IS NOT NULL
+                    AND h.ts >= t.applied_start AND h.ts < t.applied_end
+            )
+            ELSE h.ts >= arms.applied_start AND h.ts < arms.applied_end
+        END
+    GROUP BY arms.arm_id, arms.experiment_id, arms.delta, arms.control, arms.window_start, arms.window_end
+    ORDER BY arms.experiment_id, arms.control DESC, arms.delta
+"""
 
-    # Insert arms
-    arm_ids = []
-    for arm in arms:
-        arm_id = str(uuid.uuid4())
-        arm_query = """
-            INSERT INTO pricing_experiment_arms
-            (id, experiment_id, delta, proposal, control)
-            VALUES ($1, $2, $3, $4, $5)
-        """
-
-        await db.execute(
-            arm_query,
-            arm_id,
-            experiment_id,
-            arm['delta'],
-            json.dumps(arm['proposal']),
-            arm['control']
-        )
-        arm_ids.append(arm_id)
+UPSERT_RESULTS_QUERY = """
+    INSERT INTO pricing_experiment_results
+    (experiment_id, arm_id, metric_window, rev_psh, occupancy, lift_rev_psh, lift_occupancy,
+     lift_rev_psh_ci_low, lift_rev_psh_ci_high, samples, method)
+    SELECT r.experiment_id, r.arm_id, daterange(r.window_start, r.window_end),
+           r.rev_psh, r.occupancy, r.lift_rev_psh, r.lift_occupancy,
+           r.ci_low, r.ci_high, r.samples, 'bootstrap'
+    FROM unnest(
+        $1::uuid[], $2::uuid[], $3::date[], $4::date[], $5::float8[], $6::float8[],
+        $7::float8[], $8::float8[], $9::float8[], $10::float8[], $11::int[]
+    ) AS r(experiment_id, arm_id, window_start, window_end, rev_psh, occupancy,
+           lift_rev_psh, lift_occupancy, ci_low, ci_high, samples)
+    ON CONFLICT (experiment_id, arm_id, metric_window)
+    DO UPDATE SET
+        rev_psh = EXCLUDED.rev_psh,
+        occupancy = EXCLUDED.occupancy,
+        lift_rev_psh = EXCLUDED.lift_rev_psh,
+        lift_occupancy = EXCLUDED.lift_occupancy,
+        lift_rev_psh_ci_low = EXCLUDED.lift_rev_psh_ci_low,
+        lift_rev_psh_ci_high = EXCLUDED.lift_rev_psh_ci_high,
+        samples = EXCLUDED.samples,
+        method = EXCLUDED.method,
+        computed_at = now()
+"""
 
-    return {
-        'experiment_id': experiment_id,
-        'arms': arms,
-        'status': 'scheduled',
-        'ends_at': ends_at.isoformat(),
-        'horizon_days': horizon_days
-    }
+# Upper bound on resampled cells (arms x resamples x samples) held in memory at once
+BOOTSTRAP_CHUNK_CELLS = 4_000_000
+
+
+def _bootstrap_means(
+    samples: List[np.ndarray],
+    n_boot: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """Bootstrap means for every arm, shape (arms, n_boot); NaN for empty arms."""
+    counts = np.array([len(s) for s in samples], dtype=np.int64)
+    max_n = int(max(counts.max(initial=0), 1))
+
+    padded = np.zeros((len(samples), max_n))
+    for i, values in enumerate(samples):
+        padded[i, :len(values)] = values
+    valid = np.arange(max_n)[None, :] < counts[:, None]
+    divisor = np.maximum(counts, 1)[:, None]
+
+    boot_means = np.empty((len(samples), n_boot))
+    step = max(BOOTSTRAP_CHUNK_CELLS // (n_boot * max_n), 1)
+    for start in range(0, len(samples), step):
+        rows = slice(start, start + step)
+        # Draw indices for every arm in the chunk at once; positions past an arm's
+        # own sample count are masked out so unequal arm sizes share one array.
+        idx = rng.integers(0, divisor[rows, :, None], size=(padded[rows].shape[0], n_boot, max_n))
+        draws = np.take_along_axis(padded[rows, None, :], idx, axis=2)
+        boot_means[rows] = (draws * valid[rows, None, :]).sum(axis=2) / divisor[rows]
+
+    boot_means[counts == 0] = np.nan
+    return boot_means
+
+
+def bootstrap_lift_intervals(
+    samples: List[np.ndarray],
+    control_index: List[int],
+    n_boot: int = 2000,
+    ci_level: float = 0.95,
+    rng: Optional[np.random.Generator] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lift of each arm's mean over its control arm's mean, with percentile CIs.
+
+    ``control_index[i]`` is the position of arm ``i``'s control in ``samples``.
+    Every arm is resampled in the same vectorized pass. Returns (lift, low, high)
+    arrays; entries are NaN when the arm or its control has no usable data.
+    """
+    rng = rng or np.random.default_rng()
+    control = np.asarray(control_index, dtype=np.intp)
+    means = np.array([np.mean(s) if len(s) else np.nan for s in samples])
+    boot_means = _bootstrap_means(samples, n_boot, rng)
+
+    alpha = (1.0 - ci_level) / 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lift = means / means[control] - 1.0
+        boot_lift = boot_means / boot_means[control] - 1.0
+        boot_lift[~np.isfinite(boot_lift)] = np.nan
+
+        usable = np.isfinite(lift) & ~np.all(np.isnan(boot_lift), axis=1)
+        low = np.full(len(samples), np.nan)
+        high = np.full(len(samples), np.nan)
+        if usable.any():
+            low[usable], high[usable] = np.nanpercentile(
+                boot_lift[usable], [100 * alpha, 100 * (1 - alpha)], axis=1
+            )
+
+    lift[~usable] = np.nan
+    return lift, low, high
+
+
+def _finite_or_none(value: float) -> Optional[float]:
+    return float(value) if np.isfinite(value) else None
+
+
+async def evaluate_probes(db, experiment_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Evaluate many experiments with one mart query and one results upsert.
+
+    RevPASH is taken as mean hourly zone revenue over the arm's live hours (see
+    ARM_WINDOWS_QUERY); zone capacity is the same for every arm, so it cancels
+    out of the lift. Treatment arms that were never applied report 0 samples
+    and no lift.
+    Returns per-arm results keyed by experiment id.
+    """
+    if not experiment_ids:
+        return {}
+
+    rows = await db.fetch(ARM_WINDOWS_QUERY, [uuid.UUID(str(e)) for e in experiment_ids], settings.tz)
+    if not rows:
+        return {}
+
+    controls: Dict[Any, int] = {}
+    for i, row in enumerate(rows):
+        if row['control']:
+            controls.setdefault(row['experiment_id'], i)
+    # Experiments without a control arm compare each arm against itself (lift 0)
+    control_index = [controls.get(row['experiment_id'], i) for i, row in enumerate(rows)]
+
+    rev = [np.asarray(row['rev'] or [], dtype=float) for row in rows]
+    occupancy = [np.asarray(row['occupancy'] or [], dtype=float) for row in rows]
+
+    rng = np.random.default_rng(settings.analyst_probe_bootstrap_seed)
+    lift_rev, ci_low, ci_high = bootstrap_lift_intervals(
+        rev, control_index,
+        n_boot=settings.analyst_probe_bootstrap_samples,
+        ci_level=settings.analyst_probe_ci_level,
+        rng=rng
+    )
+
+    mean_rev = np.array([v.mean() if len(v) else np.nan for v in rev])
+    mean_occ = np.array([v.mean() if len(v) else np.nan for v in occupancy])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lift_occ = mean_occ / mean_occ[np.asarray(control_index, dtype=np.intp)] - 1.0
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for i, row in enumerate(rows):
+        results.setdefault(str(row['experiment_id']), []).append({
+            'arm_id': str(row['arm_id']),
+            'delta': float(row['delta']),
+            'control': row['control'],
+            'samples': len(rev[i]),
+            'rev_psh': _finite_or_none(round(mean_rev[i], 2)),
+            'occupancy': _finite_or_none(round(mean_occ[i], 3)),
+            'lift_rev_psh': _finite_or_none(round(lift_rev[i], 3)),
+            'lift_rev_psh_ci': [_finite_or_none(round(ci_low[i], 3)), _finite_or_none(round(ci_high[i], 3))],
+            'lift_occupancy': _finite_or_none(round(lift_occ[i], 3)),
+        })
+
+    await db.execute(
+        UPSERT_RESULTS_QUERY,
+        [row['experiment_id'] for row in rows],
+        [row['arm_id'] for row in rows],
+        [row['window_start'].date() for row in rows],
+        [row['window_end'].date() for row in rows],
+        [_finite_or_none(v) for v in mean_rev],
+        [_finite_or_none(v) for v in mean_occ],
+        [_finite_or_none(v) for v in lift_rev],
+        [_finite_or_none(v) for v in lift_occ],
+        [_finite_or_none(v) for v in ci_low],
+        [_finite_or_none(v) for v in ci_high],
+        [len(v) for v in rev],
+    )
+
+    return results
 
 
 async def evaluate_probe(db, experiment_id: str) -> Dict[str, Any]:
@@ -184,88 +430,19 @@ async def evaluate_probe(db, experiment_id: str) -> Dict[str, Any]:
 
     Returns summary of results with lift calculations.
     """
-    # Get experiment details
     experiment = await db.fetchrow(
-        "SELECT * FROM pricing_experiments WHERE id = $1",
+        "SELECT id FROM pricing_experiments WHERE id = $1",
         uuid.UUID(experiment_id)
     )
 
     if not experiment:
         raise ValueError(f"Experiment {experiment_id} not found")
 
-    # Get arms
-    arms = await db.fetch(
-        "SELECT * FROM pricing_experiment_arms WHERE experiment_id = $1",
-        uuid.UUID(experiment_id)
-    )
-
-    # For demo purposes, simulate results
-    # In production, this would query actual transaction/occupancy data
-    results = []
-    control_metrics = {'rev_psh': 8.50, 'occupancy': 0.65}  # Baseline
-
-    for arm in arms:
-        arm_dict = dict(arm)
-        delta = float(arm_dict['delta'])
-
-        if arm_dict['control']:
-            # Control arm gets baseline metrics
-            rev_psh = control_metrics['rev_psh']
-            occupancy = control_metrics['occupancy']
-            lift_rev_psh = 0.0
-            lift_occupancy = 0.0
-        else:
-            # Simulate elasticity effects
-            # Simplified model: higher prices reduce demand but may increase revenue
-            occupancy_impact = -delta * 0.3  # 30% demand elasticity
-            revenue_impact = delta + (occupancy_impact * 0.5)  # Net effect
-
-            occupancy = control_metrics['occupancy'] * (1 + occupancy_impact)
-            rev_psh = control_metrics['rev_psh'] * (1 + revenue_impact)
-
-            lift_rev_psh = revenue_impact
-            lift_occupancy = occupancy_impact
-
-        # Insert or update results
-        result_query = """
-            INSERT INTO pricing_experiment_results
-            (experiment_id, arm_id, metric_window, rev_psh, occupancy, lift_rev_psh, lift_occupancy)
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
-            ON CONFLICT (experiment_id, arm_id, metric_window)
-            DO UPDATE SET
-                rev_psh = EXCLUDED.rev_psh,
-                occupancy = EXCLUDED.occupancy,
-                lift_rev_psh = EXCLUDED.lift_rev_psh,
-                lift_occupancy = EXCLUDED.lift_occupancy,
-                computed_at = now()
-        """
-
-        metric_window = f"[{experiment['created_at'].date()},{experiment['ends_at'].date()})"
-
-        await db.execute(
-            result_query,
-            uuid.UUID(experiment_id),
-            arm_dict['id'],
-            metric_window,
-            rev_psh,
-            occupancy,
-            lift_rev_psh,
-            lift_occupancy
-        )
-
-        results.append({
-            'arm_id': str(arm_dict['id']),
-            'delta': delta,
-            'control': arm_dict['control'],
-            'rev_psh': round(rev_psh, 2),
-            'occupancy': round(occupancy, 3),
-            'lift_rev_psh': round(lift_rev_psh, 3),
-            'lift_occupancy': round(lift_occupancy, 3)
-        })
+    results = await evaluate_probes(db, [experiment_id])
 
     return {
         'experiment_id': experiment_id,
         'status': 'evaluated',
-        'results': results,
+        'results': results.get(experiment_id, []),
         'evaluated_at': datetime.utcnow().isoformat()
-    }
\ No newline at end of file
+    }
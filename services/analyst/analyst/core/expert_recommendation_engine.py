@@ -1,8 +1,9 @@
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-from decimal import Decimal
 from ..db import Database
+from ..events import event_bus
+from ..observability import start_span
 from .parking_expert_ai import ParkingExpertAI
 
 logger = logging.getLogger(__name__)
@@ -26,13 +27,22 @@ class ExpertRecommendationEngine:
         await self._clear_existing_recommendations(user_zone_ids)
         all_recommendations = []
 
-        for zone_id in user_zone_ids:
+        for done, zone_id in enumerate(user_zone_ids, start=1):
             try:
-                zone_recommendations = await self._generate_zone_recommendations(zone_id)
+                with start_span("recommendations.zone", {"zone_id": zone_id}) as span:
+                    zone_recommendations = await self._generate_zone_recommendations(zone_id)
+                    span.set_attribute("recommendations.count", len(zone_recommendations))
                 all_recommendations.extend(zone_recommendations)
                 logger.info(f"🎯 EXPERT RECOMMENDATIONS: Zone {zone_id} generated {len(zone_recommendations)} recommendations")
+                await event_bus.publish("refresh.progress", [zone_id], {
+                    "stage": "recommendations", "done": done, "total": len(user_zone_ids),
+                    "count": len(zone_recommendations),
+                })
             except Exception as e:
                 logger.error(f"🎯 EXPERT RECOMMENDATIONS: Error for zone {zone_id}: {e}")
+                await event_bus.publish("refresh.progress", [zone_id], {
+                    "stage": "recommendations", "done": done, "total": len(user_zone_ids), "error": str(e),
+                })
                 continue
 
         # Store recommendations in database
@@ -42,6 +52,10 @@ class ExpertRecommendationEngine:
                 stored_rec = await self._store_recommendation(rec)
                 if stored_rec:
                     stored_recommendations.append(stored_rec)
+                    await event_bus.publish("recommendation.created", [stored_rec['zone_id']], {
+                        key: stored_rec[key]
+                        for key in ("id", "zone_id", "type", "rationale_text", "confidence", "status", "created_at")
+                    })
             except Exception as e:
                 logger.error(f"Error storing recommendation: {e}")
                 continue
@@ -333,17 +347,10 @@ class ExpertRecommendationEngine:
                 GROUP BY zone
             """
 
-            result = await self.db.fetchrow(stats_query, zone_id)
-            if not result:
+            stats = await self.db.fetchrow(stats_query, zone_id, numeric_as_float=True)
+            if not stats:
                 return None
 
-            stats = dict(result)
-
-            # Convert Decimal to float for JSON serialization
-            for key, value in stats.items():
-                if isinstance(value, Decimal):
-                    stats[key] = float(value)
-
             # Calculate additional metrics using real capacity
             if stats['total_sessions'] > 0 and stats['active_days'] > 0:
                 stats['sessions_per_day'] = stats['total_sessions'] / stats['active_days']
@@ -403,15 +410,13 @@ class ExpertRecommendationEngine:
 
             expected_lift = rec_data.get('expected_outcomes', {})
 
-            import json
-
             result = await self.db.fetchrow(
                 query,
                 rec_data['zone_id'],
                 rec_data['type'],
-                json.dumps(proposal),  # Convert dict to JSON string
+                proposal,
                 rec_data['rationale_text'],
-                json.dumps(expected_lift),  # Convert dict to JSON string
+                expected_lift,
                 rec_data['confidence'],
                 True,  # Require approval for expert recommendations
                 'pending'
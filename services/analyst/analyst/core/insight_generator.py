@@ -2,10 +2,11 @@ import json
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-from decimal import Decimal
 # OpenAI import moved to function level for new API
 from ..db import Database
 from ..config import settings
+from ..events import event_bus
+from ..observability import start_span
 from .parking_expert_ai import ParkingExpertAI
 
 logger = logging.getLogger(__name__)
@@ -30,20 +31,29 @@ class InsightGenerator:
 
             # Analyze each zone and generate insights
             all_insights = []
-            for zone_id in user_zone_ids:
+            for done, zone_id in enumerate(user_zone_ids, start=1):
                 logger.info(f"🔥 INSIGHT GENERATOR: Analyzing zone {zone_id}")
                 try:
-                    zone_insights = await self._analyze_zone(zone_id)
+                    with start_span("insights.zone", {"zone_id": zone_id}) as span:
+                        zone_insights = await self._analyze_zone(zone_id)
+                        span.set_attribute("insights.count", len(zone_insights))
                     logger.info(f"🔥 INSIGHT GENERATOR: Zone {zone_id} generated {len(zone_insights)} insights")
                     all_insights.extend(zone_insights)
+                    await event_bus.publish("refresh.progress", [zone_id], {
+                        "stage": "insights", "done": done, "total": len(user_zone_ids), "count": len(zone_insights),
+                    })
                 except Exception as zone_error:
                     logger.error(f"🔥 INSIGHT GENERATOR: Error analyzing zone {zone_id}: {str(zone_error)}")
+                    await event_bus.publish("refresh.progress", [zone_id], {
+                        "stage": "insights", "done": done, "total": len(user_zone_ids), "error": str(zone_error),
+                    })
                     continue  # Continue with other zones
 
             # Also generate cross-zone insights
             logger.info(f"🔥 INSIGHT GENERATOR: Generating cross-zone insights")
             try:
-                cross_zone_insights = await self._analyze_cross_zone_patterns(user_zone_ids)
+                with start_span("insights.cross_zone", {"refresh.zone_count": len(user_zone_ids)}):
+                    cross_zone_insights = await self._analyze_cross_zone_patterns(user_zone_ids)
                 logger.info(f"🔥 INSIGHT GENERATOR: Generated {len(cross_zone_insights)} cross-zone insights")
                 all_insights.extend(cross_zone_insights)
             except Exception as cross_error:
@@ -113,15 +123,23 @@ class InsightGenerator:
         insights = []
 
         # Generate different types of insights based on the data
-        insights.extend(await self._generate_volume_insights(zone_id, zone_stats))
-        insights.extend(await self._generate_duration_insights(zone_id, zone_stats))
-        insights.extend(await self._generate_revenue_insights(zone_id, zone_stats))
-        insights.extend(await self._generate_pattern_insights(zone_id, zone_stats))
-        insights.extend(await self._generate_occupancy_insights(zone_id, zone_stats))
+        generators = [
+            ("volume", self._generate_volume_insights),
+            ("duration", self._generate_duration_insights),
+            ("revenue", self._generate_revenue_insights),
+            ("pattern", self._generate_pattern_insights),
+            ("occupancy", self._generate_occupancy_insights),
+        ]
 
         # Always generate a basic zone summary insight if we have any data
         if zone_stats['total_transactions'] > 0:
-            insights.extend(await self._generate_basic_zone_insight(zone_id, zone_stats))
+            generators.append(("basic_zone", self._generate_basic_zone_insight))
+
+        for insight_type, generate in generators:
+            with start_span("insights.type", {"zone_id": zone_id, "insight_type": insight_type}) as span:
+                generated = await generate(zone_id, zone_stats)
+                span.set_attribute("insights.count", len(generated))
+            insights.extend(generated)
 
         return insights
 
@@ -194,14 +212,12 @@ class InsightGenerator:
         GROUP BY l.capacity, l.name
         """
 
-        result = await self.db.fetchrow(query, db_zone)
+        result = await self.db.fetchrow(query, db_zone, numeric_as_float=True)
 
         if not result or result['total_transactions'] == 0:
             return None
 
-        # Convert result to dict and handle Decimal objects
-        stats_dict = dict(result)
-        return self._convert_decimals_to_float(stats_dict)
+        return result
 
     async def _generate_volume_insights(self, zone_id: str, stats: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate insights about transaction volume"""
@@ -804,17 +820,6 @@ class InsightGenerator:
 
         return narrative
 
-    def _convert_decimals_to_float(self, obj):
-        """Convert Decimal objects to float for JSON serialization"""
-        if isinstance(obj, dict):
-            return {k: self._convert_decimals_to_float(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_decimals_to_float(v) for v in obj]
-        elif isinstance(obj, Decimal):
-            return float(obj)
-        else:
-            return obj
-
     async def _save_insight(self, insight: Dict[str, Any]) -> str:
         """Save a single insight to the database"""
 
@@ -824,9 +829,6 @@ class InsightGenerator:
         RETURNING id
         """
 
-        # Convert any Decimal values to float for JSON serialization
-        metrics_json = self._convert_decimals_to_float(insight.get('metrics_json', {}))
-
         result = await self.db.fetchval(
             query,
             insight['zone_id'],
@@ -834,7 +836,7 @@ class InsightGenerator:
             insight['window'],
             insight['narrative_text'],
             insight['confidence'],
-            json.dumps(metrics_json)
+            insight.get('metrics_json', {})
         )
 
         return str(result)
@@ -846,6 +848,14 @@ class InsightGenerator:
         for insight in insights:
             insight_id = await self._save_insight(insight)
             saved_ids.append(insight_id)
+            await event_bus.publish("insight.created", [insight['zone_id']], {
+                "id": insight_id,
+                "zone_id": insight['zone_id'],
+                "kind": insight['kind'],
+                "window": insight['window'],
+                "narrative_text": insight['narrative_text'],
+                "confidence": insight['confidence'],
+            })
 
         logger.info(f"Saved {len(saved_ids)} insights to database")
         return saved_ids
\ No newline at end of file
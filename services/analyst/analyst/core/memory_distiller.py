@@ -4,10 +4,20 @@ from openai import OpenAI
 import numpy as np
 from ..db import Database
 from ..config import settings
+from ..observability import llm_span, record_llm_usage
 
 logger = logging.getLogger(__name__)
 
 
+def or_tsquery_sql(placeholder: str) -> str:
+    """SQL subquery turning free text bound to ``placeholder`` into an OR tsquery.
+
+    plainto_tsquery normalises the words into lexemes joined with '&'; relaxing
+    them to '|' favours recall, and ts_rank_cd then orders by match density.
+    """
+    return f"(SELECT replace(plainto_tsquery('english', {placeholder})::text, '&', '|')::tsquery)"
+
+
 class MemoryDistiller:
     def __init__(self, db: Database):
         self.db = db
@@ -58,30 +68,36 @@ class MemoryDistiller:
         scope: str = "zone",
         limit: int = 10
     ) -> List[Dict[str, Any]]:
-        """Get memories relevant to a query using semantic search"""
+        """Get memories relevant to a query using ranked full-text search"""
 
         try:
-            # For now, use simple text matching since we don't have vector embeddings set up
-            # In production, you'd use vector similarity search
-
-            memories_query = """
-                SELECT m.id, m.scope, m.scope_ref, m.topic, m.kind, m.content,
-                       m.source_thread_id, m.created_at
-                FROM feedback_memories m
-                WHERE m.is_active = true
-                    AND (m.scope = 'global' OR
-                         (m.scope = 'zone' AND m.scope_ref::text LIKE $1))
-                    AND (m.content ILIKE $2 OR m.topic ILIKE $2)
-                ORDER BY m.created_at DESC
-                LIMIT $3
-            """
-
-            results = await self.db.fetch(
-                memories_query,
-                f"%{zone_id}%",
-                f"%{query}%",
-                limit
-            )
+            # Served by the GIN index on search_tsv and the partial zone_id/global
+            # btree indexes; topic hits (weight A) outrank content hits (weight B).
+            if query and query.strip():
+                memories_query = f"""
+                    SELECT m.id, m.scope, m.scope_ref, m.zone_id, m.topic, m.kind, m.content,
+                           m.source_thread_id, m.created_at,
+                           ts_rank_cd(m.search_tsv, q.tsq) AS rank
+                    FROM feedback_memories m,
+                         {or_tsquery_sql('$2')} AS q(tsq)
+                    WHERE m.is_active = true
+                        AND (m.scope = 'global' OR (m.scope = 'zone' AND m.zone_id = $1))
+                        AND m.search_tsv @@ q.tsq
+                    ORDER BY rank DESC, m.created_at DESC
+                    LIMIT $3
+                """
+                results = await self.db.fetch(memories_query, zone_id, query, limit)
+            else:
+                memories_query = """
+                    SELECT m.id, m.scope, m.scope_ref, m.zone_id, m.topic, m.kind, m.content,
+                           m.source_thread_id, m.created_at
+                    FROM feedback_memories m
+                    WHERE m.is_active = true
+                        AND (m.scope = 'global' OR (m.scope = 'zone' AND m.zone_id = $1))
+                    ORDER BY m.created_at DESC
+                    LIMIT $2
+                """
+                results = await self.db.fetch(memories_query, zone_id, limit)
 
             return [dict(row) for row in results]
 
@@ -170,15 +186,17 @@ Conversation:
 Extract memories from this conversation:
 """
 
-            response = self.openai_client.chat.completions.create(
-                model=settings.openai_model_fast,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.1,
-                max_tokens=1000
-            )
+            with llm_span(settings.openai_model_fast) as span:
+                response = self.openai_client.chat.completions.create(
+                    model=settings.openai_model_fast,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.1,
+                    max_tokens=1000
+                )
+                record_llm_usage(span, response)
 
             content = response.choices[0].message.content
 
@@ -249,12 +267,19 @@ Extract memories from this conversation:
         try:
             query = """
                 INSERT INTO feedback_memories
-                (scope, scope_ref, topic, kind, content, source_thread_id, created_by)
-                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                RETURNING id, scope, scope_ref, topic, kind, content,
+                (scope, scope_ref, zone_id, topic, kind, content, source_thread_id, created_by)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                RETURNING id, scope, scope_ref, zone_id, topic, kind, content,
                           source_thread_id, expires_at, created_by, created_at, is_active
             """
 
+            scope = memory_data.get('scope', 'zone')
+
+            # Zone ids are text, so keep them in the indexed zone_id column
+            zone_id = memory_data.get('zone_id')
+            if not zone_id and scope == 'zone' and memory_data.get('scope_ref'):
+                zone_id = str(memory_data['scope_ref'])
+
             # Convert scope_ref to UUID if it's a zone_id string
             scope_ref = None
             if memory_data.get('scope_ref'):
@@ -275,8 +300,9 @@ Extract memories from this conversation:
 
             result = await self.db.fetchrow(
                 query,
-                memory_data.get('scope', 'zone'),
+                scope,
                 scope_ref,
+                zone_id,
                 memory_data.get('topic'),
                 memory_data.get('kind', 'context'),
                 memory_data.get('content'),
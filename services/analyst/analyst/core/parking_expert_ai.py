@@ -175,6 +175,8 @@ class ParkingExpertAI:
 
         if benchmark and benchmark.get('quantitative_benchmarks'):
             benchmarks = benchmark['quantitative_benchmarks']
+            if isinstance(benchmarks, str):
+                benchmarks = json.loads(benchmarks)
         else:
             benchmarks = default_benchmarks
 
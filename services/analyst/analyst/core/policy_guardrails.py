@@ -1,15 +1,39 @@
 import json
-from typing import Dict, Any, Optional, List
+import time
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple, FrozenSet
 from datetime import datetime
 import pytz
 from pydantic import BaseModel
 from ..db import Database
 from ..models.changes import PriceChangeCreate
 from ..config import settings
+from ..invalidation import GUARDRAILS, invalidation_bus
+from .prompt_assembler import prompt_template_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# How many recent applied prices the consistency check averages
+RECENT_PRICES_LIMIT = 5
+
+# Recent applied prices per zone used for the consistency check, fetched for a
+# whole batch of zones in one round trip
+RECENT_PRICES_BATCH_QUERY = """
+    SELECT zone_id, new_price
+    FROM (
+        SELECT zone_id, new_price,
+               ROW_NUMBER() OVER (PARTITION BY zone_id ORDER BY created_at DESC) AS rn
+        FROM price_changes
+        WHERE zone_id = ANY($1::text[]) AND status = 'applied'
+            AND created_at > NOW() - INTERVAL '7 days'
+    ) recent
+    WHERE rn <= 5
+    ORDER BY zone_id, rn
+"""
+
 
 class GuardrailViolation(BaseModel):
     is_valid: bool
@@ -18,67 +42,124 @@ class GuardrailViolation(BaseModel):
     warnings: List[str] = []
 
 
+@dataclass(frozen=True)
+class GuardrailRule:
+    """One active agent_guardrails row parsed into typed thresholds."""
+
+    name: str
+    schema: Dict[str, Any]
+    max_change_pct: Optional[float] = None
+    min_price: Optional[float] = None
+    blackout_weekday_hours: Dict[str, FrozenSet[int]] = field(default_factory=dict)
+    require_approval_if_confidence_lt: Optional[float] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "GuardrailRule":
+        schema = row.get('json_schema') or {}
+        if isinstance(schema, str):
+            schema = json.loads(schema)
+
+        blackout = {
+            day.lower(): frozenset(int(hour) for hour in hours)
+            for day, hours in (schema.get('blackout_weekday_hours') or {}).items()
+        }
+
+        return cls(
+            name=row['name'],
+            schema=schema,
+            max_change_pct=schema.get('max_change_pct'),
+            min_price=schema.get('min_price'),
+            blackout_weekday_hours=blackout,
+            require_approval_if_confidence_lt=schema.get('require_approval_if_confidence_lt'),
+        )
+
+
+@dataclass(frozen=True)
+class CompiledGuardrails:
+    version: int
+    rules: Tuple[GuardrailRule, ...]
+    loaded_at: float
+
+
+class GuardrailRuleCache:
+    """Holds the compiled rule set for one database.
+
+    ``invalidate`` bumps the version; a compiled set built under an older
+    version is never served or stored.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._compiled: Optional[CompiledGuardrails] = None
+
+    def get(self) -> Optional[CompiledGuardrails]:
+        compiled = self._compiled
+        if compiled is None or compiled.version != self.version:
+            return None
+        if self.ttl_seconds and time.monotonic() - compiled.loaded_at > self.ttl_seconds:
+            return None
+        return compiled
+
+    def put(self, compiled: CompiledGuardrails) -> None:
+        if compiled.version == self.version:
+            self._compiled = compiled
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._compiled = None
+
+
+_rule_caches: "weakref.WeakKeyDictionary[Database, GuardrailRuleCache]" = weakref.WeakKeyDictionary()
+
+
+def _rule_cache_for(db: Database) -> GuardrailRuleCache:
+    cache = _rule_caches.get(db)
+    if cache is None:
+        cache = GuardrailRuleCache(settings.guardrail_cache_ttl_seconds)
+        _rule_caches[db] = cache
+    return cache
+
+
+def invalidate_guardrails() -> None:
+    """Call after agent_guardrails changes; prompt templates embed guardrail text too."""
+    for cache in list(_rule_caches.values()):
+        cache.invalidate()
+    prompt_template_cache.invalidate()
+
+
+# agent_guardrails has no writer in the app; migration 0011 notifies from a trigger
+invalidation_bus.register(GUARDRAILS, invalidate_guardrails)
+
+
 class PolicyGuardrails:
     def __init__(self, db: Database):
         self.db = db
         self.tz = pytz.timezone(settings.tz)
+        self.rule_cache = _rule_cache_for(db)
 
-    async def validate_price_change(self, change: PriceChangeCreate) -> GuardrailViolation:
-        """Validate a price change against active guardrails"""
+    async def validate_price_change(self, change: PriceChangeCreate, conn=None) -> GuardrailViolation:
+        """Validate a price change against active guardrails
+
+        Pass the applying transaction's ``conn`` so recent prices are read
+        alongside its locks rather than from another pooled connection.
+        """
 
         try:
-            # Get active guardrails
-            guardrails = await self._get_active_guardrails()
+            compiled = await self.get_compiled_rules()
 
-            if not guardrails:
+            if not compiled.rules:
                 logger.warning("No active guardrails found, allowing all changes")
                 return GuardrailViolation(is_valid=True)
 
-            violations = []
-            warnings = []
-
-            for guardrail in guardrails:
-                rules = guardrail.get('json_schema', {})
-
-                # Check maximum change percentage
-                if 'max_change_pct' in rules and change.change_pct:
-                    max_change = rules['max_change_pct']
-                    if abs(change.change_pct) > max_change:
-                        violations.append(f"Change percentage {change.change_pct:.1%} exceeds maximum {max_change:.1%}")
-
-                # Check minimum price
-                if 'min_price' in rules:
-                    min_price = rules['min_price']
-                    if change.new_price < min_price:
-                        violations.append(f"New price ${change.new_price:.2f} below minimum ${min_price:.2f}")
-
-                # Check blackout hours
-                if 'blackout_weekday_hours' in rules:
-                    violation = self._check_blackout_hours(change, rules['blackout_weekday_hours'])
-                    if violation:
-                        violations.append(violation)
-
-                # Check confidence-based approval requirements
-                if 'require_approval_if_confidence_lt' in rules:
-                    min_confidence = rules['require_approval_if_confidence_lt']
-                    # This would be checked if we had confidence in the change request
-                    # For now, we'll assume it requires approval
-                    if not change.recommendation_id:  # Direct changes need approval
-                        warnings.append(f"Manual price change requires approval")
+            violations, warnings = self._evaluate_rules(compiled.rules, change, datetime.now(self.tz))
 
             # Check for rate consistency (no dramatic swings)
-            consistency_warning = await self._check_rate_consistency(change)
+            consistency_warning = await self._check_rate_consistency(change, conn)
             if consistency_warning:
                 warnings.append(consistency_warning)
 
-            is_valid = len(violations) == 0
-
-            return GuardrailViolation(
-                is_valid=is_valid,
-                reason="; ".join(violations) if violations else None,
-                violated_rules=violations,
-                warnings=warnings
-            )
+            return self._build_result(violations, warnings)
 
         except Exception as e:
             logger.error(f"Error validating price change: {str(e)}")
@@ -87,8 +168,130 @@ class PolicyGuardrails:
                 reason=f"Validation error: {str(e)}"
             )
 
+    async def validate_batch(
+        self,
+        changes: List[PriceChangeCreate],
+        conn=None,
+        force: bool = False
+    ) -> List[GuardrailViolation]:
+        """Validate many price changes with one consistency query for all their zones.
+
+        Results are returned in the same order as ``changes``. Pass the applying
+        transaction's ``conn`` so recent prices are read under its locks. Each
+        accepted change (every change with ``force``) joins its zone's recent
+        prices before the next one is checked, as if applied in order.
+        """
+
+        if not changes:
+            return []
+
+        try:
+            compiled = await self.get_compiled_rules()
+
+            if not compiled.rules:
+                logger.warning("No active guardrails found, allowing all changes")
+                return [GuardrailViolation(is_valid=True) for _ in changes]
+
+            now = datetime.now(self.tz)
+            recent_prices = await self._get_recent_prices_by_zone(
+                sorted({change.zone_id for change in changes}), conn
+            )
+
+            results = []
+            for change in changes:
+                violations, warnings = self._evaluate_rules(compiled.rules, change, now)
+
+                zone_prices = recent_prices[change.zone_id]
+                consistency_warning = self._consistency_warning(change, zone_prices)
+                if consistency_warning:
+                    warnings.append(consistency_warning)
+
+                result = self._build_result(violations, warnings)
+                if result.is_valid or force:
+                    zone_prices.insert(0, change.new_price)
+                    del zone_prices[RECENT_PRICES_LIMIT:]
+                results.append(result)
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error validating price change batch: {str(e)}")
+            return [
+                GuardrailViolation(is_valid=False, reason=f"Validation error: {str(e)}")
+                for _ in changes
+            ]
+
+    async def get_compiled_rules(self) -> CompiledGuardrails:
+        """Return the compiled rule set, reloading agent_guardrails only when stale"""
+
+        compiled = self.rule_cache.get()
+        if compiled is not None:
+            return compiled
+
+        version = self.rule_cache.version
+        rows = await self._get_active_guardrails()
+
+        rules = []
+        for row in rows:
+            try:
+                rules.append(GuardrailRule.from_row(row))
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                logger.error(f"Skipping malformed guardrail {row.get('name')}: {str(e)}")
+
+        compiled = CompiledGuardrails(version=version, rules=tuple(rules), loaded_at=time.monotonic())
+        self.rule_cache.put(compiled)
+        return compiled
+
+    def _evaluate_rules(
+        self,
+        rules: Tuple[GuardrailRule, ...],
+        change: PriceChangeCreate,
+        now: datetime
+    ) -> Tuple[List[str], List[str]]:
+        """Evaluate compiled rules for one change without touching the database"""
+
+        violations = []
+        warnings = []
+
+        for rule in rules:
+            # Check maximum change percentage
+            if rule.max_change_pct is not None and change.change_pct:
+                if abs(change.change_pct) > rule.max_change_pct:
+                    violations.append(f"Change percentage {change.change_pct:.1%} exceeds maximum {rule.max_change_pct:.1%}")
+
+            # Check minimum price
+            if rule.min_price is not None and change.new_price < rule.min_price:
+                violations.append(f"New price ${change.new_price:.2f} below minimum ${rule.min_price:.2f}")
+
+            # Check blackout hours
+            if rule.blackout_weekday_hours:
+                violation = self._check_blackout_hours(change, rule.blackout_weekday_hours, now)
+                if violation:
+                    violations.append(violation)
+
+            # Check confidence-based approval requirements
+            if rule.require_approval_if_confidence_lt is not None:
+                # This would be checked if we had confidence in the change request
+                # For now, we'll assume it requires approval
+                if not change.recommendation_id:  # Direct changes need approval
+                    warnings.append("Manual price change requires approval")
+
+        return violations, warnings
+
+    @staticmethod
+    def _build_result(violations: List[str], warnings: List[str]) -> GuardrailViolation:
+        return GuardrailViolation(
+            is_valid=len(violations) == 0,
+            reason="; ".join(violations) if violations else None,
+            violated_rules=violations,
+            warnings=warnings
+        )
+
     async def _get_active_guardrails(self) -> List[Dict[str, Any]]:
-        """Get active guardrails from database"""
+        """Get active guardrails from database
+
+        Errors propagate so a failed load is never cached as an empty rule set.
+        """
 
         query = """
             SELECT name, json_schema
@@ -97,17 +300,18 @@ class PolicyGuardrails:
             ORDER BY name
         """
 
-        try:
-            results = await self.db.fetch(query)
-            return [dict(row) for row in results]
-        except Exception as e:
-            logger.error(f"Error fetching guardrails: {str(e)}")
-            return []
+        results = await self.db.fetch(query)
+        return [dict(row) for row in results]
 
-    def _check_blackout_hours(self, change: PriceChangeCreate, blackout_rules: Dict) -> Optional[str]:
+    def _check_blackout_hours(
+        self,
+        change: PriceChangeCreate,
+        blackout_rules: Dict,
+        now: Optional[datetime] = None
+    ) -> Optional[str]:
         """Check if change violates blackout hour restrictions"""
 
-        now = datetime.now(self.tz)
+        now = now or datetime.now(self.tz)
         current_dow = now.strftime('%a').lower()  # mon, tue, wed, etc.
         current_hour = now.hour
 
@@ -118,7 +322,7 @@ class PolicyGuardrails:
 
         return None
 
-    async def _check_rate_consistency(self, change: PriceChangeCreate) -> Optional[str]:
+    async def _check_rate_consistency(self, change: PriceChangeCreate, conn=None) -> Optional[str]:
         """Check for dramatic rate changes that might indicate errors"""
 
         if not change.prev_price or not change.change_pct:
@@ -135,21 +339,56 @@ class PolicyGuardrails:
         """
 
         try:
-            recent_changes = await self.db.fetch(query, change.zone_id)
+            recent_changes = await self._fetch_recent(conn, query, change.zone_id)
+            return self._consistency_warning(change, [row['new_price'] for row in recent_changes])
+
+        except Exception as e:
+            logger.error(f"Error checking rate consistency: {str(e)}")
+
+        return None
+
+    async def _fetch_recent(self, conn, query: str, *args) -> List[Any]:
+        """Run a consistency query, inside a savepoint when on the caller's transaction
 
-            if recent_changes:
-                recent_prices = [row['new_price'] for row in recent_changes]
-                avg_recent_price = sum(recent_prices) / len(recent_prices)
+        The consistency check is advisory and its errors are swallowed; the
+        savepoint keeps such an error from aborting the caller's transaction.
+        """
 
-                # Check if new price is dramatically different from recent average
-                price_diff_pct = abs(change.new_price - avg_recent_price) / avg_recent_price
+        if conn is None:
+            return await self.db.fetch(query, *args)
+        async with conn.transaction():
+            return await conn.fetch(query, *args)
 
-                if price_diff_pct > 0.3:  # 30% different from recent average
-                    return f"New price ${change.new_price:.2f} differs {price_diff_pct:.1%} from recent average ${avg_recent_price:.2f}"
+    async def _get_recent_prices_by_zone(self, zone_ids: List[str], conn=None) -> Dict[str, List[float]]:
+        """Recent applied prices for every zone in one query"""
 
+        prices: Dict[str, List[float]] = defaultdict(list)
+
+        try:
+            rows = await self._fetch_recent(conn, RECENT_PRICES_BATCH_QUERY, zone_ids)
+            for row in rows:
+                prices[row['zone_id']].append(row['new_price'])
         except Exception as e:
             logger.error(f"Error checking rate consistency: {str(e)}")
 
+        return prices
+
+    @staticmethod
+    def _consistency_warning(change: PriceChangeCreate, recent_prices: List[float]) -> Optional[str]:
+        if not change.prev_price or not change.change_pct or not recent_prices:
+            return None
+
+        recent_prices = [float(price) for price in recent_prices]
+        avg_recent_price = sum(recent_prices) / len(recent_prices)
+        if not avg_recent_price:
+            return None
+
+        # Check if new price is dramatically different from recent average
+        price_diff_pct = abs(change.new_price - avg_recent_price) / avg_recent_price
+
+        if price_diff_pct > 0.3:  # 30% different from recent average
+            return f"New price ${change.new_price:.2f} differs {price_diff_pct:.1%} from recent average ${avg_recent_price:.2f}"
+
         return None
 
     async def validate_recommendation_constraints(self, recommendation_data: Dict) -> GuardrailViolation:
@@ -170,10 +409,9 @@ class PolicyGuardrails:
 
                 # Validate proposal structure
                 if isinstance(proposal, dict) and 'price_changes' in proposal:
-                    for price_change in proposal['price_changes']:
-                        change_obj = PriceChangeCreate(**price_change)
-                        change_validation = await self.validate_price_change(change_obj)
+                    change_objs = [PriceChangeCreate(**price_change) for price_change in proposal['price_changes']]
 
+                    for change_validation in await self.validate_batch(change_objs):
                         if not change_validation.is_valid:
                             violations.extend(change_validation.violated_rules)
 
@@ -194,15 +432,18 @@ class PolicyGuardrails:
     async def get_guardrail_summary(self) -> Dict[str, Any]:
         """Get summary of active guardrails for display"""
 
-        guardrails = await self._get_active_guardrails()
+        try:
+            compiled = await self.get_compiled_rules()
+        except Exception as e:
+            logger.error(f"Error fetching guardrails: {str(e)}")
+            return {"active_count": 0, "rules": {}}
 
         summary = {
-            "active_count": len(guardrails),
+            "active_count": len(compiled.rules),
             "rules": {}
         }
 
-        for guardrail in guardrails:
-            rules = guardrail.get('json_schema', {})
-            summary["rules"][guardrail['name']] = rules
+        for rule in compiled.rules:
+            summary["rules"][rule.name] = rule.schema
 
         return summary
\ No newline at end of file
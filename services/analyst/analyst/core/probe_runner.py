@@ -0,0 +1,138 @@
+"""
+Bulk scheduling and concurrent evaluation of elasticity probes.
+
+Due experiments are found with an indexed ``ends_at`` scan, evaluated in
+chunks by a bounded pool of workers (each chunk is one mart query and one
+upsert via :func:`evaluate_probes`), and only then moved to ``complete`` so a
+failed evaluation is retried on the next run.
+"""
+import asyncio
+import logging
+from itertools import product
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config import settings
+from ..db import Database
+from ..deps.auth import UserContext
+from .elasticity_probe import evaluate_probes, schedule_probes
+
+logger = logging.getLogger(__name__)
+
+START_SCHEDULED_QUERY = """
+    UPDATE pricing_experiments
+    SET status = 'running', started_at = COALESCE(started_at, NOW())
+    WHERE status = 'scheduled' AND ends_at > NOW()
+"""
+
+# Served by idx_pricing_experiments_active_ends_at
+DUE_EXPERIMENTS_QUERY = """
+    SELECT id
+    FROM pricing_experiments
+    WHERE status IN ('scheduled', 'running') AND ends_at <= NOW()
+    ORDER BY ends_at
+    LIMIT $1
+"""
+
+RUNNING_EXPERIMENTS_QUERY = """
+    SELECT id
+    FROM pricing_experiments
+    WHERE status = 'running' AND ends_at > NOW()
+    ORDER BY ends_at
+    LIMIT $1
+"""
+
+COMPLETE_QUERY = """
+    UPDATE pricing_experiments
+    SET status = 'complete'
+    WHERE id = ANY($1::uuid[]) AND status IN ('scheduled', 'running')
+"""
+
+
+def probe_targets(zone_ids: Iterable[str], dayparts: Iterable[str], dows: Iterable[int]) -> List[Dict[str, Any]]:
+    """Cartesian product of zones, dayparts and days of week as schedule targets"""
+    return [
+        {'zone_id': zone_id, 'daypart': daypart, 'dow': dow}
+        for zone_id, daypart, dow in product(zone_ids, dayparts, dows)
+    ]
+
+
+class ProbeRunner:
+    """Schedules probes in bulk and evaluates due experiments concurrently."""
+
+    def __init__(self, db: Database, max_workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        self.db = db
+        self.max_workers = max_workers or settings.analyst_probe_runner_workers
+        self.chunk_size = chunk_size or settings.analyst_probe_runner_chunk_size
+
+    async def schedule(
+        self,
+        ctx: UserContext,
+        zone_ids: List[str],
+        dayparts: List[str],
+        dows: List[int],
+        deltas: Optional[List[float]] = None,
+        horizon_days: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Schedule one experiment per zone/daypart/dow combination"""
+
+        targets = probe_targets(zone_ids, dayparts, dows)
+        return await schedule_probes(
+            self.db, ctx, targets, deltas or [], horizon_days or settings.analyst_probe_horizon_days
+        )
+
+    async def run_once(self, include_running: bool = False, limit: int = 1000) -> Dict[str, Any]:
+        """Advance statuses and evaluate due (and optionally running) experiments"""
+
+        start = perf_counter()
+        started = await self.db.execute(START_SCHEDULED_QUERY)
+
+        due = [row['id'] for row in await self.db.fetch(DUE_EXPERIMENTS_QUERY, limit)]
+        interim = []
+        if include_running:
+            interim = [row['id'] for row in await self.db.fetch(RUNNING_EXPERIMENTS_QUERY, limit)]
+
+        evaluated, failed = await self._evaluate(due + interim)
+
+        completed = [experiment_id for experiment_id in due if experiment_id in evaluated]
+        if completed:
+            await self.db.execute(COMPLETE_QUERY, completed)
+
+        duration = perf_counter() - start
+        logger.info(
+            f"Probe runner evaluated {len(evaluated)} experiments "
+            f"({len(completed)} completed, {len(failed)} failed) in {duration:.2f}s"
+        )
+
+        return {
+            'started': int(started.split()[-1]) if started else 0,
+            'evaluated': len(evaluated),
+            'completed': len(completed),
+            'failed': [str(experiment_id) for experiment_id in failed],
+            'duration_seconds': duration,
+        }
+
+    async def _evaluate(self, experiment_ids: List[Any]):
+        """Evaluate experiments in chunks with at most ``max_workers`` in flight"""
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+        chunks = [
+            experiment_ids[i:i + self.chunk_size]
+            for i in range(0, len(experiment_ids), self.chunk_size)
+        ]
+
+        async def _worker(chunk: List[Any]):
+            async with semaphore:
+                try:
+                    await evaluate_probes(self.db, [str(experiment_id) for experiment_id in chunk])
+                    return chunk, []
+                except Exception as e:
+                    logger.error(f"Error evaluating {len(chunk)} probe experiments: {str(e)}")
+                    return [], chunk
+
+        evaluated, failed = set(), []
+        for done, errored in await asyncio.gather(*(_worker(chunk) for chunk in chunks)):
+            evaluated.update(done)
+            failed.extend(errored)
+
+        return evaluated, failed
@@ -1,14 +1,93 @@
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from ..db import Database
+from ..config import settings
+from ..invalidation import PROMPT_TEMPLATES, invalidation_bus
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_PROMPT = "You are Level Analyst, an AI optimization copilot for Level Parking."
+
+OUTPUT_REQUIREMENTS = "\n".join([
+    "## OUTPUT REQUIREMENTS",
+    "- Provide recommendations as valid JSON",
+    "- Include clear rationale for each recommendation",
+    "- Specify confidence levels (0.0-1.0)",
+    "- Respect all guardrails and constraints",
+    "- If confidence < 0.6, ask clarifying questions",
+    ""
+])
+
+
+@dataclass(frozen=True)
+class CompiledPromptTemplate:
+    """Static prompt sections resolved once per scope; dynamic sections are spliced in per call."""
+
+    base_prompt: str
+    guardrails_section: str
+
+
+# Used, uncached, for a call whose template could not be loaded
+FALLBACK_TEMPLATE = CompiledPromptTemplate(
+    base_prompt=DEFAULT_BASE_PROMPT,
+    guardrails_section="\n".join([
+        "## GUARDRAILS (MUST COMPLY)",
+        "Guardrails are unavailable right now - keep changes conservative and require approval for every recommendation.",
+        ""
+    ])
+)
+
+
+class PromptTemplateCache:
+    """Process-local cache of compiled prompt templates keyed by zone.
+
+    Every invalidation bumps a generation counter; loads that started under an
+    older generation are discarded so a slow load cannot resurrect stale text.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, CompiledPromptTemplate]] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, zone_id: str) -> Optional[CompiledPromptTemplate]:
+        entry = self._entries.get(zone_id)
+        if entry is None:
+            return None
+
+        loaded_at, template = entry
+        if self.ttl_seconds and time.monotonic() - loaded_at > self.ttl_seconds:
+            self._entries.pop(zone_id, None)
+            return None
+
+        return template
+
+    def put(self, zone_id: str, template: CompiledPromptTemplate, generation: int) -> None:
+        if generation != self._generation:
+            return
+        self._entries[zone_id] = (time.monotonic(), template)
+
+    def invalidate(self) -> None:
+        """Drop every compiled template (prompt activation or guardrail change)."""
+        self._generation += 1
+        self._entries.clear()
+
+
+prompt_template_cache = PromptTemplateCache(settings.prompt_template_cache_ttl_seconds)
+invalidation_bus.register(PROMPT_TEMPLATES, prompt_template_cache.invalidate)
+
 
 class PromptAssembler:
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, cache: Optional[PromptTemplateCache] = None):
         self.db = db
+        self.cache = cache if cache is not None else prompt_template_cache
 
     async def build_system_prompt(
         self,
@@ -20,21 +99,16 @@ class PromptAssembler:
         """Build a comprehensive system prompt for the AI analyst"""
 
         try:
-            # Get active prompt version
-            base_prompt = await self._get_active_prompt('zone', zone_id)
-
-            if not base_prompt:
-                base_prompt = await self._get_active_prompt('global')
-
-            if not base_prompt:
-                base_prompt = "You are Level Analyst, an AI optimization copilot for Level Parking."
-
-            # Get guardrails context
-            guardrails = await self._get_guardrails_context()
+            try:
+                template = await self.get_compiled_template(zone_id)
+            except Exception as e:
+                # Keep the per-call context; only the zone's prompt and guardrails are missing
+                logger.error(f"Error loading prompt template for {zone_id}: {str(e)}")
+                template = FALLBACK_TEMPLATE
 
             # Build comprehensive prompt
             prompt_sections = [
-                base_prompt,
+                template.base_prompt,
                 "",
                 "## CONTEXT",
                 f"Zone: {zone_id}",
@@ -62,12 +136,8 @@ class PromptAssembler:
                 ])
 
             # Add guardrails
-            if guardrails:
-                prompt_sections.extend([
-                    "## GUARDRAILS (MUST COMPLY)",
-                    guardrails,
-                    ""
-                ])
+            if template.guardrails_section:
+                prompt_sections.append(template.guardrails_section)
 
             # Add relevant memories
             if relevant_memories:
@@ -79,15 +149,7 @@ class PromptAssembler:
                 ])
 
             # Add output format requirements
-            prompt_sections.extend([
-                "## OUTPUT REQUIREMENTS",
-                "- Provide recommendations as valid JSON",
-                "- Include clear rationale for each recommendation",
-                "- Specify confidence levels (0.0-1.0)",
-                "- Respect all guardrails and constraints",
-                "- If confidence < 0.6, ask clarifying questions",
-                ""
-            ])
+            prompt_sections.append(OUTPUT_REQUIREMENTS)
 
             return "\n".join(prompt_sections)
 
@@ -95,12 +157,56 @@ class PromptAssembler:
             logger.error(f"Error building system prompt: {str(e)}")
             return "You are Level Analyst, an AI optimization copilot for Level Parking. Provide safe, data-driven recommendations."
 
+    async def get_compiled_template(self, zone_id: str) -> CompiledPromptTemplate:
+        """Return the compiled template for a zone, loading it on a cache miss
+
+        Load errors propagate and nothing is cached, so a transient failure
+        never pins ``FALLBACK_TEMPLATE`` for the cache TTL.
+        """
+
+        template = self.cache.get(zone_id)
+        if template is not None:
+            return template
+
+        generation = self.cache.generation
+        template = await self._compile_template(zone_id)
+        self.cache.put(zone_id, template, generation)
+        return template
+
+    async def _compile_template(self, zone_id: str) -> CompiledPromptTemplate:
+        """Resolve the active prompt (zone, then global) and pre-format guardrails"""
+
+        base_prompt = await self._get_active_prompt('zone', zone_id)
+
+        if not base_prompt:
+            base_prompt = await self._get_active_prompt('global')
+
+        if not base_prompt:
+            base_prompt = DEFAULT_BASE_PROMPT
+
+        guardrails = await self._get_guardrails_context()
+        guardrails_section = ""
+        if guardrails:
+            guardrails_section = "\n".join([
+                "## GUARDRAILS (MUST COMPLY)",
+                guardrails,
+                ""
+            ])
+
+        return CompiledPromptTemplate(
+            base_prompt=base_prompt,
+            guardrails_section=guardrails_section
+        )
+
     async def _get_active_prompt(
         self,
         scope: str,
         scope_ref: Optional[str] = None
     ) -> Optional[str]:
-        """Get the active prompt for a given scope"""
+        """Get the active prompt for a given scope
+
+        Errors propagate so a failed load is never cached as "no prompt".
+        """
 
         query = """
             SELECT system_prompt
@@ -112,15 +218,15 @@ class PromptAssembler:
             LIMIT 1
         """
 
-        try:
-            result = await self.db.fetchrow(query, scope, scope_ref)
-            return result['system_prompt'] if result else None
-        except Exception as e:
-            logger.error(f"Error fetching active prompt: {str(e)}")
-            return None
+        result = await self.db.fetchrow(query, scope, scope_ref)
+        return result['system_prompt'] if result else None
 
     async def _get_guardrails_context(self) -> str:
-        """Format guardrails for prompt context"""
+        """Format guardrails for prompt context
+
+        Load errors propagate so ``FALLBACK_TEMPLATE`` is used for that call
+        only; a malformed guardrail row is skipped.
+        """
 
         query = """
             SELECT name, json_schema
@@ -129,42 +235,46 @@ class PromptAssembler:
             ORDER BY name
         """
 
-        try:
-            results = await self.db.fetch(query)
+        results = await self.db.fetch(query)
 
-            if not results:
-                return "No specific guardrails configured."
+        if not results:
+            return "No specific guardrails configured."
 
-            guardrail_lines = []
-            for row in results:
-                schema = row['json_schema']
+        guardrail_lines = []
+        for row in results:
+            try:
+                line = self._format_guardrail(row['name'], row['json_schema'])
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                logger.error(f"Skipping malformed guardrail {row['name']}: {str(e)}")
+                continue
+            if line:
+                guardrail_lines.append(line)
 
-                if isinstance(schema, dict):
-                    rules = []
+        return "\n".join(guardrail_lines) if guardrail_lines else "Standard safety guardrails apply."
 
-                    if 'max_change_pct' in schema:
-                        rules.append(f"Maximum price change: {schema['max_change_pct']:.1%}")
+    @staticmethod
+    def _format_guardrail(name: str, schema: Any) -> Optional[str]:
+        if not isinstance(schema, dict):
+            return None
 
-                    if 'min_price' in schema:
-                        rules.append(f"Minimum price: ${schema['min_price']:.2f}")
+        rules = []
 
-                    if 'blackout_weekday_hours' in schema:
-                        blackout_info = []
-                        for day, hours in schema['blackout_weekday_hours'].items():
-                            blackout_info.append(f"{day}: hours {hours}")
-                        rules.append(f"Blackout hours: {', '.join(blackout_info)}")
+        if 'max_change_pct' in schema:
+            rules.append(f"Maximum price change: {schema['max_change_pct']:.1%}")
 
-                    if 'require_approval_if_confidence_lt' in schema:
-                        rules.append(f"Require approval if confidence < {schema['require_approval_if_confidence_lt']}")
+        if 'min_price' in schema:
+            rules.append(f"Minimum price: ${schema['min_price']:.2f}")
 
-                    if rules:
-                        guardrail_lines.append(f"- {row['name']}: {'; '.join(rules)}")
+        if 'blackout_weekday_hours' in schema:
+            blackout_info = []
+            for day, hours in schema['blackout_weekday_hours'].items():
+                blackout_info.append(f"{day}: hours {hours}")
+            rules.append(f"Blackout hours: {', '.join(blackout_info)}")
 
-            return "\n".join(guardrail_lines) if guardrail_lines else "Standard safety guardrails apply."
+        if 'require_approval_if_confidence_lt' in schema:
+            rules.append(f"Require approval if confidence < {schema['require_approval_if_confidence_lt']}")
 
-        except Exception as e:
-            logger.error(f"Error formatting guardrails: {str(e)}")
-            return "Error loading guardrails - proceed with caution."
+        return f"- {name}: {'; '.join(rules)}" if rules else None
 
     def _summarize_metrics(self, metrics: List[Dict]) -> str:
         """Summarize recent performance metrics"""
@@ -0,0 +1,395 @@
+"""
+Transactional outbox for pushing applied/reverted rates to the rates API.
+
+Apply/revert handlers call :func:`enqueue_rate_changes` inside the transaction
+that flips ``price_changes.status``, so a rate push is recorded if and only if
+the status change commits. :class:`RatesPublisher` drains the outbox in
+batches over one pooled keep-alive client:
+
+* rows are claimed with a lease (``next_attempt_at`` pushed forward), so a
+  crashed worker's batch becomes visible again instead of being lost;
+* a zone's rows are delivered in order: a row is only claimed once no
+  earlier pending row of its zone is leased or backing off, and claims are
+  serialized by an advisory lock, so a revert never overtakes its apply;
+* every item carries a deterministic idempotency key and every request an
+  ``Idempotency-Key`` derived from its items, so retries are safe;
+* transient failures (transport errors, 429, 5xx) are retried with
+  exponential backoff honouring ``Retry-After``, then released back to the
+  outbox; rows exceeding ``rates_publisher_max_attempts`` are marked failed,
+  including rows whose lease kept expiring (checked at claim time);
+* at most ``rates_publisher_max_in_flight`` batches are outstanding and a
+  429/503 pauses claiming, so a slow rates API backs up into the outbox
+  rather than into request handlers.
+"""
+import asyncio
+import hashlib
+import logging
+from decimal import Decimal
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from ..config import settings
+from ..db import Database, db
+from ..observability import command_row_count, record_rates_publish
+
+logger = logging.getLogger(__name__)
+
+ENQUEUE_QUERY = """
+    INSERT INTO rate_change_outbox (change_id, zone_id, action, payload, idempotency_key)
+    SELECT * FROM unnest($1::uuid[], $2::text[], $3::text[], $4::jsonb[], $5::text[])
+    ON CONFLICT (idempotency_key) DO NOTHING
+"""
+
+CLAIM_LOCK_ID = 918273646
+
+EXPIRE_QUERY = """
+    UPDATE rate_change_outbox
+    SET status = 'failed', last_error = COALESCE(last_error, 'lease expired') || ' (attempts exhausted)'
+    WHERE status = 'pending' AND next_attempt_at <= NOW() AND attempts >= $1
+"""
+
+CLAIM_QUERY = """
+    UPDATE rate_change_outbox o
+    SET attempts = o.attempts + 1,
+        next_attempt_at = NOW() + make_interval(secs => $2)
+    FROM (
+        SELECT c.id FROM rate_change_outbox c
+        WHERE c.status = 'pending' AND c.next_attempt_at <= NOW()
+          -- nothing overtakes an earlier row of the same zone that is in flight or backing off
+          AND NOT EXISTS (
+              SELECT 1 FROM rate_change_outbox e
+              WHERE e.zone_id = c.zone_id AND e.status = 'pending'
+                AND e.id < c.id AND e.next_attempt_at > NOW()
+          )
+        ORDER BY c.id
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    ) due
+    WHERE o.id = due.id
+    RETURNING o.id, o.payload, o.idempotency_key, o.attempts
+"""
+
+MARK_SENT_QUERY = """
+    UPDATE rate_change_outbox
+    SET status = 'sent', sent_at = NOW(), last_error = NULL
+    WHERE id = ANY($1::bigint[])
+"""
+
+MARK_FAILED_QUERY = """
+    UPDATE rate_change_outbox
+    SET status = 'failed', last_error = $2
+    WHERE id = ANY($1::bigint[])
+"""
+
+RELEASE_QUERY = """
+    UPDATE rate_change_outbox
+    SET status = CASE WHEN attempts >= $3 THEN 'failed' ELSE 'pending' END,
+        next_attempt_at = NOW() + make_interval(secs => LEAST($2 * power(2, attempts - 1), $4)),
+        last_error = $5
+    WHERE id = ANY($1::bigint[])
+"""
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def _number(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    return float(value) if isinstance(value, (Decimal, int, float)) else float(str(value))
+
+
+def rate_change_payload(change: Dict[str, Any], action: str) -> Dict[str, Any]:
+    """Body item sent to the rates API for one applied or reverted change"""
+
+    if action == "apply":
+        price = change.get("new_price")
+    else:
+        price = change.get("revert_to")
+        if price is None:
+            price = change.get("prev_price")
+
+    return {
+        "idempotency_key": f"{change['id']}:{action}",
+        "change_id": str(change["id"]),
+        "action": action,
+        "zone_id": change["zone_id"],
+        "location_id": str(change["location_id"]) if change.get("location_id") else None,
+        "price": _number(price),
+        "effective_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+async def enqueue_rate_changes(conn, changes: Sequence[Dict[str, Any]], action: str) -> None:
+    """Record outbox rows for ``changes`` on ``conn`` (call inside its transaction)"""
+
+    if not changes:
+        return
+
+    payloads = [rate_change_payload(change, action) for change in changes]
+    await conn.execute(
+        ENQUEUE_QUERY,
+        [change["id"] for change in changes],
+        [change["zone_id"] for change in changes],
+        [action] * len(changes),
+        payloads,
+        [payload["idempotency_key"] for payload in payloads],
+    )
+
+
+class RatesPublishError(Exception):
+    """A batch could not be delivered; ``retryable`` says whether to try again."""
+
+    def __init__(self, message: str, retryable: bool, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        try:
+            return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+class RatesPublisher:
+    """Drains rate_change_outbox to the rates API in batches."""
+
+    def __init__(
+        self,
+        db: Database,
+        base_url: Optional[str] = None,
+        token: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        batch_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+    ):
+        self.db = db
+        self.base_url = base_url if base_url is not None else settings.rates_api_base_url
+        self.token = token if token is not None else settings.rates_api_token
+        self.batch_size = batch_size or settings.rates_publisher_batch_size
+        self.max_in_flight = max_in_flight or settings.rates_publisher_max_in_flight
+        self._client = client
+        self._owns_client = client is None
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._paused_until = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.base_url) or not self._owns_client
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            headers = {"Content-Type": "application/json"}
+            if self.token:
+                headers["Authorization"] = f"Bearer {self.token}"
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=httpx.Timeout(settings.rates_publisher_timeout_seconds),
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight,
+                    max_keepalive_connections=self.max_in_flight,
+                ),
+            )
+        return self._client
+
+    async def start(self) -> None:
+        if not self.enabled:
+            logger.info("Rates API not configured – outbox publisher not started")
+            return
+        if getattr(self.db, "_pool", None) is None:
+            logger.warning("Database not initialized – skipping rates publisher startup")
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info("Rates outbox publisher started")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    def notify(self) -> None:
+        """Wake the publisher after new outbox rows commit"""
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=settings.rates_publisher_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                await self.drain()
+            except Exception as exc:  # pragma: no cover - defensive logging
+                logger.exception("Rates outbox drain failed: %s", exc)
+
+    async def drain(self) -> Dict[str, int]:
+        """Publish until the outbox has nothing due, with bounded concurrency"""
+
+        totals = {"sent": 0, "failed": 0, "retry": 0}
+        while True:
+            pause = self._paused_until - asyncio.get_running_loop().time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+            batches = []
+            for _ in range(self.max_in_flight):
+                rows = await self._claim()
+                if not rows:
+                    break
+                batches.append(rows)
+                if len(rows) < self.batch_size:
+                    break
+
+            if not batches:
+                return totals
+
+            for counts in await asyncio.gather(*(self._publish_batch(rows) for rows in batches)):
+                for key, count in counts.items():
+                    totals[key] += count
+
+            if len(batches[-1]) < self.batch_size:
+                return totals
+
+    async def _claim(self) -> List[Dict[str, Any]]:
+        """Lease the next due rows, oldest first; expired leases past max attempts become failed"""
+
+        async with self.db.transaction() as conn:
+            # The lock is held until commit, so the claim's zone-order check sees every other worker's leases
+            async with conn.transaction():
+                await conn.execute("SELECT pg_advisory_xact_lock($1)", CLAIM_LOCK_ID)
+                expired = command_row_count(await conn.execute(EXPIRE_QUERY, settings.rates_publisher_max_attempts))
+                rows = await conn.fetch(CLAIM_QUERY, self.batch_size, settings.rates_publisher_lease_seconds)
+        if expired:
+            record_rates_publish("failed", expired)
+            logger.error(f"Marked {expired} outbox rows failed after {settings.rates_publisher_max_attempts} attempts")
+        # RETURNING order is unspecified; items for one zone must go out oldest first
+        return sorted(rows, key=lambda row: row["id"])
+
+    async def _publish_batch(self, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        items = [row["payload"] for row in rows]
+        ids_by_key = {row["idempotency_key"]: row["id"] for row in rows}
+        start = perf_counter()
+
+        try:
+            rejected = await self._post_with_retries(items)
+        except RatesPublishError as exc:
+            ids = list(ids_by_key.values())
+            if exc.retryable:
+                await self.db.execute(
+                    RELEASE_QUERY,
+                    ids,
+                    settings.rates_publisher_backoff_seconds,
+                    settings.rates_publisher_max_attempts,
+                    settings.rates_publisher_max_backoff_seconds,
+                    str(exc),
+                )
+                record_rates_publish("retry", len(ids), perf_counter() - start)
+                logger.warning(f"Rates API unavailable, released {len(ids)} outbox rows: {exc}")
+                return {"sent": 0, "failed": 0, "retry": len(ids)}
+
+            await self.db.execute(MARK_FAILED_QUERY, ids, str(exc))
+            record_rates_publish("failed", len(ids), perf_counter() - start)
+            logger.error(f"Rates API rejected batch of {len(ids)} changes: {exc}")
+            return {"sent": 0, "failed": len(ids), "retry": 0}
+
+        failed_ids = [ids_by_key[key] for key in rejected if key in ids_by_key]
+        sent_ids = [row_id for key, row_id in ids_by_key.items() if key not in rejected]
+
+        if sent_ids:
+            await self.db.execute(MARK_SENT_QUERY, sent_ids)
+        if failed_ids:
+            await self.db.execute(MARK_FAILED_QUERY, failed_ids, "rejected by rates API")
+
+        duration = perf_counter() - start
+        record_rates_publish("sent", len(sent_ids), duration)
+        if failed_ids:
+            record_rates_publish("failed", len(failed_ids))
+
+        return {"sent": len(sent_ids), "failed": len(failed_ids), "retry": 0}
+
+    async def _post_with_retries(self, items: List[Dict[str, Any]]) -> List[str]:
+        """POST a batch; returns idempotency keys the API rejected individually"""
+
+        keys = sorted(item["idempotency_key"] for item in items)
+        batch_key = hashlib.sha256("\n".join(keys).encode()).hexdigest()
+        client = self._get_client()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await client.post(
+                    settings.rates_api_batch_path,
+                    json={"changes": items},
+                    headers={"Idempotency-Key": batch_key},
+                )
+                error = self._check_response(response)
+            except httpx.HTTPError as exc:
+                error = RatesPublishError(f"{type(exc).__name__}: {exc}", retryable=True)
+
+            if error is None:
+                return self._rejected_keys(response)
+
+            if not error.retryable or attempt > settings.rates_publisher_max_retries:
+                raise error
+
+            delay = error.retry_after
+            if delay is None:
+                delay = min(
+                    settings.rates_publisher_backoff_seconds * 2 ** (attempt - 1),
+                    settings.rates_publisher_max_backoff_seconds,
+                )
+            else:
+                # The API asked every caller to slow down, so stop claiming new batches too
+                self._paused_until = asyncio.get_running_loop().time() + delay
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _check_response(response: httpx.Response) -> Optional[RatesPublishError]:
+        if response.is_success or response.status_code == 409:
+            # 409: the API already processed this Idempotency-Key
+            return None
+        return RatesPublishError(
+            f"HTTP {response.status_code}: {response.text[:200]}",
+            retryable=response.status_code in RETRYABLE_STATUS,
+            retry_after=_retry_after_seconds(response),
+        )
+
+    @staticmethod
+    def _rejected_keys(response: httpx.Response) -> List[str]:
+        try:
+            body = response.json()
+        except ValueError:
+            return []
+        if not isinstance(body, dict):
+            return []
+        return [
+            result.get("idempotency_key")
+            for result in body.get("results") or []
+            if isinstance(result, dict) and result.get("status") == "rejected"
+        ]
+
+
+rates_publisher = RatesPublisher(db)
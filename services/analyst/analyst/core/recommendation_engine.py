@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 import openai
 from ..db import Database
 from ..config import settings
+from ..observability import llm_span, record_llm_usage
 from .rate_inference import RateInference
 from .policy_guardrails import PolicyGuardrails
 from .memory_distiller import MemoryDistiller
@@ -185,15 +186,17 @@ Provide 1-3 concrete recommendations with the following JSON format:
 }}]
 """
 
-            response = await openai.ChatCompletion.acreate(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.1,
-                max_tokens=2000
-            )
+            with llm_span(model) as span:
+                response = await openai.ChatCompletion.acreate(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_message}
+                    ],
+                    temperature=0.1,
+                    max_tokens=2000
+                )
+                record_llm_usage(span, response)
 
             content = response.choices[0].message.content
 
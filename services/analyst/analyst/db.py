@@ -1,15 +1,45 @@
+import asyncio
 import asyncpg
 import json
 import logging
-from typing import Optional, Dict, Any, List
+import orjson
+from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import Optional, Dict, Any, List, AsyncIterator, Union
 from .config import settings
+from .observability import command_row_count, db_span, record_row_count
+from .server_timing import record, timed
+from .utils.fast_json import dumps as dumps_json
 
 logger = logging.getLogger(__name__)
 
 
+def _encode_json(value: Any) -> str:
+    return dumps_json(value).decode()
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """json/jsonb parameters take Python objects and columns come back decoded"""
+    for typename in ("json", "jsonb"):
+        await conn.set_type_codec(typename, encoder=_encode_json, decoder=orjson.loads, schema="pg_catalog")
+
+
+async def _init_float_connection(conn: asyncpg.Connection):
+    await _init_connection(conn)
+    await conn.set_type_codec("numeric", encoder=str, decoder=float, schema="pg_catalog")
+
+
+def _as_columns(batch: List[asyncpg.Record]) -> Dict[str, List[Any]]:
+    names = list(batch[0].keys())
+    return dict(zip(names, map(list, zip(*batch))))
+
+
 class Database:
     def __init__(self):
         self._pool: Optional[asyncpg.Pool] = None
+        # Same database, numeric decoded as float; created on first numeric_as_float call
+        self._float_pool: Optional[asyncpg.Pool] = None
+        self._float_pool_lock = asyncio.Lock()
 
     async def initialize(self):
         if not settings.supabase_db_url:
@@ -17,37 +47,110 @@ class Database:
 
         self._pool = await asyncpg.create_pool(
             settings.supabase_db_url,
-            min_size=1,
-            max_size=10,
-            command_timeout=60
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            command_timeout=60,
+            init=_init_connection
         )
         logger.info("Database connection pool initialized")
 
     async def close(self):
+        if self._float_pool:
+            await self._float_pool.close()
+            self._float_pool = None
         if self._pool:
             await self._pool.close()
             logger.info("Database connection pool closed")
 
-    async def execute(self, query: str, *args, **kwargs) -> str:
-        async with self._pool.acquire() as conn:
-            return await conn.execute(query, *args, **kwargs)
+    async def _get_float_pool(self) -> asyncpg.Pool:
+        async with self._float_pool_lock:
+            if self._float_pool is None:
+                self._float_pool = await asyncpg.create_pool(
+                    settings.supabase_db_url,
+                    min_size=0,
+                    max_size=settings.db_float_pool_max_size,
+                    command_timeout=60,
+                    init=_init_float_connection
+                )
+                logger.info("Float numeric connection pool initialized")
+        return self._float_pool
+
+    @asynccontextmanager
+    async def _acquire(self, numeric_as_float: bool = False):
+        start = perf_counter()
+        if numeric_as_float:
+            pool = self._float_pool or await self._get_float_pool()
+        else:
+            pool = self._pool
+        async with pool.acquire() as conn:
+            record("db-acquire", perf_counter() - start)
+            yield conn
 
-    async def fetch(self, query: str, *args, **kwargs) -> List[Dict[str, Any]]:
-        async with self._pool.acquire() as conn:
-            rows = await conn.fetch(query, *args, **kwargs)
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        with db_span("execute", query) as span:
+            async with self._acquire() as conn:
+                with timed("sql"):
+                    status = await conn.execute(query, *args, **kwargs)
+            record_row_count(span, command_row_count(status))
+            return status
+
+    async def fetch(self, query: str, *args, numeric_as_float: bool = False, **kwargs) -> List[Dict[str, Any]]:
+        with db_span("fetch", query) as span:
+            async with self._acquire(numeric_as_float) as conn:
+                with timed("sql"):
+                    rows = await conn.fetch(query, *args, **kwargs)
+            record_row_count(span, len(rows))
             return [dict(row) for row in rows]
 
-    async def fetchrow(self, query: str, *args, **kwargs) -> Optional[Dict[str, Any]]:
-        async with self._pool.acquire() as conn:
-            row = await conn.fetchrow(query, *args, **kwargs)
+    async def fetchrow(self, query: str, *args, numeric_as_float: bool = False, **kwargs) -> Optional[Dict[str, Any]]:
+        with db_span("fetchrow", query) as span:
+            async with self._acquire(numeric_as_float) as conn:
+                with timed("sql"):
+                    row = await conn.fetchrow(query, *args, **kwargs)
+            record_row_count(span, 1 if row else 0)
             return dict(row) if row else None
 
-    async def fetchval(self, query: str, *args, **kwargs):
-        async with self._pool.acquire() as conn:
-            return await conn.fetchval(query, *args, **kwargs)
+    async def fetchval(self, query: str, *args, numeric_as_float: bool = False, **kwargs):
+        with db_span("fetchval", query) as span:
+            async with self._acquire(numeric_as_float) as conn:
+                with timed("sql"):
+                    value = await conn.fetchval(query, *args, **kwargs)
+            record_row_count(span, 0 if value is None else 1)
+            return value
+
+    async def stream(
+        self,
+        query: str,
+        *args,
+        batch_size: int = 5000,
+        columnar: bool = False,
+        numeric_as_float: bool = False
+    ) -> AsyncIterator[Union[List[asyncpg.Record], Dict[str, List[Any]]]]:
+        """Yield batches of at most ``batch_size`` rows from a server-side cursor.
+
+        Batches are lists of records, or ``{column: [values]}`` with ``columnar=True``.
+        Only one batch is held in memory at a time. The connection stays checked out
+        until the generator finishes, so wrap early exits in ``contextlib.aclosing``.
+        """
+        rows = 0
+        with db_span("stream", query, current=False) as span:
+            async with self._acquire(numeric_as_float) as conn:
+                # Postgres cursors only live inside a transaction
+                async with conn.transaction():
+                    cursor = await conn.cursor(query, *args)
+                    while True:
+                        with timed("sql"):
+                            batch = await cursor.fetch(batch_size)
+                        if not batch:
+                            break
+                        rows += len(batch)
+                        yield _as_columns(batch) if columnar else batch
+                        if len(batch) < batch_size:
+                            break
+            record_row_count(span, rows)
 
     def transaction(self):
-        return self._pool.acquire()
+        return self._acquire()
 
     async def set_jwt_claims(self, conn: asyncpg.Connection, claims: Dict[str, Any]):
         claims_json = json.dumps(claims)
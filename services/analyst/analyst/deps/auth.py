@@ -6,6 +6,8 @@ from typing import List, Optional
 import json
 from ..config import settings
 from ..db import get_db, Database
+from ..server_timing import timed
+from .jwt_keys import signing_keys, verified_tokens
 
 
 class UserContext(BaseModel):
@@ -20,23 +22,34 @@ class UserContext(BaseModel):
 security = HTTPBearer()
 
 
+async def _decode(token: str) -> dict:
+    if signing_keys.configured:
+        # RS256 production mode
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = await signing_keys.get(kid)
+        return jwt.decode(token, key, algorithms=["RS256"], issuer=settings.jwt_issuer)
+
+    # HS256 development mode
+    return jwt.decode(
+        token,
+        settings.dev_jwt_hs256_secret,
+        algorithms=["HS256"],
+        issuer=settings.jwt_issuer
+    )
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> UserContext:
     token = credentials.credentials
 
     try:
-        if settings.jwt_public_key_base64:
-            # RS256 production mode
-            raise NotImplementedError("RS256 JWT validation not implemented yet")
-        else:
-            # HS256 development mode
-            payload = jwt.decode(
-                token,
-                settings.dev_jwt_hs256_secret,
-                algorithms=["HS256"],
-                issuer=settings.jwt_issuer
-            )
+        with timed("auth"):
+            cached = verified_tokens.get(token)
+            if cached is not None:
+                return cached
+
+            payload = await _decode(token)
 
         user_context = UserContext(
             sub=payload.get("sub", ""),
@@ -46,6 +59,7 @@ async def get_current_user(
             iss=payload.get("iss", ""),
             exp=payload.get("exp", 0)
         )
+        verified_tokens.put(token, user_context, user_context.exp)
 
         # Note: JWT claims for RLS would be set here in production mode with database
 
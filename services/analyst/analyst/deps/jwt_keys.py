@@ -0,0 +1,198 @@
+"""
+RS256 verification keys and the verified-token cache used by ``deps.auth``.
+
+``signing_keys`` holds the public keys by ``kid``: either the single PEM from
+``JWT_PUBLIC_KEY_BASE64`` or the set published at ``JWT_JWKS_URL``, which is
+fetched at startup, refreshed in the background every
+``jwt_jwks_refresh_seconds`` and re-fetched early (at most every
+``MIN_REFRESH_INTERVAL`` seconds, counting failed fetches) when a token names a
+kid not seen yet, so key rotation needs no restart.
+
+``verified_tokens`` remembers tokens that passed verification, keyed by their
+SHA-256 and kept until their ``exp``, so the card's repeated calls with the
+same token skip signature checks entirely. It is bounded (least recently used
+tokens are evicted first) and cleared whenever a refresh drops a key.
+"""
+import asyncio
+import base64
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from jose import JWTError, jwk
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Floor between refreshes triggered by unknown kids, so forged headers cannot hammer the JWKS endpoint
+MIN_REFRESH_INTERVAL = 30.0
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified tokens by SHA-256, each entry valid until the token's exp."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, token: str, value: Any, expires_at: Optional[float]) -> None:
+        # Tokens without exp are verified every time rather than trusted indefinitely
+        if self.max_size <= 0 or not expires_at or expires_at <= time.time():
+            return
+        key = self._key(token)
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SigningKeys:
+    """RS256 public keys by kid, from a static PEM or a JWKS URL refreshed in the background."""
+
+    def __init__(
+        self,
+        public_key_pem: Optional[str] = None,
+        jwks_url: Optional[str] = None,
+        refresh_seconds: float = 3600.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.jwks_url = jwks_url
+        self.refresh_seconds = refresh_seconds
+        self._client = client
+        self._static_key = jwk.construct(public_key_pem, "RS256") if public_key_pem else None
+        self._keys: Dict[str, Any] = {}
+        # Set before every fetch, so an unreachable JWKS endpoint is rate limited too
+        self._attempted_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._removed_handlers: List[Callable[[], None]] = []
+
+    @classmethod
+    def from_settings(cls) -> "SigningKeys":
+        pem = base64.b64decode(settings.jwt_public_key_base64).decode() if settings.jwt_public_key_base64 else None
+        return cls(
+            public_key_pem=pem,
+            jwks_url=settings.jwt_jwks_url,
+            refresh_seconds=settings.jwt_jwks_refresh_seconds,
+        )
+
+    @property
+    def configured(self) -> bool:
+        return self._static_key is not None or bool(self.jwks_url)
+
+    def on_keys_removed(self, handler: Callable[[], None]) -> None:
+        """Called when a refresh drops a kid; tokens it signed must not stay trusted"""
+        self._removed_handlers.append(handler)
+
+    async def get(self, kid: Optional[str]) -> Any:
+        if not self.jwks_url:
+            if self._static_key is None:
+                raise JWTError("No RS256 public key configured")
+            return self._static_key
+
+        key = self._keys.get(kid)
+        if key is None and self._refresh_allowed():
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Could not refresh JWKS from {self.jwks_url}: {str(e)}")
+            key = self._keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key {kid!r}")
+        return key
+
+    def _refresh_allowed(self) -> bool:
+        return self._attempted_at is None or time.monotonic() - self._attempted_at >= MIN_REFRESH_INTERVAL
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            # Requests that queued behind an in-flight refresh reuse its result, even a failed one
+            if self._attempted_at is not None and time.monotonic() - self._attempted_at < 1.0:
+                return
+            self._attempted_at = time.monotonic()
+            response = await self._get_client().get(self.jwks_url)
+            response.raise_for_status()
+            keys = {}
+            for entry in response.json().get("keys", []):
+                if entry.get("kty") != "RSA" or entry.get("use", "sig") != "sig":
+                    continue
+                try:
+                    keys[entry.get("kid")] = jwk.construct(entry, entry.get("alg", "RS256"))
+                except Exception as e:
+                    logger.warning(f"Skipping unusable JWKS key {entry.get('kid')!r}: {str(e)}")
+
+            removed = set(self._keys) - set(keys)
+            self._keys = keys
+            logger.info(f"Loaded {len(keys)} signing keys from JWKS")
+
+        if removed:
+            logger.info(f"Signing keys {sorted(map(str, removed))} were retired")
+            for handler in self._removed_handlers:
+                handler()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10.0)
+        return self._client
+
+    async def start(self) -> None:
+        if not self.jwks_url:
+            return
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Initial JWKS fetch from {self.jwks_url} failed ({str(e)}); retrying on demand")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Background JWKS refresh failed, keeping {len(self._keys)} cached keys: {str(e)}")
+
+
+signing_keys = SigningKeys.from_settings()
+verified_tokens = VerifiedTokenCache(settings.jwt_verified_cache_size)
+signing_keys.on_keys_removed(verified_tokens.clear)
@@ -0,0 +1,220 @@
+"""
+Refresh progress and newly published insights/recommendations as events.
+
+``event_bus.publish`` fans an event out to this worker's subscribers (the SSE
+stream) and sends it with ``pg_notify`` so the other gunicorn workers and
+replicas do the same. Each worker holds one dedicated LISTEN connection
+(``NotificationListener``, shared with ``analyst.invalidation``), reconnecting
+with backoff when it drops; events
+carry the publishing worker's id so it skips its own notifications.
+
+Every ``refresh.*`` event published while a refresh run is executing carries
+that run's ``run_id`` (``refresh_run_id``), so a client can tell its own
+refresh apart from others touching the same zones.
+
+Events are best effort: ``publish`` never raises, a slow subscriber loses its
+oldest queued events, and nothing sent while a listener is reconnecting is
+replayed.
+"""
+import asyncio
+import itertools
+import logging
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import asyncpg
+import orjson
+
+from .config import settings
+from .db import Database, db
+from .utils.fast_json import dumps
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "analyst_events"
+# pg_notify rejects payloads of 8000 bytes or more
+MAX_NOTIFY_BYTES = 7900
+
+# Refresh run the current task belongs to; set by ensure_daily_refresh
+refresh_run_id: ContextVar[Optional[str]] = ContextVar("refresh_run_id", default=None)
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@dataclass(frozen=True)
+class Event:
+    id: str
+    type: str
+    zone_ids: Tuple[str, ...]
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "type": self.type, "zone_ids": list(self.zone_ids), "data": self.data}
+
+
+class Subscription:
+    """Queue of events touching any of ``zone_ids``; drops the oldest event when full."""
+
+    def __init__(self, zone_ids: Iterable[str], max_queue: int):
+        self.zone_ids = frozenset(zone_ids)
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(max_queue)
+        self.dropped = 0
+
+    def deliver(self, event: Event) -> None:
+        visible = tuple(zone for zone in event.zone_ids if zone in self.zone_ids)
+        if not visible:
+            return
+        if visible != event.zone_ids:
+            # refresh-wide events only name the zones this subscriber may see
+            event = Event(event.id, event.type, visible, event.data)
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event, or None once ``timeout`` passes without one"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class NotificationListener:
+    """One dedicated LISTEN connection per worker, dispatching payloads by channel."""
+
+    def __init__(self, dsn: Optional[str] = None):
+        self.dsn = dsn
+        self._handlers: Dict[str, List[Callable[[str], None]]] = {}
+        self._connect_handlers: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.connected = asyncio.Event()
+
+    def add_handler(self, channel: str, handler: Callable[[str], None]) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def add_connect_handler(self, handler: Callable[[], None]) -> None:
+        """Called after every (re)connect; notifications sent while disconnected are lost"""
+        self._connect_handlers.append(handler)
+
+    async def start(self) -> None:
+        dsn = self.dsn or settings.supabase_db_url
+        if not settings.events_listener_enabled or not dsn:
+            logger.info("Notification listener disabled – events stay within this worker")
+            return
+        self._task = asyncio.create_task(self._run(dsn))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, dsn: str) -> None:
+        backoff = 1.0
+        while True:
+            conn: Optional[asyncpg.Connection] = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: lost.set())
+                for channel in self._handlers:
+                    await conn.add_listener(channel, self._dispatch)
+                self.connected.set()
+                backoff = 1.0
+                logger.info(f"Listening for notifications on {sorted(self._handlers)}")
+                for handler in self._connect_handlers:
+                    try:
+                        handler()
+                    except Exception:
+                        logger.exception("Notification listener connect handler failed")
+
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=settings.events_listener_ping_seconds)
+                    except asyncio.TimeoutError:
+                        # termination is not reported for a silently dropped link
+                        await conn.fetchval("SELECT 1", timeout=settings.events_listener_ping_seconds)
+                logger.warning("Notification listener connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification listener failed ({str(e)}); retrying in {backoff:.0f}s")
+            finally:
+                self.connected.clear()
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def _dispatch(self, _conn, _pid, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception(f"Notification handler for {channel} failed")
+
+
+class EventBus:
+    """In-process pub/sub for refresh events, mirrored to other workers via NOTIFY."""
+
+    def __init__(self, database: Database, listener: NotificationListener):
+        self.db = database
+        self.origin = uuid.uuid4().hex[:12]
+        self._ids = itertools.count(1)
+        self._subscriptions: Set[Subscription] = set()
+        listener.add_handler(EVENTS_CHANNEL, self._on_notification)
+
+    @contextmanager
+    def subscribe(self, zone_ids: Iterable[str]) -> Iterator[Subscription]:
+        subscription = Subscription(zone_ids, settings.events_queue_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    async def publish(self, event_type: str, zone_ids: Iterable[str], data: Optional[Dict[str, Any]] = None) -> Event:
+        data = data or {}
+        run_id = refresh_run_id.get()
+        if run_id and event_type.startswith("refresh."):
+            data = {**data, "run_id": run_id}
+        event = Event(f"{self.origin}-{next(self._ids)}", event_type, tuple(zone_ids), data)
+        self._fan_out(event)
+        await self._notify(event)
+        return event
+
+    def _fan_out(self, event: Event) -> None:
+        for subscription in list(self._subscriptions):
+            subscription.deliver(event)
+
+    async def _notify(self, event: Event) -> None:
+        if getattr(self.db, "_pool", None) is None:
+            return
+
+        payload = dumps({"origin": self.origin, **event.as_dict()})
+        if len(payload) > MAX_NOTIFY_BYTES:
+            payload = dumps({"origin": self.origin, **event.as_dict(), "data": {"truncated": True}})
+        try:
+            await self.db.execute("SELECT pg_notify($1, $2)", EVENTS_CHANNEL, payload.decode())
+        except Exception as e:
+            logger.warning(f"Could not notify other workers of {event.type}: {str(e)}")
+
+    def _on_notification(self, payload: str) -> None:
+        message = orjson.loads(payload)
+        if message.get("origin") == self.origin:
+            return
+        self._fan_out(Event(message["id"], message["type"], tuple(message["zone_ids"]), message.get("data") or {}))
+
+
+notification_listener = NotificationListener()
+event_bus = EventBus(db, notification_listener)
@@ -0,0 +1,76 @@
+"""
+Cross-worker invalidation of process-local caches.
+
+Caches register a handler under a name (``invalidation_bus.register``).
+``await invalidation_bus.invalidate(name)`` runs the local handlers and sends
+the name with ``pg_notify`` on ``analyst_invalidate``; the dedicated LISTEN
+connection in every other worker (``events.NotificationListener``) runs its
+handlers as the notification arrives, so nothing polls. Tables edited outside
+the app notify from triggers instead (migration 0011).
+
+Notifications sent while a listener is reconnecting are lost, so every
+registered cache is invalidated whenever the listener (re)connects.
+"""
+import logging
+import uuid
+from typing import Callable, Dict, List, Optional
+
+import orjson
+
+from .db import Database, db
+from .events import NotificationListener, notification_listener
+from .utils.fast_json import dumps
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "analyst_invalidate"
+
+# Names writers invalidate; a cache registers for the ones it depends on
+PROMPT_TEMPLATES = "prompt_templates"
+GUARDRAILS = "guardrails"
+
+
+class InvalidationBus:
+    def __init__(self, database: Database, listener: NotificationListener):
+        self.db = database
+        self.origin = uuid.uuid4().hex[:12]
+        self._handlers: Dict[str, List[Callable[[], None]]] = {}
+        listener.add_handler(INVALIDATION_CHANNEL, self._on_notification)
+        listener.add_connect_handler(self.invalidate_all)
+
+    def register(self, name: str, handler: Callable[[], None]) -> None:
+        self._handlers.setdefault(name, []).append(handler)
+
+    def invalidate_local(self, name: str) -> None:
+        for handler in self._handlers.get(name, ()):
+            try:
+                handler()
+            except Exception:
+                logger.exception(f"Invalidation handler for {name} failed")
+
+    def invalidate_all(self) -> None:
+        for name in list(self._handlers):
+            self.invalidate_local(name)
+
+    async def invalidate(self, name: str) -> None:
+        """Invalidate ``name`` here and in every other worker; call after the change commits"""
+        self.invalidate_local(name)
+
+        if getattr(self.db, "_pool", None) is None:
+            return
+        payload = dumps({"origin": self.origin, "names": [name]}).decode()
+        try:
+            await self.db.execute("SELECT pg_notify($1, $2)", INVALIDATION_CHANNEL, payload)
+        except Exception as e:
+            # other workers fall back on their cache TTLs
+            logger.warning(f"Could not notify other workers to invalidate {name}: {str(e)}")
+
+    def _on_notification(self, payload: str) -> None:
+        message = orjson.loads(payload)
+        if message.get("origin") == self.origin:
+            return
+        for name in message.get("names", ()):
+            self.invalidate_local(name)
+
+
+invalidation_bus = InvalidationBus(db, notification_listener)
@@ -6,10 +6,16 @@ import logging
 from .config import settings
 from .db import db
 from .scheduler import scheduler_manager
+from .core.rates_publisher import rates_publisher
+from .events import notification_listener
+from .deps.jwt_keys import signing_keys
 from .logging_utils import configure_logging
 from .security import emit_security_warnings
 from .observability import configure_observability
-from .routes import health, metrics, insights, threads, memories, prompts, recommendations, changes, diag, analytics, auth
+from .admission import configure_admission
+from .profiling import configure_profiling
+from .server_timing import TimedJSONResponse, configure_server_timing
+from .routes import health, metrics, insights, threads, memories, prompts, recommendations, changes, diag, analytics, auth, dashboard, events
 # from .routes import experiments  # Temporarily disabled due to FastAPI parameter error
 
 
@@ -27,9 +33,39 @@ async def lifespan(app: FastAPI):
     except Exception as scheduler_error:
         logging.error("Failed to start scheduler: %s", scheduler_error, exc_info=True)
 
+    try:
+        await rates_publisher.start()
+    except Exception as publisher_error:
+        logging.error("Failed to start rates publisher: %s", publisher_error, exc_info=True)
+
+    try:
+        await signing_keys.start()
+    except Exception as keys_error:
+        logging.error("Failed to load JWT signing keys: %s", keys_error, exc_info=True)
+
+    try:
+        await notification_listener.start()
+    except Exception as listener_error:
+        logging.error("Failed to start notification listener: %s", listener_error, exc_info=True)
+
     yield
 
     # Shutdown
+    try:
+        await notification_listener.stop()
+    except Exception as listener_error:
+        logging.error("Failed to stop notification listener cleanly: %s", listener_error, exc_info=True)
+
+    try:
+        await signing_keys.stop()
+    except Exception as keys_error:
+        logging.error("Failed to stop JWKS refresh cleanly: %s", keys_error, exc_info=True)
+
+    try:
+        await rates_publisher.stop()
+    except Exception as publisher_error:
+        logging.error("Failed to stop rates publisher cleanly: %s", publisher_error, exc_info=True)
+
     try:
         await scheduler_manager.stop()
     except Exception as scheduler_error:
@@ -49,10 +85,15 @@ app = FastAPI(
     title="Level Analyst API",
     description="AI Analyst module for Level Parking",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse
 )
 
+# Innermost, so rejected requests still show up in request metrics and Server-Timing
+configure_admission(app)
 configure_observability(app)
+configure_profiling(app)
+configure_server_timing(app)
 
 # CORS middleware
 app.add_middleware(
@@ -61,6 +102,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Retry-After", "Server-Timing", "X-Refresh-Run-Id"],
 )
 
 # Include routers
@@ -75,6 +117,8 @@ app.include_router(prompts.router)
 app.include_router(recommendations.router)
 app.include_router(changes.router)
 app.include_router(analytics.router)
+app.include_router(dashboard.router)
+app.include_router(events.router)
 # app.include_router(experiments.router)  # Temporarily disabled
 
 # Serve static files
@@ -49,4 +49,26 @@ class ChangeListResponse(BaseModel):
     changes: List[PriceChangeResponse]
     total: int
     offset: int
-    limit: int
\ No newline at end of file
+    limit: int
+
+class BatchApplyChangesRequest(BaseModel):
+    change_ids: List[UUID] = Field(..., min_length=1, max_length=500)
+    force: bool = False
+
+
+class BatchRevertChangesRequest(BaseModel):
+    change_ids: List[UUID] = Field(..., min_length=1, max_length=500)
+    reason: Optional[str] = None
+
+
+class BatchChangeResult(BaseModel):
+    change_id: UUID
+    status: str  # applied | reverted | not_found | forbidden | invalid_status | guardrail_violation
+    detail: Optional[str] = None
+    warnings: List[str] = []
+
+
+class BatchChangeResponse(BaseModel):
+    results: List[BatchChangeResult]
+    succeeded: int
+    failed: int
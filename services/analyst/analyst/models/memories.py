@@ -7,6 +7,7 @@ from uuid import UUID
 class MemoryCreate(BaseModel):
     scope: str = Field(..., pattern=r"^(global|client|location|zone)$")
     scope_ref: Optional[UUID] = None
+    zone_id: Optional[str] = None
     topic: Optional[str] = None
     kind: str = Field(..., pattern=r"^(canonical|context|exception)$")
     content: str
@@ -18,6 +19,7 @@ class MemoryResponse(BaseModel):
     id: int
     scope: str
     scope_ref: Optional[UUID]
+    zone_id: Optional[str] = None
     topic: Optional[str]
     kind: str
     content: str
@@ -26,6 +28,7 @@ class MemoryResponse(BaseModel):
     created_by: Optional[UUID]
     created_at: datetime
     is_active: bool
+    rank: Optional[float] = None
 
 
 class MemoryUpsertRequest(BaseModel):
@@ -1,9 +1,13 @@
 import logging
-from typing import Optional
+import re
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from fastapi import FastAPI
 
 from .config import settings
+from .server_timing import timed
 
 LOGGER = logging.getLogger(__name__)
 
@@ -50,11 +54,126 @@ def configure_tracing(app: FastAPI) -> None:
                 settings.otel_exporter_endpoint or "console")
 
 
+# Span helpers ----------------------------------------------------------------
+# Child spans are only created once tracing is enabled; otherwise callers get a
+# shared no-op span so instrumented code never has to check.
+
+TRACER_NAME = "level-analyst"
+DB_STATEMENT_MAX_LENGTH = 2048
+_TABLE_PATTERN = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+([A-Za-z_][\w.]*)\b(?!\()", re.IGNORECASE)
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _tracer():
+    return trace.get_tracer(TRACER_NAME)
+
+
+def tracing_active() -> bool:
+    return settings.observability_tracing_enabled and trace is not None
+
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """Context manager for a child span of the current trace (no-op when tracing is off)."""
+    if not tracing_active():
+        return nullcontext(_NOOP_SPAN)
+    return _tracer().start_as_current_span(name, attributes=attributes)
+
+
+@lru_cache(maxsize=1024)
+def statement_name(query: str) -> str:
+    """Low-cardinality name for a SQL statement, e.g. ``SELECT insights``."""
+    words = query.split(None, 1)
+    operation = words[0].upper() if words else "QUERY"
+    match = _TABLE_PATTERN.search(query)
+    return f"{operation} {match.group(1)}" if match else operation
+
+
+@contextmanager
+def _detached_span(name: str, attributes: Dict[str, Any]):
+    """Span that is never made current; safe to hold open across async generator yields."""
+    span = _tracer().start_span(name, attributes=attributes)
+    try:
+        yield span
+    except Exception as exc:
+        span.record_exception(exc)
+        span.set_status(trace.Status(trace.StatusCode.ERROR, str(exc)))
+        raise
+    finally:
+        span.end()
+
+
+def db_span(method: str, query: str, current: bool = True):
+    if not tracing_active():
+        return nullcontext(_NOOP_SPAN)
+
+    name = statement_name(query)
+    attributes = {
+        "db.system": "postgresql",
+        "db.operation": name.split(" ", 1)[0],
+        "db.statement": query[:DB_STATEMENT_MAX_LENGTH],
+        "db.statement_name": name,
+        "db.method": method,
+    }
+    if not current:
+        return _detached_span(name, attributes)
+    return _tracer().start_as_current_span(name, attributes=attributes)
+
+
+def record_row_count(span, rows: Optional[int]) -> None:
+    if rows is not None:
+        span.set_attribute("db.row_count", rows)
+
+
+def command_row_count(status: str) -> Optional[int]:
+    """Rows affected from an asyncpg status string such as ``UPDATE 3``."""
+    count = status.rsplit(" ", 1)[-1] if status else ""
+    return int(count) if count.isdigit() else None
+
+
+@contextmanager
+def llm_span(model: str, operation: str = "chat"):
+    """Span (and Server-Timing ``llm`` entry) around one LLM call."""
+    with timed("llm"), start_span(f"llm.{operation} {model}", {
+        "gen_ai.system": "openai",
+        "gen_ai.operation.name": operation,
+        "gen_ai.request.model": model,
+    }) as span:
+        yield span
+
+
+def record_llm_usage(span, response: Any) -> None:
+    """Copy the response model and token usage onto an LLM span."""
+    if isinstance(response, dict):
+        model, usage = response.get("model"), response.get("usage") or {}
+    else:
+        model, usage = getattr(response, "model", None), getattr(response, "usage", None) or {}
+
+    def _usage(key: str) -> Optional[int]:
+        return usage.get(key) if isinstance(usage, dict) else getattr(usage, key, None)
+
+    attributes = {
+        "gen_ai.response.model": model,
+        "gen_ai.usage.input_tokens": _usage("prompt_tokens"),
+        "gen_ai.usage.output_tokens": _usage("completion_tokens"),
+    }
+    span.set_attributes({key: value for key, value in attributes.items() if value is not None})
+
+
 # Metrics support -------------------------------------------------------------
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CollectorRegistry, CONTENT_TYPE_LATEST
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response, PlainTextResponse
+from starlette.routing import Match
 import time
 
 REGISTRY = CollectorRegistry()
@@ -70,6 +189,19 @@ REQUEST_LATENCY = Histogram(
     ["method", "endpoint"],
     registry=REGISTRY
 )
+REQUESTS_IN_PROGRESS = Gauge(
+    "level_analyst_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method"],
+    registry=REGISTRY
+)
+RESPONSE_SIZE = Histogram(
+    "level_analyst_response_size_bytes",
+    "HTTP response body size",
+    ["method", "endpoint"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+    registry=REGISTRY
+)
 REFRESH_COUNTER = Counter(
     "level_analyst_daily_refresh_total",
     "Daily refresh job executions",
@@ -86,21 +218,117 @@ REFRESH_LAST_DURATION = Gauge(
     "Duration of last refresh run",
     registry=REGISTRY
 )
+AUTO_REVERT_COUNTER = Counter(
+    "level_analyst_auto_revert_total",
+    "Price changes reverted by the auto-revert evaluator",
+    ["reason"],
+    registry=REGISTRY
+)
+AUTO_REVERT_LAG = Histogram(
+    "level_analyst_auto_revert_lag_seconds",
+    "Delay between a price change becoming due (expires_at) and its revert",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200),
+    registry=REGISTRY
+)
+AUTO_REVERT_EVALUATED = Counter(
+    "level_analyst_auto_revert_evaluated_total",
+    "Applied price changes examined by the auto-revert evaluator",
+    ["kind"],
+    registry=REGISTRY
+)
+AUTO_REVERT_RUN_DURATION = Histogram(
+    "level_analyst_auto_revert_run_duration_seconds",
+    "Duration of an auto-revert evaluator sweep",
+    registry=REGISTRY
+)
+RATES_PUBLISH_COUNTER = Counter(
+    "level_analyst_rates_publish_total",
+    "Outbox rows pushed to the rates API by outcome",
+    ["outcome"],
+    registry=REGISTRY
+)
+RATES_PUBLISH_LATENCY = Histogram(
+    "level_analyst_rates_publish_batch_seconds",
+    "Time to deliver one outbox batch to the rates API, retries included",
+    registry=REGISTRY
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "level_analyst_admission_in_flight",
+    "Admitted requests currently holding a slot, per request class",
+    ["request_class"],
+    registry=REGISTRY
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "level_analyst_admission_queue_depth",
+    "Requests waiting for a slot, per request class",
+    ["request_class"],
+    registry=REGISTRY
+)
+ADMISSION_REJECTED = Counter(
+    "level_analyst_admission_rejected_total",
+    "Requests turned away by admission control",
+    ["request_class", "reason"],
+    registry=REGISTRY
+)
+ADMISSION_WAIT = Histogram(
+    "level_analyst_admission_wait_seconds",
+    "Time queued requests waited before being admitted",
+    ["request_class"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    registry=REGISTRY
+)
 
 
-class RequestMetricsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):  # pragma: no cover - integration tested
-        if not settings.observability_metrics_enabled:
-            return await call_next(request)
+UNMATCHED_ROUTE = "<unmatched>"
 
-        start = time.perf_counter()
-        response = await call_next(request)
-        elapsed = time.perf_counter() - start
 
-        path = request.url.path
-        REQUEST_COUNTER.labels(request.method, path, response.status_code).inc()
-        REQUEST_LATENCY.labels(request.method, path).observe(elapsed)
-        return response
+def route_template(scope) -> str:
+    """Path template of the route that served ``scope`` (e.g. ``/insights/{insight_id}``)."""
+    route = scope.get("route")
+    if route is None:
+        # Starlette only records the matched route in the scope since 0.41
+        for candidate in getattr(scope.get("app"), "routes", ()):
+            if candidate.matches(scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware; labels by route template so ids do not create new series."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.observability_metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        response_size = 0
+
+        async def _send(message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        method = scope["method"]
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            endpoint = route_template(scope)
+            REQUEST_COUNTER.labels(method, endpoint, status_code).inc()
+            REQUEST_LATENCY.labels(method, endpoint).observe(elapsed)
+            RESPONSE_SIZE.labels(method, endpoint).observe(response_size)
 
 
 def metrics_endpoint():
@@ -122,6 +350,50 @@ def record_refresh(outcome: str, duration_seconds: Optional[float] = None) -> No
     REFRESH_LAST_RUN.set(time.time())
 
 
+def record_auto_revert(
+    evaluated: Dict[str, int],
+    reverted: Dict[str, int],
+    lags_seconds: List[float],
+    duration_seconds: float
+) -> None:
+    if not settings.observability_metrics_enabled:
+        return
+    for kind, count in evaluated.items():
+        AUTO_REVERT_EVALUATED.labels(kind=kind).inc(count)
+    for reason, count in reverted.items():
+        AUTO_REVERT_COUNTER.labels(reason=reason).inc(count)
+    for lag in lags_seconds:
+        AUTO_REVERT_LAG.observe(lag)
+    AUTO_REVERT_RUN_DURATION.observe(duration_seconds)
+
+
+def record_rates_publish(outcome: str, count: int, duration_seconds: Optional[float] = None) -> None:
+    if not settings.observability_metrics_enabled:
+        return
+    RATES_PUBLISH_COUNTER.labels(outcome=outcome).inc(count)
+    if duration_seconds is not None:
+        RATES_PUBLISH_LATENCY.observe(duration_seconds)
+
+
+def record_admission_state(request_class: str, in_flight: int, queued: int) -> None:
+    if not settings.observability_metrics_enabled:
+        return
+    ADMISSION_IN_FLIGHT.labels(request_class=request_class).set(in_flight)
+    ADMISSION_QUEUE_DEPTH.labels(request_class=request_class).set(queued)
+
+
+def record_admission_rejected(request_class: str, reason: str) -> None:
+    if not settings.observability_metrics_enabled:
+        return
+    ADMISSION_REJECTED.labels(request_class=request_class, reason=reason).inc()
+
+
+def record_admission_wait(request_class: str, seconds: float) -> None:
+    if not settings.observability_metrics_enabled:
+        return
+    ADMISSION_WAIT.labels(request_class=request_class).observe(seconds)
+
+
 def configure_metrics(app: FastAPI) -> None:
     if not settings.observability_metrics_enabled:
         LOGGER.info("Prometheus metrics disabled via configuration")
@@ -0,0 +1,190 @@
+"""
+On-demand request profiling.
+
+Nothing is installed unless ``PROFILING_ENABLED`` is set. A request is then
+profiled with pyinstrument (statistical, async-aware) when:
+
+* it carries the ``PROFILING_HEADER`` header (equal to ``PROFILING_TOKEN`` when set),
+* it is picked by ``PROFILING_SAMPLE_RATE``, or
+* ``PROFILING_SLOW_MS`` is set: every request is profiled and only the ones
+  slower than the threshold are kept, so use it for short investigations.
+
+Profiles are HTML files in ``PROFILING_DIR`` (with a JSON sidecar), pruned to
+``PROFILING_MAX_FILES``/``PROFILING_MAX_BYTES``, and served by ``/diag/profiles``.
+"""
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pragma: no cover - optional dependency
+    Profiler = None
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9A-Za-z_-]+$")
+EXCLUDED_PREFIXES = ("/diag/profiles", "/metrics", "/static", "/card")
+
+
+class ProfileStore:
+    """Bounded directory of HTML profiles with JSON metadata sidecars."""
+
+    def __init__(self, directory: str, max_files: int, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+
+    def path_for(self, profile_id: str) -> Optional[Path]:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.html"
+        return path if path.is_file() else None
+
+    def save(self, profile_id: str, html: str, meta: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{profile_id}.html").write_text(html)
+        (self.directory / f"{profile_id}.json").write_text(json.dumps({"id": profile_id, **meta}))
+        self.prune()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Newest first"""
+        if not self.directory.is_dir():
+            return []
+
+        profiles = []
+        for meta_path in self.directory.glob("*.json"):
+            html_path = meta_path.with_suffix(".html")
+            try:
+                meta = json.loads(meta_path.read_text())
+                meta["size_bytes"] = html_path.stat().st_size
+            except (OSError, ValueError):
+                # Pruned by another worker or half written
+                continue
+            profiles.append(meta)
+
+        return sorted(profiles, key=lambda meta: meta.get("created_at", 0), reverse=True)
+
+    def prune(self) -> None:
+        entries = []
+        for html_path in self.directory.glob("*.html"):
+            try:
+                stat = html_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, html_path))
+        entries.sort(reverse=True)
+
+        kept_bytes = 0
+        for index, (_, size, html_path) in enumerate(entries):
+            kept_bytes += size
+            if index < self.max_files and kept_bytes <= self.max_bytes:
+                continue
+            for path in (html_path, html_path.with_suffix(".json")):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware; untriggered requests pay one header scan and a random draw."""
+
+    def __init__(self, app, store: ProfileStore):
+        self.app = app
+        self.store = store
+        self.header = settings.profiling_header.lower().encode()
+        self.token = settings.profiling_token
+        self.sample_rate = settings.profiling_sample_rate
+        self.slow_ms = settings.profiling_slow_ms
+        self.interval = settings.profiling_interval_ms / 1000.0
+
+    def _requested(self, scope) -> bool:
+        for name, value in scope.get("headers", ()):
+            if name == self.header:
+                value = value.decode("latin-1")
+                return value == self.token if self.token else value not in ("", "0", "false")
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXCLUDED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        if self._requested(scope):
+            reason = "header"
+        elif self.sample_rate and random.random() < self.sample_rate:
+            reason = "sampled"
+        elif self.slow_ms:
+            reason = "slow"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        if reason != "slow":
+            send = self._with_profile_header(send, profile_id)
+
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        start = perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
+            duration_ms = (perf_counter() - start) * 1000
+            if reason != "slow" or duration_ms >= self.slow_ms:
+                await self._save(profiler, profile_id, scope, reason, duration_ms)
+
+    @staticmethod
+    def _with_profile_header(send, profile_id: str):
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+        return _send
+
+    async def _save(self, profiler, profile_id: str, scope, reason: str, duration_ms: float) -> None:
+        meta = {
+            "created_at": time.time(),
+            "method": scope["method"],
+            "path": scope["path"],
+            "reason": reason,
+            "duration_ms": round(duration_ms, 1),
+        }
+        try:
+            # Rendering walks the whole call tree; keep it off the event loop
+            html = await asyncio.to_thread(profiler.output_html)
+            await asyncio.to_thread(self.store.save, profile_id, html, meta)
+            logger.info(f"Saved {reason} profile {profile_id} for {meta['method']} {meta['path']} ({meta['duration_ms']}ms)")
+        except Exception as e:
+            logger.error(f"Failed to save profile {profile_id}: {str(e)}")
+
+
+profile_store = ProfileStore(settings.profiling_dir, settings.profiling_max_files, settings.profiling_max_bytes)
+
+
+def configure_profiling(app: FastAPI) -> None:
+    if not settings.profiling_enabled:
+        return
+
+    if Profiler is None:
+        logger.warning("pyinstrument not installed; request profiling disabled")
+        return
+
+    app.add_middleware(ProfilingMiddleware, store=profile_store)
+    logger.info(
+        f"Request profiling enabled (sample_rate={settings.profiling_sample_rate}, "
+        f"slow_ms={settings.profiling_slow_ms}, dir={settings.profiling_dir})"
+    )
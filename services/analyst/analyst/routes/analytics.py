@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import date
 from typing import Optional, List, Dict, Any
 from ..deps.auth import get_current_user, UserContext
 from ..db import get_db, Database
 from ..core.parking_expert_ai import ParkingExpertAI
+from ..core.data_export import EXPORT_DATASETS, EXPORT_FORMATS, parquet_available, stream_export
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
@@ -119,6 +122,55 @@ async def get_session_counts(
         raise HTTPException(status_code=500, detail=f"Error querying session data: {str(e)}")
 
 
+async def zone_summary(db: Database, zone_ids: List[str]) -> Dict[str, Any]:
+    """Per-zone session, revenue and occupancy totals for ``zone_ids`` (``z-<zone>`` form)"""
+
+    accessible_zones = [z.replace('z-', '') for z in zone_ids if z.startswith('z-')]
+    if not accessible_zones:
+        return {"zones": []}
+
+    placeholders = ",".join([f"${i}" for i in range(1, len(accessible_zones) + 1)])
+
+    query = f"""
+        SELECT
+            ht.zone,
+            COUNT(*) as total_sessions,
+            COUNT(DISTINCT DATE(ht.start_park_date)) as active_days,
+            AVG(ht.paid_minutes) as avg_duration_minutes,
+            MIN(ht.start_park_date) as first_transaction,
+            MAX(ht.start_park_date) as last_transaction,
+            SUM(CAST(ht.payment_amount AS NUMERIC)) as total_revenue,
+            l.capacity,
+            l.name as location_name,
+            CASE
+                WHEN l.capacity > 0 THEN
+                    ROUND((COUNT(*) / COUNT(DISTINCT DATE(ht.start_park_date))::NUMERIC / l.capacity) * 100, 2)
+                ELSE NULL
+            END as avg_daily_occupancy_ratio,
+            CASE
+                WHEN l.capacity > 0 THEN
+                    ROUND((SUM(ht.paid_minutes) / (COUNT(DISTINCT DATE(ht.start_park_date)) * 1440.0 * l.capacity)) * 100, 2)
+                ELSE NULL
+            END as avg_utilization_ratio
+        FROM historical_transactions ht
+        LEFT JOIN locations l ON ht.zone::text = l.zone_id
+        WHERE ht.zone::text IN ({placeholders})
+        GROUP BY ht.zone, l.capacity, l.name
+        ORDER BY total_sessions DESC
+    """
+
+    results = await db.fetch(query, *accessible_zones)
+
+    return {
+        "zones": [dict(row) for row in results],
+        "summary": {
+            "total_zones": len(results),
+            "total_sessions": sum(row['total_sessions'] for row in results),
+            "total_revenue": sum(float(row['total_revenue'] or 0) for row in results)
+        }
+    }
+
+
 @router.get("/zone-summary")
 async def get_zone_summary(
     user: UserContext = Depends(get_current_user),
@@ -127,54 +179,7 @@ async def get_zone_summary(
     """Get overall summary for all accessible zones"""
 
     try:
-        # Get accessible zones
-        accessible_zones = [z.replace('z-', '') for z in user.zone_ids if z.startswith('z-')]
-        if not accessible_zones:
-            return {"success": True, "data": {"zones": []}}
-
-        placeholders = ",".join([f"${i}" for i in range(1, len(accessible_zones) + 1)])
-
-        query = f"""
-            SELECT
-                ht.zone,
-                COUNT(*) as total_sessions,
-                COUNT(DISTINCT DATE(ht.start_park_date)) as active_days,
-                AVG(ht.paid_minutes) as avg_duration_minutes,
-                MIN(ht.start_park_date) as first_transaction,
-                MAX(ht.start_park_date) as last_transaction,
-                SUM(CAST(ht.payment_amount AS NUMERIC)) as total_revenue,
-                l.capacity,
-                l.name as location_name,
-                CASE
-                    WHEN l.capacity > 0 THEN
-                        ROUND((COUNT(*) / COUNT(DISTINCT DATE(ht.start_park_date))::NUMERIC / l.capacity) * 100, 2)
-                    ELSE NULL
-                END as avg_daily_occupancy_ratio,
-                CASE
-                    WHEN l.capacity > 0 THEN
-                        ROUND((SUM(ht.paid_minutes) / (COUNT(DISTINCT DATE(ht.start_park_date)) * 1440.0 * l.capacity)) * 100, 2)
-                    ELSE NULL
-                END as avg_utilization_ratio
-            FROM historical_transactions ht
-            LEFT JOIN locations l ON ht.zone::text = l.zone_id
-            WHERE ht.zone::text IN ({placeholders})
-            GROUP BY ht.zone, l.capacity, l.name
-            ORDER BY total_sessions DESC
-        """
-
-        results = await db.fetch(query, *accessible_zones)
-
-        return {
-            "success": True,
-            "data": {
-                "zones": [dict(row) for row in results],
-                "summary": {
-                    "total_zones": len(results),
-                    "total_sessions": sum(row['total_sessions'] for row in results),
-                    "total_revenue": sum(float(row['total_revenue'] or 0) for row in results)
-                }
-            }
-        }
+        return {"success": True, "data": await zone_summary(db, user.zone_ids)}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting zone summary: {str(e)}")
@@ -723,4 +728,39 @@ async def get_expert_analysis(
         }
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error performing expert analysis: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error performing expert analysis: {str(e)}")
+
+
+@router.get("/export")
+async def export_zone_data(
+    dataset: str = Query("transactions", description=f"One of: {', '.join(EXPORT_DATASETS)}"),
+    format: str = Query("csv", description=f"One of: {', '.join(EXPORT_FORMATS)}"),
+    zone_id: Optional[str] = Query(None, description="Single zone (z-110 or 110); defaults to all accessible zones"),
+    start_date: Optional[date] = Query(None, description="First day included (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Last day included (YYYY-MM-DD)"),
+    batch_size: int = Query(5000, ge=100, le=50000, description="Rows fetched per cursor round trip"),
+    user: UserContext = Depends(get_current_user),
+    db: Database = Depends(get_db)
+):
+    """Stream raw transactions or mart rows for accessible zones as CSV or Parquet"""
+
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=400, detail=f"Unknown dataset '{dataset}'")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{format}'")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow on the server")
+
+    zone_ids = user.zone_ids
+    if zone_id:
+        zone_id = zone_id if zone_id.startswith("z-") else f"z-{zone_id}"
+        if zone_id not in user.zone_ids:
+            raise HTTPException(status_code=403, detail="Access denied to zone")
+        zone_ids = [zone_id]
+
+    filename = f"{dataset}-{zone_id or 'zones'}-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        stream_export(db, dataset, format, zone_ids, start_date, end_date, batch_size),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,18 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from uuid import UUID
 from ..deps.auth import get_current_user, UserContext, require_role
 from ..db import get_db, Database
 from ..models.changes import (
     PriceChangeCreate, PriceChangeResponse, ChangeListResponse,
-    ApplyChangeRequest, RevertChangeRequest
+    ApplyChangeRequest, RevertChangeRequest,
+    BatchApplyChangesRequest, BatchRevertChangesRequest, BatchChangeResult, BatchChangeResponse
 )
 from ..models.common import BaseResponse, PaginationParams
 from ..core.policy_guardrails import PolicyGuardrails
+from ..core.rates_publisher import enqueue_rate_changes, rates_publisher
 from ..config import settings
 
 router = APIRouter(prefix="/changes", tags=["changes"])
 
+CHANGE_LIST_COLUMNS = """id, location_id, zone_id, prev_price, new_price, change_pct,
+               policy_version, recommendation_id, applied_by, applied_at,
+               revert_to, revert_if, expires_at, status, created_at"""
+
 
 @router.get("/", response_model=ChangeListResponse)
 async def list_price_changes(
@@ -54,9 +60,7 @@ async def list_price_changes(
     where_clause = " AND ".join(where_clauses)
 
     query = f"""
-        SELECT id, location_id, zone_id, prev_price, new_price, change_pct,
-               policy_version, recommendation_id, applied_by, applied_at,
-               revert_to, revert_if, expires_at, status, created_at
+        SELECT {CHANGE_LIST_COLUMNS}
         FROM price_changes
         WHERE {where_clause}
         ORDER BY created_at DESC
@@ -162,53 +166,50 @@ async def apply_price_change(
 
     try:
         async with db.transaction() as conn:
-            await db.set_jwt_claims(conn, {
-                "sub": user.sub,
-                "org_id": user.org_id,
-                "zone_ids": user.zone_ids
-            })
-
-            # Get the change details
-            change_result = await conn.fetchrow(
-                "SELECT * FROM price_changes WHERE id = $1",
-                request.change_id
-            )
-
-            if not change_result:
-                raise HTTPException(status_code=404, detail="Price change not found")
-
-            change = dict(change_result)
-
-            if change["status"] != "pending":
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Cannot apply change with status: {change['status']}"
-                )
-
-            # Re-validate guardrails
-            guardrails = PolicyGuardrails(db)
-            change_obj = PriceChangeCreate(**{
-                k: v for k, v in change.items()
-                if k in PriceChangeCreate.__fields__
-            })
-            validation_result = await guardrails.validate_price_change(change_obj)
-
-            if not validation_result.is_valid and not request.force:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Guardrail violation: {validation_result.reason}"
-                )
-
-            # Update the change status
-            await conn.execute("""
-                UPDATE price_changes
-                SET status = 'applied', applied_by = $2, applied_at = NOW()
-                WHERE id = $1
-            """, request.change_id, UUID(user.sub) if user.sub != "dev-user" else None)
-
-            # TODO: Here you would integrate with actual pricing system
-            # For now, we just simulate the application
-
+            async with conn.transaction():
+                await db.set_jwt_claims(conn, {
+                    "sub": user.sub,
+                    "org_id": user.org_id,
+                    "zone_ids": user.zone_ids
+                })
+
+                # Lock the change so concurrent applies of it run one after the other
+                change = (await _lock_changes(conn, [request.change_id])).get(request.change_id)
+
+                if not change:
+                    raise HTTPException(status_code=404, detail="Price change not found")
+
+                if change["status"] != "pending":
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Cannot apply change with status: {change['status']}"
+                    )
+
+                await _lock_zones(conn, [change["zone_id"]])
+
+                # Re-validate guardrails on this transaction
+                guardrails = PolicyGuardrails(db)
+                change_obj = PriceChangeCreate(**{
+                    k: v for k, v in change.items()
+                    if k in PriceChangeCreate.model_fields
+                })
+                validation_result = await guardrails.validate_price_change(change_obj, conn)
+
+                if not validation_result.is_valid and not request.force:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Guardrail violation: {validation_result.reason}"
+                    )
+
+                # Status change and outbox row commit together; the publisher pushes the rate
+                await enqueue_rate_changes(conn, [change], "apply")
+                await conn.execute("""
+                    UPDATE price_changes
+                    SET status = 'applied', applied_by = $2, applied_at = NOW()
+                    WHERE id = $1
+                """, request.change_id, UUID(user.sub) if user.sub != "dev-user" else None)
+
+        rates_publisher.notify()
         return BaseResponse(message="Price change applied successfully")
 
     except Exception as e:
@@ -223,43 +224,209 @@ async def revert_price_change(
 ):
     try:
         async with db.transaction() as conn:
-            await db.set_jwt_claims(conn, {
-                "sub": user.sub,
-                "org_id": user.org_id,
-                "zone_ids": user.zone_ids
-            })
+            async with conn.transaction():
+                await db.set_jwt_claims(conn, {
+                    "sub": user.sub,
+                    "org_id": user.org_id,
+                    "zone_ids": user.zone_ids
+                })
+
+                # Lock the change so a double revert cannot enqueue two revert rows
+                change = (await _lock_changes(conn, [request.change_id])).get(request.change_id)
+
+                if not change:
+                    raise HTTPException(status_code=404, detail="Price change not found")
+
+                if change["status"] != "applied":
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Cannot revert change with status: {change['status']}"
+                    )
+
+                await enqueue_rate_changes(conn, [change], "revert")
+                await conn.execute("""
+                    UPDATE price_changes
+                    SET status = 'reverted', reverted_at = NOW(), revert_reason = $2
+                    WHERE id = $1
+                """, request.change_id, request.reason or "manual")
+
+        rates_publisher.notify()
+        return BaseResponse(message="Price change reverted successfully")
 
-            # Get the change details
-            change_result = await conn.fetchrow(
-                "SELECT * FROM price_changes WHERE id = $1",
-                request.change_id
-            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reverting price change: {str(e)}")
 
-            if not change_result:
-                raise HTTPException(status_code=404, detail="Price change not found")
 
-            change = dict(change_result)
+async def _lock_changes(conn, change_ids: List[UUID]) -> Dict[UUID, Dict[str, Any]]:
+    """Row-lock the requested changes in id order so concurrent batches cannot deadlock"""
 
-            if change["status"] != "applied":
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Cannot revert change with status: {change['status']}"
-                )
+    rows = await conn.fetch("""
+        SELECT * FROM price_changes
+        WHERE id = ANY($1::uuid[])
+        ORDER BY id
+        FOR UPDATE
+    """, change_ids)
+    return {row["id"]: dict(row) for row in rows}
 
-            # Update the change status
-            await conn.execute("""
-                UPDATE price_changes
-                SET status = 'reverted'
-                WHERE id = $1
-            """, request.change_id)
 
-            # TODO: Here you would integrate with actual pricing system to revert
-            # For now, we just simulate the reversion
+async def _lock_zones(conn, zone_ids: List[str]) -> None:
+    """Serialize applies per zone until commit, so the recent-price check sees every earlier apply"""
+
+    await conn.execute("""
+        SELECT pg_advisory_xact_lock(lock_key)
+        FROM (
+            SELECT hashtext('price_changes:' || zone_id) AS lock_key
+            FROM unnest($1::text[]) AS zone_id
+            ORDER BY zone_id
+        ) zones
+    """, sorted(set(zone_ids)))
+
+
+def _batch_response(results: List[BatchChangeResult], success_status: str) -> BatchChangeResponse:
+    succeeded = sum(1 for result in results if result.status == success_status)
+    return BatchChangeResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
 
-        return BaseResponse(message="Price change reverted successfully")
+
+@router.post("/apply/batch", response_model=BatchChangeResponse)
+async def apply_price_changes_batch(
+    request: BatchApplyChangesRequest,
+    user: UserContext = Depends(require_role("approver")),
+    db: Database = Depends(get_db)
+):
+    """Apply many pending changes in one transaction with one guardrail pass.
+
+    Each change gets its own result; changes that fail checks are left untouched
+    while the rest are applied.
+    """
+    change_ids = list(dict.fromkeys(request.change_ids))
+
+    try:
+        async with db.transaction() as conn:
+            async with conn.transaction():
+                await db.set_jwt_claims(conn, {
+                    "sub": user.sub,
+                    "org_id": user.org_id,
+                    "zone_ids": user.zone_ids
+                })
+
+                changes = await _lock_changes(conn, change_ids)
+
+                results: Dict[UUID, BatchChangeResult] = {}
+                candidates = []
+                for change_id in change_ids:
+                    change = changes.get(change_id)
+                    if not change:
+                        results[change_id] = BatchChangeResult(change_id=change_id, status="not_found")
+                    elif change["zone_id"] not in user.zone_ids:
+                        results[change_id] = BatchChangeResult(
+                            change_id=change_id, status="forbidden", detail="Access denied to zone"
+                        )
+                    elif change["status"] != "pending":
+                        results[change_id] = BatchChangeResult(
+                            change_id=change_id,
+                            status="invalid_status",
+                            detail=f"Cannot apply change with status: {change['status']}"
+                        )
+                    else:
+                        candidates.append(change)
+
+                if candidates:
+                    await _lock_zones(conn, [change["zone_id"] for change in candidates])
+
+                # Re-validate guardrails for every candidate in one pass, on this transaction
+                guardrails = PolicyGuardrails(db)
+                validations = await guardrails.validate_batch([
+                    PriceChangeCreate(**{
+                        k: v for k, v in change.items()
+                        if k in PriceChangeCreate.model_fields
+                    })
+                    for change in candidates
+                ], conn, force=request.force)
+
+                to_apply = []
+                for change, validation in zip(candidates, validations):
+                    if not validation.is_valid and not request.force:
+                        results[change["id"]] = BatchChangeResult(
+                            change_id=change["id"],
+                            status="guardrail_violation",
+                            detail=f"Guardrail violation: {validation.reason}",
+                            warnings=validation.warnings
+                        )
+                        continue
+
+                    to_apply.append(change)
+                    results[change["id"]] = BatchChangeResult(
+                        change_id=change["id"], status="applied", warnings=validation.warnings
+                    )
+
+                if to_apply:
+                    await enqueue_rate_changes(conn, to_apply, "apply")
+                    await conn.execute("""
+                        UPDATE price_changes
+                        SET status = 'applied', applied_by = $2, applied_at = NOW()
+                        WHERE id = ANY($1::uuid[])
+                    """, [change["id"] for change in to_apply], UUID(user.sub) if user.sub != "dev-user" else None)
+
+        rates_publisher.notify()
+        return _batch_response([results[change_id] for change_id in change_ids], "applied")
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reverting price change: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error applying price changes: {str(e)}")
+
+
+@router.post("/revert/batch", response_model=BatchChangeResponse)
+async def revert_price_changes_batch(
+    request: BatchRevertChangesRequest,
+    user: UserContext = Depends(require_role("approver")),
+    db: Database = Depends(get_db)
+):
+    """Revert many applied changes in one transaction with a per-change result."""
+    change_ids = list(dict.fromkeys(request.change_ids))
+
+    try:
+        async with db.transaction() as conn:
+            async with conn.transaction():
+                await db.set_jwt_claims(conn, {
+                    "sub": user.sub,
+                    "org_id": user.org_id,
+                    "zone_ids": user.zone_ids
+                })
+
+                changes = await _lock_changes(conn, change_ids)
+
+                results: Dict[UUID, BatchChangeResult] = {}
+                to_revert = []
+                for change_id in change_ids:
+                    change = changes.get(change_id)
+                    if not change:
+                        results[change_id] = BatchChangeResult(change_id=change_id, status="not_found")
+                    elif change["zone_id"] not in user.zone_ids:
+                        results[change_id] = BatchChangeResult(
+                            change_id=change_id, status="forbidden", detail="Access denied to zone"
+                        )
+                    elif change["status"] != "applied":
+                        results[change_id] = BatchChangeResult(
+                            change_id=change_id,
+                            status="invalid_status",
+                            detail=f"Cannot revert change with status: {change['status']}"
+                        )
+                    else:
+                        to_revert.append(change)
+                        results[change_id] = BatchChangeResult(change_id=change_id, status="reverted")
+
+                if to_revert:
+                    await enqueue_rate_changes(conn, to_revert, "revert")
+                    await conn.execute("""
+                        UPDATE price_changes
+                        SET status = 'reverted', reverted_at = NOW(), revert_reason = $2
+                        WHERE id = ANY($1::uuid[])
+                    """, [change["id"] for change in to_revert], request.reason or "manual")
+
+        rates_publisher.notify()
+        return _batch_response([results[change_id] for change_id in change_ids], "reverted")
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reverting price changes: {str(e)}")
 
 
 @router.get("/{change_id}", response_model=PriceChangeResponse)
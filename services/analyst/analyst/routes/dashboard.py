@@ -0,0 +1,113 @@
+"""
+Everything the analyst card shows on load, in one round trip.
+
+The caller is authenticated and the daily refresh is checked once; the
+sections are then loaded concurrently, each ``db`` call on its own pool
+connection. A section that fails is reported under ``errors`` (and returned
+as null) instead of failing the whole page.
+"""
+import asyncio
+import logging
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from ..core.daily_refresh import ensure_daily_refresh
+from ..core.policy_guardrails import PolicyGuardrails
+from ..db import get_db, Database
+from ..deps.auth import get_current_user, UserContext
+from ..utils.etag import etag_headers, list_etag, matches, not_modified
+from ..utils.fast_json import FastJSONResponse, dumps, encode_object, encode_rows
+from .analytics import zone_summary
+from .changes import CHANGE_LIST_COLUMNS
+from .insights import INSIGHT_LIST_COLUMNS
+from .recommendations import RECOMMENDATION_LIST_COLUMNS, RECOMMENDATION_RAW_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+# Tables whose zone_data_generations make up the dashboard ETag
+DASHBOARD_SOURCES = ("insights", "recommendations", "price_changes", "agent_guardrails", "historical_transactions")
+
+
+async def _insights(db: Database, zone_ids: List[str], limit: int) -> bytes:
+    rows = await db.fetch(f"""
+        SELECT {INSIGHT_LIST_COLUMNS}
+        FROM insights
+        WHERE zone_id = ANY($1::text[])
+        ORDER BY created_at DESC
+        LIMIT $2
+    """, zone_ids, limit)
+    return encode_rows(rows, raw_columns=("metrics_json",))
+
+
+async def _recommendations(db: Database, zone_ids: List[str], limit: int) -> bytes:
+    rows = await db.fetch(f"""
+        SELECT {RECOMMENDATION_LIST_COLUMNS}
+        FROM recommendations
+        WHERE zone_id = ANY($1::text[])
+        ORDER BY created_at DESC
+        LIMIT $2
+    """, zone_ids, limit)
+    return encode_rows(rows, raw_columns=RECOMMENDATION_RAW_COLUMNS)
+
+
+async def _changes(db: Database, zone_ids: List[str], limit: int) -> bytes:
+    rows = await db.fetch(f"""
+        SELECT {CHANGE_LIST_COLUMNS}
+        FROM price_changes
+        WHERE zone_id = ANY($1::text[])
+        ORDER BY created_at DESC
+        LIMIT $2
+    """, zone_ids, limit)
+    return encode_rows(rows)
+
+
+async def _zone_summary(db: Database, zone_ids: List[str]) -> bytes:
+    return dumps(await zone_summary(db, zone_ids))
+
+
+async def _guardrails(db: Database) -> bytes:
+    compiled = await PolicyGuardrails(db).get_compiled_rules()
+    return dumps([{"name": rule.name, "schema": rule.schema} for rule in compiled.rules])
+
+
+@router.get("/")
+async def get_dashboard(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum items per list section"),
+    refresh: bool = Query(False, description="Regenerate insights and recommendations on demand"),
+    user: UserContext = Depends(get_current_user),
+    db: Database = Depends(get_db)
+):
+    try:
+        await ensure_daily_refresh(db, user.zone_ids, force_refresh=refresh)
+    except Exception as e:
+        logger.error(f"Error refreshing dashboard data: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error refreshing dashboard data: {str(e)}")
+
+    etag = await list_etag(db, DASHBOARD_SOURCES, user.zone_ids, request)
+    if matches(request, etag):
+        return not_modified(etag)
+
+    sections = {
+        "insights": _insights(db, user.zone_ids, limit),
+        "recommendations": _recommendations(db, user.zone_ids, limit),
+        "changes": _changes(db, user.zone_ids, limit),
+        "zone_summary": _zone_summary(db, user.zone_ids),
+        "guardrails": _guardrails(db),
+    }
+    results = await asyncio.gather(*sections.values(), return_exceptions=True)
+
+    encoded, errors = {}, {}
+    for name, result in zip(sections, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Dashboard section {name} failed: {str(result)}")
+            errors[name] = str(result)
+            result = None
+        encoded[name] = result
+
+    # A partial page must not be revalidated as if it were complete
+    headers = etag_headers(etag) if not errors else {}
+    return FastJSONResponse(encode_object({"limit": limit, "errors": errors}, encoded), headers=headers)
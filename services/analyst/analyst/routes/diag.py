@@ -1,9 +1,12 @@
 from __future__ import annotations
 import os, socket, time, json
 from typing import Dict, Any, List, Optional, Tuple
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
 import psycopg
 from psycopg.rows import dict_row
+from ..deps.auth import UserContext, require_role
+from ..profiling import profile_store
 
 router = APIRouter(prefix="/diag", tags=["diagnostics"])
 
@@ -106,4 +109,20 @@ def diag_db() -> Dict[str, Any]:
             result["hints"].append("Network timeout: try port 6543 (pooler) or another network/VPN off.")
         if "password authentication" in str(e).lower():
             result["hints"].append("Check user/password. Avoid special chars that need URL-encoding (@ : / ? & # %).")
-    return result
\ No newline at end of file
+    return result
+
+
+@router.get("/profiles")
+def list_profiles(user: UserContext = Depends(require_role("admin"))) -> Dict[str, Any]:
+    """Stored request profiles, newest first."""
+    profiles = profile_store.list()
+    return {"profiles": profiles, "count": len(profiles)}
+
+
+@router.get("/profiles/{profile_id}")
+def download_profile(profile_id: str, user: UserContext = Depends(require_role("admin"))):
+    """Download one profile as pyinstrument HTML."""
+    path = profile_store.path_for(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/html", filename=f"profile-{profile_id}.html")
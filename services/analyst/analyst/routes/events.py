@@ -0,0 +1,122 @@
+"""
+Server-Sent Events for refresh progress and newly published insights.
+
+``GET /events/stream`` streams every event touching the caller's zones (see
+``analyst.events``). With ``refresh=true`` it also starts a forced refresh in
+the background, so the card can show per-zone progress and new insights and
+recommendations as they land instead of waiting on one long request. The
+refresh keeps running if the client goes away. It holds a slot of the
+``refresh`` admission budget (see ``analyst.admission``) until it finishes;
+the stream itself does not. The run's id comes back in the
+``X-Refresh-Run-Id`` header and in every ``refresh.*`` event it publishes, so
+the client can ignore refreshes started by others for the same zones.
+"""
+import asyncio
+import logging
+from typing import List, Optional, Set
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from ..admission import REFRESH, AdmissionLimiter, AdmissionRejected, admission_controller
+from ..config import settings
+from ..core.daily_refresh import ensure_daily_refresh
+from ..db import get_db, Database
+from ..deps.auth import get_current_user, UserContext
+from ..events import Event, event_bus, new_run_id
+from ..utils.fast_json import dumps
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Strong references so background refreshes are not garbage collected mid-run
+_refresh_tasks: Set[asyncio.Task] = set()
+# How long a refresh started for a stream waits for that stream to subscribe
+SUBSCRIBE_GRACE_SECONDS = 5.0
+
+
+async def _refresh(
+    db: Database,
+    zone_ids: List[str],
+    limiter: Optional[AdmissionLimiter],
+    granted_at: float,
+    subscribed: Optional[asyncio.Event],
+    run_id: Optional[str],
+) -> None:
+    try:
+        if subscribed is not None:
+            # so the caller's stream sees refresh.started
+            try:
+                await asyncio.wait_for(subscribed.wait(), SUBSCRIBE_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+        await ensure_daily_refresh(db, zone_ids, force_refresh=True, run_id=run_id)
+    except Exception as e:
+        # subscribers already got refresh.failed
+        logger.error(f"Background refresh failed: {str(e)}")
+    finally:
+        if limiter is not None:
+            limiter.release(granted_at)
+
+
+def start_refresh(
+    db: Database,
+    zone_ids: List[str],
+    limiter: Optional[AdmissionLimiter] = None,
+    granted_at: float = 0.0,
+    subscribed: Optional[asyncio.Event] = None,
+    run_id: Optional[str] = None,
+) -> asyncio.Task:
+    """Forced refresh in the background; releases the already acquired ``limiter`` slot when done"""
+    task = asyncio.create_task(_refresh(db, zone_ids, limiter, granted_at, subscribed, run_id))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+    return task
+
+
+def format_event(event: Event) -> bytes:
+    data = dumps({"zone_ids": list(event.zone_ids), **event.data})
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event.id.encode(), event.type.encode(), data)
+
+
+async def _event_stream(zone_ids: List[str], subscribed: Optional[asyncio.Event] = None):
+    with event_bus.subscribe(zone_ids) as subscription:
+        if subscribed is not None:
+            subscribed.set()
+        yield b"retry: 5000\n\n"
+
+        while True:
+            event = await subscription.get(timeout=settings.events_keepalive_seconds)
+            if event is None:
+                # keeps proxies from closing an idle stream
+                yield b": keepalive\n\n"
+                continue
+            yield format_event(event)
+
+
+@router.get("/stream")
+async def stream_events(
+    refresh: bool = Query(False, description="Start a forced refresh and stream its progress"),
+    user: UserContext = Depends(get_current_user),
+    db: Database = Depends(get_db)
+):
+    subscribed = asyncio.Event()
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if refresh:
+        limiter = admission_controller.limiter(REFRESH)
+        granted_at = 0.0
+        if limiter is not None:
+            try:
+                granted_at = await limiter.acquire()
+            except AdmissionRejected as rejected:
+                raise rejected.http_exception()
+        run_id = new_run_id()
+        start_refresh(db, user.zone_ids, limiter, granted_at, subscribed, run_id)
+        headers["X-Refresh-Run-Id"] = run_id
+
+    return StreamingResponse(
+        _event_stream(user.zone_ids, subscribed),
+        media_type="text/event-stream",
+        headers=headers,
+    )
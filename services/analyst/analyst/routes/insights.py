@@ -1,21 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from typing import Optional
 from uuid import UUID
 import logging
 import json
+from ..config import settings
 from ..deps.auth import get_current_user, UserContext
 from ..db import get_db, Database
 from ..models.common import BaseResponse, PaginationParams
 from ..models.insights import InsightCreate, InsightResponse, InsightListResponse
 from ..core.daily_refresh import ensure_daily_refresh
+from ..utils.fast_json import FastJSONResponse, encode_object, encode_rows
+from ..utils.etag import etag_headers, list_etag, matches, not_modified
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/insights", tags=["insights"])
 
+# List columns; metrics_json stays text so the fast path can splice it verbatim
+INSIGHT_LIST_COLUMNS = """id, location_id, zone_id, kind, "window", metrics_json::text AS metrics_json,
+               narrative_text, confidence, created_at, created_by"""
+
 
 @router.get("/", response_model=InsightListResponse)
 async def list_insights(
+    request: Request,
+    response: Response,
     zone_id: Optional[str] = Query(None),
     location_id: Optional[UUID] = Query(None),
     kind: Optional[str] = Query(None),
@@ -29,6 +38,10 @@ async def list_insights(
         logger.info(f"Insights route called: refresh={refresh}, limit={limit}")
         await ensure_daily_refresh(db, user.zone_ids, force_refresh=refresh)
 
+        etag = await list_etag(db, ("insights",), user.zone_ids, request)
+        if matches(request, etag):
+            return not_modified(etag)
+
         # Now fetch insights with filtering
         where_clauses = []
         params = []
@@ -62,8 +75,7 @@ async def list_insights(
         where_clause = " AND ".join(where_clauses) or "TRUE"
 
         query = f"""
-            SELECT id, location_id, zone_id, kind, "window", metrics_json,
-                   narrative_text, confidence, created_at, created_by
+            SELECT {INSIGHT_LIST_COLUMNS}
             FROM insights
             WHERE {where_clause}
             ORDER BY created_at DESC
@@ -87,6 +99,14 @@ async def list_insights(
             zones_in_results = list(set([row['zone_id'] for row in results]))
             logger.info(f"🔥 Zones in query results: {sorted(zones_in_results)}")
 
+        if settings.fast_json_responses:
+            # Trusted rows: skip model validation and pass metrics_json through as stored
+            logger.info(f"🔥 Returning {len(results)} insights to frontend")
+            return FastJSONResponse(encode_object(
+                {"total": total, "offset": offset, "limit": limit},
+                {"insights": encode_rows(results, raw_columns=("metrics_json",))}
+            ), headers=etag_headers(etag))
+
         # Convert results and parse JSON fields
         parsed_results = []
         for row in results:
@@ -102,6 +122,7 @@ async def list_insights(
         insights = [InsightResponse(**row_dict) for row_dict in parsed_results]
 
         logger.info(f"🔥 Returning {len(insights)} insights to frontend")
+        response.headers.update(etag_headers(etag))
         return InsightListResponse(
             insights=insights,
             total=total,
@@ -5,6 +5,7 @@ from ..deps.auth import get_current_user, UserContext
 from ..db import get_db, Database
 from ..models.memories import MemoryCreate, MemoryResponse, MemoryUpsertRequest
 from ..models.common import BaseResponse, PaginationParams
+from ..core.memory_distiller import or_tsquery_sql
 
 router = APIRouter(prefix="/memories", tags=["memories"])
 
@@ -13,8 +14,10 @@ router = APIRouter(prefix="/memories", tags=["memories"])
 async def list_memories(
     scope: Optional[str] = Query(None),
     scope_ref: Optional[UUID] = Query(None),
+    zone_id: Optional[str] = Query(None),
     topic: Optional[str] = Query(None),
     kind: Optional[str] = Query(None),
+    q: Optional[str] = Query(None, description="Full-text search over topic and content, ranked by relevance"),
     pagination: PaginationParams = Depends(),
     user: UserContext = Depends(get_current_user),
     db: Database = Depends(get_db)
@@ -22,6 +25,18 @@ async def list_memories(
     where_clauses = ["is_active = true"]
     params = []
     param_idx = 1
+    from_clause = "feedback_memories"
+    rank_column = "NULL::real AS rank"
+    order_by = "created_at DESC"
+
+    if q and q.strip():
+        # Ranked search mode served by the GIN index on search_tsv
+        from_clause = f"feedback_memories, {or_tsquery_sql(f'${param_idx}')} AS q(tsq)"
+        where_clauses.append("search_tsv @@ q.tsq")
+        rank_column = "ts_rank_cd(search_tsv, q.tsq) AS rank"
+        order_by = "rank DESC, created_at DESC"
+        params.append(q)
+        param_idx += 1
 
     if scope:
         where_clauses.append(f"scope = ${param_idx}")
@@ -33,6 +48,11 @@ async def list_memories(
         params.append(scope_ref)
         param_idx += 1
 
+    if zone_id:
+        where_clauses.append(f"zone_id = ${param_idx}")
+        params.append(zone_id)
+        param_idx += 1
+
     if topic:
         where_clauses.append(f"topic ILIKE ${param_idx}")
         params.append(f"%{topic}%")
@@ -46,11 +66,11 @@ async def list_memories(
     where_clause = " AND ".join(where_clauses)
 
     query = f"""
-        SELECT id, scope, scope_ref, topic, kind, content, source_thread_id,
-               expires_at, created_by, created_at, is_active
-        FROM feedback_memories
+        SELECT id, scope, scope_ref, zone_id, topic, kind, content, source_thread_id,
+               expires_at, created_by, created_at, is_active, {rank_column}
+        FROM {from_clause}
         WHERE {where_clause}
-        ORDER BY created_at DESC
+        ORDER BY {order_by}
         LIMIT ${param_idx} OFFSET ${param_idx + 1}
     """
     params.extend([pagination.limit, pagination.offset])
@@ -75,10 +95,10 @@ async def upsert_memories(
 
             for memory in request.memories:
                 query = """
-                    INSERT INTO feedback_memories (scope, scope_ref, topic, kind, content,
+                    INSERT INTO feedback_memories (scope, scope_ref, zone_id, topic, kind, content,
                                                  source_thread_id, expires_at, created_by)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                    RETURNING id, scope, scope_ref, topic, kind, content, source_thread_id,
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+                    RETURNING id, scope, scope_ref, zone_id, topic, kind, content, source_thread_id,
                               expires_at, created_by, created_at, is_active
                 """
 
@@ -86,6 +106,7 @@ async def upsert_memories(
                     query,
                     memory.scope,
                     memory.scope_ref,
+                    memory.zone_id,
                     memory.topic,
                     memory.kind,
                     memory.content,
@@ -112,7 +133,7 @@ async def get_memory(
     db: Database = Depends(get_db)
 ):
     query = """
-        SELECT id, scope, scope_ref, topic, kind, content, source_thread_id,
+        SELECT id, scope, scope_ref, zone_id, topic, kind, content, source_thread_id,
                expires_at, created_by, created_at, is_active
         FROM feedback_memories
         WHERE id = $1 AND is_active = true
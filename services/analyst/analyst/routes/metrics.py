@@ -1,13 +1,27 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query
 from typing import Optional, List
 from datetime import datetime, date
 from uuid import UUID
 from ..deps.auth import get_current_user, UserContext
 from ..db import get_db, Database
 from ..models.common import BaseResponse, PaginationParams, TimeWindow
+from ..utils.columnar import columnar_response, negotiate_columnar, select_list
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
+_ROW_SELECT = "location_id, zone_id, rev, occupancy_pct, avg_ticket"
+
+# Columnar responses (see utils.columnar): times as epoch ms, numerics as float8
+_METRIC_COLUMNS = (
+    ("location_id::text", "location_id", "category"),
+    ("zone_id", "zone_id", "category"),
+    ("rev::float8", "rev", "float"),
+    ("occupancy_pct::float8", "occupancy_pct", "float"),
+    ("avg_ticket::float8", "avg_ticket", "float"),
+)
+DAILY_COLUMNS = (("(extract(epoch FROM date) * 1000)::int8", "date", "date"),) + _METRIC_COLUMNS
+HOURLY_COLUMNS = (("(extract(epoch FROM ts) * 1000)::int8", "ts", "timestamp"),) + _METRIC_COLUMNS
+
 
 @router.get("/daily")
 async def get_daily_metrics(
@@ -16,9 +30,12 @@ async def get_daily_metrics(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     pagination: PaginationParams = Depends(),
+    accept: Optional[str] = Header(None),
     user: UserContext = Depends(get_current_user),
     db: Database = Depends(get_db)
 ):
+    columnar = negotiate_columnar(accept)
+
     # Build query with zone filtering
     where_clauses = []
     params = []
@@ -55,7 +72,7 @@ async def get_daily_metrics(
     where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
 
     query = f"""
-        SELECT date, location_id, zone_id, rev, occupancy_pct, avg_ticket
+        SELECT {select_list(DAILY_COLUMNS) if columnar else "date, " + _ROW_SELECT}
         FROM mart_metrics_daily
         WHERE {where_clause}
         ORDER BY date DESC
@@ -77,9 +94,15 @@ async def get_daily_metrics(
                 "zone_ids": user.zone_ids
             })
 
-            results = await conn.fetch(query, *params[:-2])
+            results = await conn.fetch(query, *params)
             total = await conn.fetchval(count_query, *params[:-2])
 
+        if columnar:
+            return columnar_response(
+                results, DAILY_COLUMNS, columnar,
+                total=total, offset=pagination.offset, limit=pagination.limit
+            )
+
         return BaseResponse(data={
             "metrics": [dict(row) for row in results],
             "total": total,
@@ -98,9 +121,12 @@ async def get_hourly_metrics(
     start_ts: Optional[datetime] = Query(None),
     end_ts: Optional[datetime] = Query(None),
     pagination: PaginationParams = Depends(),
+    accept: Optional[str] = Header(None),
     user: UserContext = Depends(get_current_user),
     db: Database = Depends(get_db)
 ):
+    columnar = negotiate_columnar(accept)
+
     # Similar structure to daily metrics but for hourly data
     where_clauses = []
     params = []
@@ -136,7 +162,7 @@ async def get_hourly_metrics(
     where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
 
     query = f"""
-        SELECT ts, location_id, zone_id, rev, occupancy_pct, avg_ticket
+        SELECT {select_list(HOURLY_COLUMNS) if columnar else "ts, " + _ROW_SELECT}
         FROM mart_metrics_hourly
         WHERE {where_clause}
         ORDER BY ts DESC
@@ -156,9 +182,15 @@ async def get_hourly_metrics(
                 "zone_ids": user.zone_ids
             })
 
-            results = await conn.fetch(query, *params[:-2])
+            results = await conn.fetch(query, *params)
             total = await conn.fetchval(count_query, *params[:-2])
 
+        if columnar:
+            return columnar_response(
+                results, HOURLY_COLUMNS, columnar,
+                total=total, offset=pagination.offset, limit=pagination.limit
+            )
+
         return BaseResponse(data={
             "metrics": [dict(row) for row in results],
             "total": total,
@@ -5,6 +5,7 @@ from ..deps.auth import get_current_user, UserContext, require_role
 from ..db import get_db, Database
 from ..models.prompts import PromptVersionCreate, PromptVersionResponse, PromptVersionActivateRequest
 from ..models.common import BaseResponse
+from ..invalidation import PROMPT_TEMPLATES, invalidation_bus
 
 router = APIRouter(prefix="/prompts", tags=["prompts"])
 
@@ -125,6 +126,9 @@ async def activate_prompt_version(
             if result == "UPDATE 0":
                 raise HTTPException(status_code=404, detail="Prompt version not found")
 
+        # Compiled templates embed the active prompt text, in every worker
+        await invalidation_bus.invalidate(PROMPT_TEMPLATES)
+
         return BaseResponse(message="Prompt version activated")
 
     except Exception as e:
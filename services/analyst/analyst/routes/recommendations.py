@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response
 from typing import Optional, List
 from uuid import UUID
+from ..config import settings
 from ..deps.auth import get_current_user, UserContext
 from ..db import get_db, Database
 from ..models.recommendations import (
@@ -11,12 +12,26 @@ from ..models.common import BaseResponse, PaginationParams
 from ..core.recommendation_engine import RecommendationEngine
 from ..core.expert_recommendation_engine import ExpertRecommendationEngine
 from ..core.daily_refresh import ensure_daily_refresh
+from ..utils.fast_json import FastJSONResponse, encode_object, encode_rows
+from ..utils.etag import etag_headers, list_etag, matches, not_modified
 
 router = APIRouter(prefix="/recommendations", tags=["recommendations"])
 
+# List columns; the jsonb documents stay text so the fast path can splice them verbatim
+RECOMMENDATION_LIST_COLUMNS = """id, location_id, zone_id, type,
+               COALESCE(proposal::jsonb, '{}'::jsonb)::text as proposal,
+               rationale_text,
+               COALESCE(expected_lift_json, '{}'::jsonb)::text as expected_lift_json,
+               confidence, requires_approval,
+               COALESCE(memory_ids_used, '{}') as memory_ids_used,
+               prompt_version_id, thread_id, status, created_at"""
+RECOMMENDATION_RAW_COLUMNS = ("proposal", "expected_lift_json")
+
 
 @router.get("/", response_model=RecommendationListResponse)
 async def list_recommendations(
+    request: Request,
+    response: Response,
     zone_id: Optional[str] = Query(None),
     location_id: Optional[UUID] = Query(None),
     status: Optional[str] = Query(None),
@@ -28,6 +43,10 @@ async def list_recommendations(
 ):
     await ensure_daily_refresh(db, user.zone_ids, force_refresh=refresh)
 
+    etag = await list_etag(db, ("recommendations",), user.zone_ids, request)
+    if matches(request, etag):
+        return not_modified(etag)
+
     where_clauses = []
     params = []
     param_idx = 1
@@ -58,14 +77,7 @@ async def list_recommendations(
     where_clause = " AND ".join(where_clauses)
 
     query = f"""
-        SELECT id, location_id, zone_id, type,
-               CASE
-                 WHEN proposal IS NOT NULL THEN proposal::jsonb
-                 ELSE '{{}}'::jsonb
-               END as proposal,
-               rationale_text, expected_lift_json, confidence, requires_approval,
-               COALESCE(memory_ids_used, '{{}}') as memory_ids_used,
-               prompt_version_id, thread_id, status, created_at
+        SELECT {RECOMMENDATION_LIST_COLUMNS}
         FROM recommendations
         WHERE {where_clause}
         ORDER BY created_at DESC
@@ -83,6 +95,13 @@ async def list_recommendations(
         total_result = await db.fetchval(count_query, *params[:-2])  # Exclude limit and offset for count
         total = total_result or 0
 
+        if settings.fast_json_responses:
+            # Trusted rows: skip model validation and pass the jsonb columns through as stored
+            return FastJSONResponse(encode_object(
+                {"total": total, "offset": offset, "limit": limit},
+                {"recommendations": encode_rows(results, raw_columns=RECOMMENDATION_RAW_COLUMNS)}
+            ), headers=etag_headers(etag))
+
         # Parse recommendations and handle JSON fields
         recommendations = []
         for row in results:
@@ -108,6 +127,7 @@ async def list_recommendations(
                 row_dict['expected_lift_json'] = {}
 
             recommendations.append(RecommendationResponse(**row_dict))
+        response.headers.update(etag_headers(etag))
         return RecommendationListResponse(
             recommendations=recommendations,
             total=total,
@@ -146,15 +166,8 @@ async def get_recommendation(
         if not result:
             raise HTTPException(status_code=404, detail="Recommendation not found")
 
-        # Handle JSON parsing for single recommendation
         result_dict = dict(result)
-        if isinstance(result_dict.get('proposal'), str):
-            import json
-            try:
-                result_dict['proposal'] = json.loads(result_dict['proposal'])
-            except (json.JSONDecodeError, TypeError):
-                result_dict['proposal'] = {}
-        elif result_dict.get('proposal') is None:
+        if result_dict.get('proposal') is None:
             result_dict['proposal'] = {}
 
         return RecommendationResponse(**result_dict)
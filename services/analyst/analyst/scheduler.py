@@ -6,9 +6,12 @@ from typing import List, Optional
 import pytz
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from .config import settings
+from .core.auto_revert import RevertEvaluator
 from .core.daily_refresh import ensure_daily_refresh
+from .core.probe_runner import ProbeRunner
 from .db import db
 from .observability import record_refresh
 
@@ -21,6 +24,7 @@ class SchedulerManager:
     def __init__(self) -> None:
         self._scheduler: Optional[AsyncIOScheduler] = None
         self._startup_task: Optional[asyncio.Task] = None
+        self._revert_evaluator: Optional[RevertEvaluator] = None
 
     async def start(self) -> None:
         if not settings.scheduler_enabled:
@@ -48,6 +52,30 @@ class SchedulerManager:
             coalesce=True,
         )
 
+        if settings.scheduler_auto_revert_interval_minutes > 0:
+            self._scheduler.add_job(
+                self._run_auto_revert,
+                trigger=IntervalTrigger(
+                    minutes=settings.scheduler_auto_revert_interval_minutes,
+                    timezone=pytz.utc,
+                ),
+                name="price_change_auto_revert",
+                max_instances=1,
+                coalesce=True,
+            )
+
+        if settings.analyst_enable_elasticity_probe and settings.scheduler_probe_runner_interval_minutes > 0:
+            self._scheduler.add_job(
+                self._run_probe_runner,
+                trigger=IntervalTrigger(
+                    minutes=settings.scheduler_probe_runner_interval_minutes,
+                    timezone=pytz.utc,
+                ),
+                name="elasticity_probe_runner",
+                max_instances=1,
+                coalesce=True,
+            )
+
         self._scheduler.start()
         logger.info(
             "Scheduler started – daily refresh set for %02d:%02d UTC",
@@ -91,6 +119,21 @@ class SchedulerManager:
             record_refresh("failure")
             logger.exception("Daily refresh job failed: %s", exc)
 
+    async def _run_auto_revert(self) -> None:
+        try:
+            # One evaluator for the process, so its candidate cursor carries over between sweeps
+            if self._revert_evaluator is None:
+                self._revert_evaluator = RevertEvaluator(db)
+            await self._revert_evaluator.run_once()
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.exception("Auto-revert sweep failed: %s", exc)
+
+    async def _run_probe_runner(self) -> None:
+        try:
+            await ProbeRunner(db).run_once()
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.exception("Probe runner failed: %s", exc)
+
     async def _resolve_zone_ids(self) -> List[str]:
         configured = settings.scheduler_zone_ids_list
         if configured:
@@ -12,7 +12,7 @@ def emit_security_warnings() -> None:
         if settings.dev_jwt_hs256_secret.startswith("dev-local-please-rotate"):
             logger.warning(
                 "Default development JWT secret detected in %s environment. "
-                "Set DEV_JWT_HS256_SECRET to a secure value or configure JWT_PUBLIC_KEY_BASE64.",
+                "Set DEV_JWT_HS256_SECRET to a secure value or configure JWT_PUBLIC_KEY_BASE64 / JWT_JWKS_URL.",
                 settings.environment,
             )
 
@@ -24,6 +24,8 @@ def emit_security_warnings() -> None:
     if not settings.supabase_db_url:
         logger.warning("SUPABASE_DB_URL is not configured; database-dependent features will be unavailable.")
 
-    if not settings.jwt_public_key_base64 and not settings.dev_jwt_hs256_secret:
-        logger.warning("No JWT verification material configured. Set JWT_PUBLIC_KEY_BASE64 or DEV_JWT_HS256_SECRET.")
+    if not settings.jwt_public_key_base64 and not settings.jwt_jwks_url and not settings.dev_jwt_hs256_secret:
+        logger.warning(
+            "No JWT verification material configured. Set JWT_PUBLIC_KEY_BASE64, JWT_JWKS_URL or DEV_JWT_HS256_SECRET."
+        )
 
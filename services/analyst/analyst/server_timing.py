@@ -0,0 +1,150 @@
+"""
+Per-request ``Server-Timing`` breakdown.
+
+The middleware gives every request an accumulator in a contextvar; the
+database (pool acquire, SQL), auth dependency, LLM calls and JSON rendering
+add their durations to it with ``timed``/``record``. Tasks spawned during the
+request copy the context and share the same accumulator, so concurrent work
+is summed (a metric can exceed ``total``).
+
+The header is emitted when the response starts, so time spent streaming a
+body is not included. With ``SERVER_TIMING_DEBUG_ENVELOPE`` enabled, a JSON
+response requested with the ``X-Timing-Debug`` header is wrapped as
+``{"data": ..., "timing": {...}}`` instead.
+"""
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("auth", "db-acquire", "sql", "llm", "serialize")
+DEBUG_HEADER = b"x-timing-debug"
+
+# metric -> [seconds, count]; None outside of a request
+_timings: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("server_timings", default=None)
+
+
+def record(metric: str, seconds: float) -> None:
+    timings = _timings.get()
+    if timings is None:
+        return
+    entry = timings.get(metric)
+    if entry is None:
+        timings[metric] = [seconds, 1]
+    else:
+        entry[0] += seconds
+        entry[1] += 1
+
+
+@contextmanager
+def timed(metric: str):
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record(metric, perf_counter() - start)
+
+
+def header_value(timings: Dict[str, List[float]], total_seconds: float) -> str:
+    parts = []
+    for metric in METRICS + tuple(name for name in timings if name not in METRICS):
+        seconds, count = timings.get(metric, (0.0, 0))
+        part = f"{metric};dur={seconds * 1000:.2f}"
+        if count > 1:
+            part += f';desc="{int(count)} calls"'
+        parts.append(part)
+    parts.append(f"total;dur={total_seconds * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def timing_summary(timings: Dict[str, List[float]], total_seconds: float) -> Dict[str, Any]:
+    summary = {
+        metric: {"ms": round(seconds * 1000, 2), "count": int(count)}
+        for metric, (seconds, count) in timings.items()
+    }
+    summary["total_ms"] = round(total_seconds * 1000, 2)
+    return summary
+
+
+class TimedJSONResponse(JSONResponse):
+    """Default response class; attributes JSON rendering to ``serialize``."""
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return super().render(content)
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware adding ``Server-Timing`` (or the debug envelope) to responses."""
+
+    def __init__(self, app, debug_envelope: bool = False):
+        self.app = app
+        self.debug_envelope = debug_envelope
+
+    def _envelope_requested(self, scope) -> bool:
+        if not self.debug_envelope:
+            return False
+        for name, value in scope.get("headers", ()):
+            if name == DEBUG_HEADER:
+                return value not in (b"", b"0", b"false")
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, List[float]] = {}
+        token = _timings.set(timings)
+        start = perf_counter()
+        envelope = self._envelope_requested(scope)
+        held_start: Optional[Dict[str, Any]] = None
+        body: List[bytes] = []
+
+        async def _send(message):
+            nonlocal held_start
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if envelope and headers.get("content-type", "").startswith("application/json"):
+                    held_start = message
+                    return
+                headers.append("server-timing", header_value(timings, perf_counter() - start))
+            elif message["type"] == "http.response.body" and held_start is not None:
+                body.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                message = {"type": "http.response.body", "body": self._wrap(b"".join(body), timings, start)}
+                headers = MutableHeaders(scope=held_start)
+                headers["content-length"] = str(len(message["body"]))
+                headers.append("server-timing", header_value(timings, perf_counter() - start))
+                await send(held_start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _timings.reset(token)
+
+    @staticmethod
+    def _wrap(content: bytes, timings: Dict[str, List[float]], start: float) -> bytes:
+        data = json.loads(content) if content else None
+        envelope = {"data": data, "timing": timing_summary(timings, perf_counter() - start)}
+        return json.dumps(envelope, separators=(",", ":")).encode()
+
+
+def configure_server_timing(app: FastAPI) -> None:
+    if not settings.server_timing_enabled:
+        return
+
+    app.add_middleware(ServerTimingMiddleware, debug_envelope=settings.server_timing_debug_envelope)
+    logger.info(f"Server-Timing enabled (debug_envelope={settings.server_timing_debug_envelope})")
@@ -0,0 +1,118 @@
+"""Columnar encodings for time-series responses, chosen by content negotiation.
+
+Clients that send ``Accept: application/vnd.apache.arrow.stream`` get an Arrow
+IPC stream; ``Accept: application/vnd.analyst.columns+json`` gets
+``{"columns": {name: [values]}, ...}``. Both are built by transposing the
+asyncpg records directly, without a dict per row. Without pyarrow installed
+Arrow is simply not offered and such clients get the regular JSON.
+
+Columns are described as ``(select expression, name, kind)``; the expressions
+have Postgres hand over values that need no per-value conversion here:
+
+- ``timestamp`` / ``date``: epoch milliseconds (int8)
+- ``float``: float8
+- ``category``: text, dictionary-encoded (``{"dictionary": [...], "indices": [...]}``
+  in JSON, a dictionary array in Arrow)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi.responses import Response
+
+from ..server_timing import timed
+from .fast_json import FastJSONResponse, dumps
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+__all__ = [
+    "ARROW_STREAM",
+    "COLUMNS_JSON",
+    "ColumnSpec",
+    "negotiate_columnar",
+    "select_list",
+    "columnar_response",
+]
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+COLUMNS_JSON = "application/vnd.analyst.columns+json"
+_COLUMNAR_TYPES = (ARROW_STREAM, COLUMNS_JSON)
+
+# (select expression, output column, kind)
+ColumnSpec = Tuple[str, str, str]
+
+
+def negotiate_columnar(accept: Optional[str]) -> Optional[str]:
+    """The columnar media type the client prefers, or None for the row-oriented JSON"""
+    if not accept:
+        return None
+
+    best, best_q = None, 0.0
+    for part in accept.split(","):
+        media_type, *params = [piece.strip() for piece in part.split(";")]
+        if media_type not in _COLUMNAR_TYPES or (media_type == ARROW_STREAM and pa is None):
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def select_list(columns: Sequence[ColumnSpec]) -> str:
+    return ", ".join(f"{expression} AS {name}" for expression, name, _ in columns)
+
+
+def _transpose(records: Sequence[Any], count: int) -> List[List[Any]]:
+    if not records:
+        return [[] for _ in range(count)]
+    return list(map(list, zip(*records)))
+
+
+def _dictionary_encode(values: List[Any]) -> Dict[str, List[Any]]:
+    index: Dict[Any, int] = {}
+    indices = [index.setdefault(value, len(index)) for value in values]
+    return {"dictionary": list(index), "indices": indices}
+
+
+def _arrow_array(values: List[Any], kind: str):
+    if kind == "category":
+        return pa.array(values, pa.string()).dictionary_encode()
+    if kind == "float":
+        return pa.array(values, pa.float64())
+    epoch_ms = pa.array(values, pa.int64())
+    return epoch_ms.cast(pa.date64() if kind == "date" else pa.timestamp("ms", tz="UTC"))
+
+
+def columnar_response(
+    records: Sequence[Any], columns: Sequence[ColumnSpec], media_type: str, **meta: Any
+) -> Response:
+    """Encode ``records`` column-wise; ``meta`` (total, offset, ...) goes alongside the columns"""
+    headers = {"Vary": "Accept"}
+
+    with timed("serialize"):
+        values = _transpose(records, len(columns))
+
+        if media_type == ARROW_STREAM:
+            table = pa.table({name: _arrow_array(column, kind) for (_, name, kind), column in zip(columns, values)})
+            table = table.replace_schema_metadata({key: str(value) for key, value in meta.items()})
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return Response(sink.getvalue().to_pybytes(), media_type=ARROW_STREAM, headers=headers)
+
+        encoded = {
+            name: _dictionary_encode(column) if kind == "category" else column
+            for (_, name, kind), column in zip(columns, values)
+        }
+        body = dumps({"columns": encoded, **meta})
+    return FastJSONResponse(body, media_type=COLUMNS_JSON, headers=headers)
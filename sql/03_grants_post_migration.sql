@@ -14,7 +14,8 @@ DECLARE
         'feedback_memories',
         'feedback_memory_embeddings',
         'inferred_rate_plans',
-        'proposed_rate_plans'
+        'proposed_rate_plans',
+        'zone_data_generations'
     ];
     read_only_tables text[] := ARRAY[
         'agent_prompt_versions',
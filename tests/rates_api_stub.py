@@ -0,0 +1,47 @@
+"""
+Local stand-in for the rates API used by the outbox publisher tests.
+
+Serve it for manual runs with ``uvicorn tests.rates_api_stub:app --port 8099``
+and point ``RATES_API_BASE_URL`` at it.
+"""
+from typing import Dict, List
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+class RatesApiStub:
+    """Records pushed rate changes; can be told to fail the next N requests."""
+
+    def __init__(self) -> None:
+        self.requests: List[Dict] = []
+        self.applied: Dict[str, Dict] = {}
+        self.fail_next: List[int] = []
+        self.reject_keys: set = set()
+        self.app = Starlette(routes=[Route("/rates/batch", self.batch, methods=["POST"])])
+
+    async def batch(self, request: Request) -> JSONResponse:
+        body = await request.json()
+        self.requests.append({"headers": dict(request.headers), "body": body})
+
+        if self.fail_next:
+            status = self.fail_next.pop(0)
+            return JSONResponse({"error": "unavailable"}, status_code=status, headers={"Retry-After": "0"})
+
+        results = []
+        for change in body.get("changes", []):
+            key = change["idempotency_key"]
+            if key in self.reject_keys:
+                results.append({"idempotency_key": key, "status": "rejected"})
+            elif key in self.applied:
+                results.append({"idempotency_key": key, "status": "duplicate"})
+            else:
+                self.applied[key] = change
+                results.append({"idempotency_key": key, "status": "ok"})
+
+        return JSONResponse({"results": results})
+
+
+app = RatesApiStub().app
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services.analyst.analyst.admission import (
+    ANALYTICS,
+    EXPERT,
+    REFRESH,
+    AdmissionController,
+    AdmissionLimiter,
+    AdmissionMiddleware,
+    AdmissionRejected,
+)
+from services.analyst.analyst.observability import ADMISSION_QUEUE_DEPTH, REGISTRY
+
+
+def _rejections(request_class, reason):
+    value = REGISTRY.get_sample_value(
+        "level_analyst_admission_rejected_total", {"request_class": request_class, "reason": reason}
+    )
+    return value or 0.0
+
+
+class TestAdmission:
+    """Test per-class concurrency budgets for heavy requests."""
+
+    def test_requests_are_classified(self):
+        classify = AdmissionController.classify
+
+        assert classify("/analytics/expert-analysis/z-110", b"") == EXPERT
+        assert classify("/analytics/occupancy-analysis", b"") == ANALYTICS
+        assert classify("/insights/", b"refresh=true&limit=5") == REFRESH
+        assert classify("/dashboard/", b"refresh=1") == REFRESH
+        assert classify("/insights/", b"refresh=false") is None
+        assert classify("/threads/", b"") is None
+        # the stream admits its background refresh itself
+        assert classify("/events/stream", b"refresh=true") is None
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_admitted_in_order(self):
+        limiter = AdmissionLimiter("test-order", max_concurrent=1, max_queue=2, queue_timeout=1)
+        granted_at = await limiter.acquire()
+        admitted = []
+
+        async def waiter(name):
+            async with limiter.slot():
+                admitted.append(name)
+
+        tasks = [asyncio.create_task(waiter("first")), asyncio.create_task(waiter("second"))]
+        await asyncio.sleep(0)
+        assert limiter.queued == 2
+        assert ADMISSION_QUEUE_DEPTH.labels(request_class="test-order")._value.get() == 2
+
+        limiter.release(granted_at)
+        await asyncio.gather(*tasks)
+
+        assert admitted == ["first", "second"]
+        assert limiter.in_flight == 0 and limiter.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_is_rejected_with_429(self):
+        limiter = AdmissionLimiter("test-full", max_concurrent=1, max_queue=0, queue_timeout=1)
+        await limiter.acquire()
+        before = _rejections("test-full", "queue_full")
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await limiter.acquire()
+
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+        assert _rejections("test-full", "queue_full") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout_is_rejected_with_503(self):
+        limiter = AdmissionLimiter("test-timeout", max_concurrent=1, max_queue=1, queue_timeout=0.01)
+        await limiter.acquire()
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await limiter.acquire()
+
+        assert exc_info.value.status_code == 503
+        assert limiter.queued == 0 and limiter.in_flight == 1
+
+    def test_middleware_rejects_only_the_saturated_class(self):
+        limiter = AdmissionLimiter(ANALYTICS, max_concurrent=1, max_queue=0, queue_timeout=1)
+        app = FastAPI()
+        app.add_middleware(AdmissionMiddleware, controller=AdmissionController({ANALYTICS: limiter}))
+
+        @app.get("/analytics/zone-summary")
+        async def zone_summary():
+            return {"ok": True}
+
+        @app.get("/threads/")
+        async def threads():
+            return {"ok": True}
+
+        client = TestClient(app)
+        assert client.get("/analytics/zone-summary").status_code == 200
+        assert limiter.in_flight == 0
+
+        # another request already holds the only analytics slot
+        limiter.in_flight = 1
+        rejected = client.get("/analytics/zone-summary")
+        assert rejected.status_code == 429
+        assert "Retry-After" in rejected.headers
+        assert client.get("/threads/").status_code == 200
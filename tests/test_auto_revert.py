@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from services.analyst.analyst.core.auto_revert import (
+    MIN_UUID,
+    RevertEvaluator,
+    condition_window_days,
+    evaluate_revert_condition,
+)
+
+
+class TestAutoRevert:
+    """Test expiry and conditional auto-revert of applied price changes."""
+
+    def test_evaluate_revert_condition(self):
+        """Leaf, any and all conditions; missing data never triggers a revert."""
+        low_occupancy = {"metric": "occupancy_pct", "op": "lt", "threshold": 0.4, "window_days": 3}
+        high_rev = {"metric": "rev", "op": "gte", "threshold": 1000, "window_days": 7}
+        metrics = {"occupancy_pct": 0.35, "rev": 800.0, "avg_ticket": None}
+
+        assert evaluate_revert_condition(low_occupancy, metrics)
+        assert not evaluate_revert_condition(high_rev, metrics)
+        assert evaluate_revert_condition({"any": [low_occupancy, high_rev]}, metrics)
+        assert not evaluate_revert_condition({"all": [low_occupancy, high_rev]}, metrics)
+        assert not evaluate_revert_condition({"metric": "avg_ticket", "op": "lt", "threshold": 9}, metrics)
+        assert not evaluate_revert_condition({"metric": "bogus", "op": "lt", "threshold": 9}, metrics)
+        assert condition_window_days({"any": [low_occupancy, high_rev]}) == 7
+
+    @pytest.mark.asyncio
+    async def test_run_once_reverts_in_bulk(self, mock_db):
+        """Due expiries and met conditions are each reverted with one UPDATE per batch."""
+        now = datetime.now(timezone.utc)
+        expired_id, condition_id, holding_id = uuid4(), uuid4(), uuid4()
+        condition = '{"metric": "occupancy_pct", "op": "lt", "threshold": 0.4, "window_days": 3}'
+
+        mock_db.connection.fetch.side_effect = [
+            # expiry scan, then its bulk revert
+            [{"id": expired_id, "expires_at": now - timedelta(minutes=2)}],
+            [{"id": expired_id, "zone_id": "z-110", "expires_at": now - timedelta(minutes=2)}],
+            # revert_if candidates, window metrics, then the bulk revert
+            [
+                {"id": condition_id, "zone_id": "z-110", "applied_at": now - timedelta(days=5), "revert_if": condition},
+                {"id": holding_id, "zone_id": "z-221", "applied_at": now - timedelta(days=4), "revert_if": condition},
+            ],
+            [
+                {"id": condition_id, "rev": 500.0, "occupancy_pct": 0.31, "avg_ticket": 6.0, "days": 3},
+                {"id": holding_id, "rev": 900.0, "occupancy_pct": 0.72, "avg_ticket": 7.0, "days": 3},
+            ],
+            [{"id": condition_id, "zone_id": "z-110", "expires_at": None}],
+        ]
+
+        result = await RevertEvaluator(mock_db, batch_size=100).run_once()
+
+        assert result["reverted"] == {"expired": 1, "condition": 1}
+        assert result["evaluated"] == {"expired": 1, "condition": 2}
+
+        calls = mock_db.connection.fetch.call_args_list
+        assert calls[1][0][1:] == ([expired_id], ["expired"])
+        assert calls[3][0][1] == [condition_id, holding_id]
+        assert calls[4][0][1:] == ([condition_id], ["condition"])
+
+    @pytest.mark.asyncio
+    async def test_conditional_cursor_resumes_and_wraps_across_runs(self, mock_db):
+        """Each sweep continues where the last one stopped and starts over after the end."""
+        now = datetime.now(timezone.utc)
+        condition = '{"metric": "occupancy_pct", "op": "lt", "threshold": 0.4}'
+        rows = [
+            {"id": uuid4(), "zone_id": "z-110", "applied_at": now - timedelta(days=days), "revert_if": condition}
+            for days in (3, 2, 1)
+        ]
+        holding = [{"id": row["id"], "rev": 1.0, "occupancy_pct": 0.9, "avg_ticket": 1.0, "days": 3} for row in rows]
+
+        mock_db.connection.fetch.side_effect = [
+            # first sweep: no expiries, a full batch of candidates and their metrics
+            [], rows[:2], holding[:2],
+            # second sweep: the last candidate, then the end of the scan
+            [], rows[2:], holding[2:],
+            # third sweep starts from the beginning again
+            [], [],
+        ]
+        evaluator = RevertEvaluator(mock_db, batch_size=2, max_batches=1)
+
+        for _ in range(3):
+            await evaluator.run_once()
+
+        candidate_calls = [
+            call[0] for call in mock_db.connection.fetch.call_args_list if "revert_if IS NOT NULL" in call[0][0]
+        ]
+        assert candidate_calls[0][1].year == 1 and candidate_calls[0][2] == MIN_UUID
+        assert candidate_calls[1][1:3] == (rows[1]["applied_at"], str(rows[1]["id"]))
+        assert candidate_calls[2][1].year == 1 and candidate_calls[2][2] == MIN_UUID
@@ -0,0 +1,73 @@
+from datetime import date
+
+import httpx
+import pandas as pd
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from benchmarks.harness import compare_reports
+from benchmarks.loadtest import LoadTest, Route as LoadRoute, Session
+from benchmarks.synthetic import SyntheticSpec, generate_transactions, transactions_table
+
+
+class TestSyntheticData:
+    """Test the benchmark data generator and regression check."""
+
+    def test_generator_is_deterministic(self):
+        """The same spec yields identical transactions in the historical_transactions layout."""
+        spec = SyntheticSpec.for_scale("10k", anchor=date(2024, 6, 1))
+
+        first = pd.concat(transactions_table(frame) for frame in generate_transactions(spec))
+        second = pd.concat(transactions_table(frame) for frame in generate_transactions(spec))
+
+        pd.testing.assert_frame_equal(first, second)
+        assert len(first) == 10_000
+        assert first["start_park_date"].max() < "2024-06-01"
+        assert {"-", ""} & set(first["parking_amount"])
+        assert first["payment_amount"].astype(float).ge(0).all()
+
+    def test_compare_reports_flags_slower_medians(self):
+        """Only medians beyond the threshold are reported as regressions."""
+        baseline = {"results": [
+            {"group": "expert_ai", "name": "a", "stats": {"median": 1.0}},
+            {"group": "expert_ai", "name": "b", "stats": {"median": 1.0}},
+        ]}
+        current = {"results": [
+            {"group": "expert_ai", "name": "a", "stats": {"median": 1.5}},
+            {"group": "expert_ai", "name": "b", "stats": {"median": 1.1}},
+        ]}
+
+        regressions = compare_reports(current, baseline, threshold=0.2)
+
+        assert [r["name"] for r in regressions] == ["a"]
+
+
+class TestLoadTest:
+    """Test the load-test runner against a small ASGI app."""
+
+    @pytest.mark.asyncio
+    async def test_reports_latency_and_errors_per_route(self):
+        """Each route gets its own percentiles; 5xx responses count as errors."""
+        async def ok(request):
+            return JSONResponse({"ok": True})
+
+        async def broken(request):
+            return JSONResponse({"detail": "boom"}, status_code=500)
+
+        app = Starlette(routes=[Route("/ok", ok), Route("/broken", broken)])
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        routes = [
+            LoadRoute("GET /ok", 3, lambda rng, s: ("GET", "/ok", {})),
+            LoadRoute("GET /broken", 1, lambda rng, s: ("GET", "/broken", {})),
+            LoadRoute("GET /threads/{thread_id}", 1, lambda rng, s: ("GET", f"/threads/{s.thread_id}", {})),
+        ]
+
+        summary = await LoadTest(client, Session(zone_ids=["z-110"]), routes, users=2, duration=0.2).run()
+
+        assert set(summary["routes"]) == {"GET /ok", "GET /broken"}
+        assert summary["routes"]["GET /ok"]["error_rate"] == 0
+        assert summary["routes"]["GET /broken"]["error_rate"] == 1
+        assert summary["routes"]["GET /broken"]["statuses"] == {"500": summary["routes"]["GET /broken"]["requests"]}
+        assert summary["total"]["p99_ms"] >= summary["total"]["p50_ms"]
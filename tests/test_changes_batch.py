@@ -0,0 +1,155 @@
+import pytest
+from uuid import uuid4
+from services.analyst.analyst.deps.auth import UserContext
+from services.analyst.analyst.models.changes import (
+    ApplyChangeRequest,
+    BatchApplyChangesRequest,
+    BatchRevertChangesRequest,
+    RevertChangeRequest,
+)
+from services.analyst.analyst.routes.changes import (
+    apply_price_change,
+    apply_price_changes_batch,
+    revert_price_change,
+    revert_price_changes_batch,
+)
+
+
+class TestBatchChanges:
+    """Test bulk apply/revert of price changes."""
+
+    @pytest.fixture
+    def user(self, mock_user_context):
+        return UserContext(**{**mock_user_context, "sub": "dev-user"})
+
+    def _change(self, zone_id="z-110", status="pending", new_price=5.50, change_pct=0.10):
+        return {
+            "id": uuid4(),
+            "location_id": None,
+            "zone_id": zone_id,
+            "prev_price": 5.00,
+            "new_price": new_price,
+            "change_pct": change_pct,
+            "policy_version": None,
+            "recommendation_id": None,
+            "revert_to": 5.00,
+            "revert_if": None,
+            "expires_at": None,
+            "status": status,
+        }
+
+    def _record_statements(self, mock_db, locked_row):
+        """Log transaction boundaries and statements run on the connection"""
+        log = []
+        depth = []
+
+        class _Transaction:
+            async def __aenter__(self_inner):
+                log.append("SAVEPOINT" if depth else "BEGIN")
+                depth.append(True)
+
+            async def __aexit__(self_inner, exc_type, exc, tb):
+                depth.pop()
+                log.append("RELEASE" if depth else "COMMIT")
+                return False
+
+        async def fetch(query, *args):
+            log.append("FOR UPDATE" if "FOR UPDATE" in query else "fetch")
+            return [locked_row] if "FOR UPDATE" in query else []
+
+        async def execute(query, *args):
+            if "pg_advisory_xact_lock" in query:
+                log.append("zone lock")
+            elif "UPDATE price_changes" in query:
+                log.append("UPDATE")
+            else:
+                log.append("execute")
+            return ""
+
+        mock_db.connection.transaction = lambda: _Transaction()
+        mock_db.connection.fetch.side_effect = fetch
+        mock_db.connection.execute.side_effect = execute
+        return log
+
+    @pytest.mark.asyncio
+    async def test_apply_locks_and_validates_inside_one_transaction(self, mock_db, user):
+        """The row lock, zone lock, guardrail check and update share one transaction."""
+        change = self._change()
+        log = self._record_statements(mock_db, change)
+        mock_db.fetch.return_value = [{"name": "default-guardrails", "json_schema": {"max_change_pct": 0.15}}]
+
+        await apply_price_change(ApplyChangeRequest(change_id=change["id"]), user=user, db=mock_db)
+
+        assert log[0] == "BEGIN" and log[-1] == "COMMIT"
+        assert log.index("FOR UPDATE") < log.index("zone lock") < log.index("UPDATE")
+        assert log.count("BEGIN") == 1
+
+    @pytest.mark.asyncio
+    async def test_revert_locks_the_change_before_checking_it(self, mock_db, user):
+        """A second revert waits on the row lock and then sees the change already reverted."""
+        change = self._change(status="applied")
+        log = self._record_statements(mock_db, change)
+
+        await revert_price_change(RevertChangeRequest(change_id=change["id"]), user=user, db=mock_db)
+
+        assert log[0] == "BEGIN" and log[-1] == "COMMIT"
+        assert log.index("FOR UPDATE") < log.index("UPDATE")
+        assert log.count("BEGIN") == 1
+
+    @pytest.mark.asyncio
+    async def test_apply_batch_reports_per_change_results(self, mock_db, user):
+        """Valid changes are applied in one UPDATE; others report why they were skipped."""
+        ok = self._change()
+        too_big = self._change(new_price=8.00, change_pct=0.60)
+        applied = self._change(status="applied")
+        other_zone = self._change(zone_id="z-999")
+        missing = uuid4()
+
+        mock_db.connection.fetch.side_effect = [[ok, too_big, applied, other_zone], []]
+        mock_db.fetch.return_value = [{"name": "default-guardrails", "json_schema": {"max_change_pct": 0.15}}]
+
+        request = BatchApplyChangesRequest(
+            change_ids=[ok["id"], too_big["id"], applied["id"], other_zone["id"], missing]
+        )
+        response = await apply_price_changes_batch(request, user=user, db=mock_db)
+
+        statuses = [result.status for result in response.results]
+        assert statuses == ["applied", "guardrail_violation", "invalid_status", "forbidden", "not_found"]
+        assert response.succeeded == 1
+        assert response.failed == 4
+
+        update_args = mock_db.connection.execute.call_args[0]
+        assert "status = 'applied'" in update_args[0]
+        assert update_args[1] == [ok["id"]]
+
+    @pytest.mark.asyncio
+    async def test_apply_batch_validates_on_the_locking_transaction(self, mock_db, user):
+        """Zones are locked and recent prices read on the connection holding the row locks."""
+        change = self._change()
+        mock_db.connection.fetch.side_effect = [[change], []]
+        mock_db.fetch.return_value = [{"name": "default-guardrails", "json_schema": {"max_change_pct": 0.15}}]
+
+        request = BatchApplyChangesRequest(change_ids=[change["id"]])
+        response = await apply_price_changes_batch(request, user=user, db=mock_db)
+
+        assert response.succeeded == 1
+        recent_prices_query, zone_ids = mock_db.connection.fetch.call_args_list[1][0]
+        assert "price_changes" in recent_prices_query and zone_ids == ["z-110"]
+        assert mock_db.fetch.call_count == 1
+
+        lock_query, locked_zones = mock_db.connection.execute.call_args_list[0][0]
+        assert "pg_advisory_xact_lock" in lock_query and locked_zones == ["z-110"]
+
+    @pytest.mark.asyncio
+    async def test_revert_batch_only_reverts_applied(self, mock_db, user):
+        """Only applied changes are reverted, in a single statement."""
+        applied = self._change(status="applied")
+        pending = self._change()
+
+        mock_db.connection.fetch.return_value = [applied, pending]
+
+        request = BatchRevertChangesRequest(change_ids=[applied["id"], pending["id"]])
+        response = await revert_price_changes_batch(request, user=user, db=mock_db)
+
+        assert [result.status for result in response.results] == ["reverted", "invalid_status"]
+        assert mock_db.connection.execute.call_args[0][1] == [applied["id"]]
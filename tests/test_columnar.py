@@ -0,0 +1,106 @@
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+
+from services.analyst.analyst.deps.auth import UserContext
+from services.analyst.analyst.routes import metrics
+from services.analyst.analyst.utils.columnar import (
+    ARROW_STREAM,
+    COLUMNS_JSON,
+    negotiate_columnar,
+    select_list,
+)
+
+
+def _user(*zones):
+    return UserContext(sub="u", org_id="org", roles=["viewer"], zone_ids=list(zones), iss="test", exp=0)
+
+
+def _db(rows, total):
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=rows)
+    conn.fetchval = AsyncMock(return_value=total)
+
+    @asynccontextmanager
+    async def transaction():
+        yield conn
+
+    db = MagicMock()
+    db.transaction = transaction
+    db.set_jwt_claims = AsyncMock()
+    return db, conn
+
+
+def _daily_rows(days):
+    start = date(2024, 1, 1)
+    return [
+        ((start + timedelta(days=day) - date(1970, 1, 1)).days * 86_400_000, "0b8a1f5e-3c1d-4a5e-9f6b-2d7c8e9a0b1c", "z-110", 1234.5, 0.62, 8.75)
+        for day in range(days)
+    ]
+
+
+async def _daily(db, accept):
+    return await metrics.get_daily_metrics(
+        zone_id=None, location_id=None, start_date=None, end_date=None,
+        pagination=metrics.PaginationParams(limit=100, offset=0),
+        accept=accept, user=_user("z-110"), db=db
+    )
+
+
+class TestColumnar:
+    """Test columnar encodings of the metrics time series."""
+
+    def test_negotiation(self):
+        assert negotiate_columnar(None) is None
+        assert negotiate_columnar("application/json") is None
+        assert negotiate_columnar(COLUMNS_JSON) == COLUMNS_JSON
+        assert negotiate_columnar(f"{COLUMNS_JSON};q=0.5, {ARROW_STREAM}") in (ARROW_STREAM, COLUMNS_JSON)
+        assert negotiate_columnar(f"{ARROW_STREAM};q=0, application/json") is None
+
+    def test_select_list_aliases_expressions(self):
+        assert select_list(metrics.HOURLY_COLUMNS).startswith("(extract(epoch FROM ts) * 1000)::int8 AS ts, ")
+
+    @pytest.mark.asyncio
+    async def test_columns_json_response(self):
+        db, conn = _db(_daily_rows(3), 3)
+
+        response = await _daily(db, COLUMNS_JSON)
+
+        assert response.media_type == COLUMNS_JSON
+        assert response.headers["vary"] == "Accept"
+        body = orjson.loads(response.body)
+        assert body["columns"]["date"] == [1704067200000, 1704153600000, 1704240000000]
+        assert body["columns"]["rev"] == [1234.5] * 3
+        assert body["columns"]["zone_id"] == {"dictionary": ["z-110"], "indices": [0, 0, 0]}
+        assert body["total"] == 3 and body["limit"] == 100
+        query, *args = conn.fetch.call_args.args
+        assert "rev::float8 AS rev" in query
+        assert args[-2:] == [100, 0]
+
+    @pytest.mark.asyncio
+    async def test_row_json_by_default(self):
+        db, conn = _db([], 0)
+
+        response = await _daily(db, "application/json")
+
+        assert response.success
+        assert response.data["metrics"] == []
+        assert "::float8" not in conn.fetch.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_arrow_response(self):
+        pa = pytest.importorskip("pyarrow")
+        db, _ = _db(_daily_rows(5), 5)
+
+        response = await _daily(db, ARROW_STREAM)
+
+        assert response.media_type == ARROW_STREAM
+        table = pa.ipc.open_stream(response.body).read_all()
+        assert table.num_rows == 5
+        assert table.column_names == [name for _, name, _ in metrics.DAILY_COLUMNS]
+        assert table.column("date")[0].as_py() == date(2024, 1, 1)
+        assert pa.types.is_dictionary(table.schema.field("zone_id").type)
+        assert table.schema.metadata[b"total"] == b"5"
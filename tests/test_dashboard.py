@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+from fastapi import Request
+
+from services.analyst.analyst.deps.auth import UserContext
+from services.analyst.analyst.routes import dashboard
+
+CREATED = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def _request(headers=()):
+    return Request({"type": "http", "method": "GET", "path": "/dashboard/", "query_string": b"",
+                    "headers": list(headers)})
+
+
+def _user(*zones):
+    return UserContext(sub="u", org_id="org", roles=["viewer"], zone_ids=list(zones), iss="test", exp=0)
+
+
+class SectionDB:
+    """Answers each dashboard query by table and records how many ran at once."""
+
+    def __init__(self, failing=()):
+        self.failing = failing
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queries = []
+
+    async def fetchval(self, query, *args):
+        # zone_data_generations lookup for the ETag
+        return 7
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            for table, rows in self._rows().items():
+                if f"FROM {table}" in query:
+                    if table in self.failing:
+                        raise RuntimeError(f"{table} unavailable")
+                    return rows
+            return []
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    def _rows():
+        return {
+            "insights": [{"id": "i1", "zone_id": "z-110", "metrics_json": '{"rev": 1}', "created_at": CREATED}],
+            "recommendations": [{"id": "r1", "zone_id": "z-110", "proposal": '{"price": 4}',
+                                 "expected_lift_json": "{}", "created_at": CREATED}],
+            "price_changes": [{"id": "c1", "zone_id": "z-110", "status": "pending", "created_at": CREATED}],
+            "historical_transactions": [{"zone": 110, "total_sessions": 12, "total_revenue": 30}],
+            "agent_guardrails": [{"name": "default", "json_schema": {"max_change_pct": 0.15}}],
+        }
+
+
+@pytest.fixture(autouse=True)
+def no_refresh(monkeypatch):
+    refresh = AsyncMock()
+    monkeypatch.setattr(dashboard, "ensure_daily_refresh", refresh)
+    return refresh
+
+
+class TestDashboard:
+    """Test the consolidated card payload."""
+
+    @pytest.mark.asyncio
+    async def test_sections_load_concurrently_in_one_payload(self, no_refresh):
+        db = SectionDB()
+
+        response = await dashboard.get_dashboard(_request(), limit=20, refresh=True, user=_user("z-110"), db=db)
+
+        no_refresh.assert_awaited_once_with(db, ["z-110"], force_refresh=True)
+        assert db.max_in_flight == 5
+        body = orjson.loads(response.body)
+        assert body["errors"] == {}
+        assert body["insights"][0]["metrics_json"] == {"rev": 1}
+        assert body["recommendations"][0]["proposal"] == {"price": 4}
+        assert body["changes"][0]["status"] == "pending"
+        assert body["zone_summary"]["summary"]["total_sessions"] == 12
+        assert body["guardrails"] == [{"name": "default", "schema": {"max_change_pct": 0.15}}]
+
+    @pytest.mark.asyncio
+    async def test_failed_section_is_reported_not_raised(self):
+        db = SectionDB(failing=("price_changes",))
+
+        response = await dashboard.get_dashboard(_request(), limit=20, refresh=False, user=_user("z-110"), db=db)
+
+        body = orjson.loads(response.body)
+        assert body["changes"] is None
+        assert "price_changes unavailable" in body["errors"]["changes"]
+        assert body["insights"][0]["id"] == "i1"
+
+    @pytest.mark.asyncio
+    async def test_matching_etag_skips_sections(self):
+        db = SectionDB()
+        first = await dashboard.get_dashboard(_request(), limit=20, refresh=False, user=_user("z-110"), db=db)
+        etag = first.headers["etag"]
+        db.queries.clear()
+
+        response = await dashboard.get_dashboard(
+            _request([(b"if-none-match", etag.encode())]), limit=20, refresh=False, user=_user("z-110"), db=db
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert db.queries == []
+
+    @pytest.mark.asyncio
+    async def test_partial_page_has_no_etag(self):
+        db = SectionDB(failing=("insights",))
+
+        response = await dashboard.get_dashboard(_request(), limit=20, refresh=False, user=_user("z-110"), db=db)
+
+        assert "etag" not in response.headers
@@ -0,0 +1,142 @@
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from services.analyst.analyst import db as db_module
+from services.analyst.analyst.db import Database
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.codecs = {}
+
+    async def set_type_codec(self, typename, *, encoder, decoder, schema, **kwargs):
+        self.codecs[typename] = (encoder, decoder)
+
+    async def fetchrow(self, query, *args):
+        return {"pool": self.pool_name}
+
+
+class FakePool:
+    def __init__(self, name):
+        self.name = name
+
+    @asynccontextmanager
+    async def acquire(self):
+        conn = RecordingConnection()
+        conn.pool_name = self.name
+        yield conn
+
+
+class TestDatabaseCodecs:
+    """Test the pool-level json/jsonb and numeric codecs."""
+
+    @pytest.mark.asyncio
+    async def test_json_codecs_round_trip_python_objects(self):
+        """jsonb parameters take objects (Decimals and UUIDs included) and decode back to objects."""
+        conn = RecordingConnection()
+        await db_module._init_connection(conn)
+
+        encoder, decoder = conn.codecs["jsonb"]
+        value = {"price": Decimal("5.25"), "zone": UUID(int=1), "tiers": [1, 2]}
+        encoded = encoder(value)
+
+        assert isinstance(encoded, str)
+        assert decoder(encoded) == {"price": 5.25, "zone": str(UUID(int=1)), "tiers": [1, 2]}
+        assert set(conn.codecs) == {"json", "jsonb"}
+
+    @pytest.mark.asyncio
+    async def test_numeric_as_float_uses_float_pool(self, monkeypatch):
+        """Only opted-in queries go to the pool that decodes numeric as float."""
+        conn = RecordingConnection()
+        await db_module._init_float_connection(conn)
+        assert conn.codecs["numeric"][1]("12.50") == 12.5
+
+        database = Database()
+        database._pool = FakePool("default")
+
+        async def float_pool():
+            database._float_pool = FakePool("float")
+            return database._float_pool
+
+        monkeypatch.setattr(database, "_get_float_pool", float_pool)
+
+        assert await database.fetchrow("SELECT 1") == {"pool": "default"}
+        assert await database.fetchrow("SELECT 1", numeric_as_float=True) == {"pool": "float"}
+
+
+class FakeRecord(dict):
+    """Iterates over values like asyncpg.Record"""
+
+    def __iter__(self):
+        return iter(self.values())
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetch_sizes = []
+
+    async def fetch(self, n):
+        self.fetch_sizes.append(n)
+        batch, self.rows = self.rows[:n], self.rows[n:]
+        return batch
+
+
+class CursorConnection:
+    def __init__(self, rows):
+        self.cursor_obj = FakeCursor(rows)
+        self.in_transaction = False
+
+    @asynccontextmanager
+    async def _transaction(self):
+        self.in_transaction = True
+        yield
+        self.in_transaction = False
+
+    def transaction(self):
+        return self._transaction()
+
+    async def cursor(self, query, *args):
+        assert self.in_transaction
+        return self.cursor_obj
+
+
+class TestDatabaseStream:
+    """Test the server-side cursor iterator."""
+
+    def _database(self, rows):
+        conn = CursorConnection(rows)
+
+        class Pool:
+            @asynccontextmanager
+            async def acquire(self):
+                yield conn
+
+        database = Database()
+        database._pool = Pool()
+        return database, conn
+
+    @pytest.mark.asyncio
+    async def test_yields_bounded_batches(self):
+        """Rows arrive in batches of at most batch_size from a cursor inside a transaction."""
+        rows = [FakeRecord(id=i, amount=i * 1.5) for i in range(7)]
+        database, conn = self._database(rows)
+
+        batches = [batch async for batch in database.stream("SELECT * FROM historical_transactions", batch_size=3)]
+
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert conn.cursor_obj.fetch_sizes == [3, 3, 3]
+        assert not conn.in_transaction
+
+    @pytest.mark.asyncio
+    async def test_columnar_batches(self):
+        """columnar=True turns each batch into column arrays."""
+        rows = [FakeRecord(id=i, zone="110") for i in range(3)]
+        database, _ = self._database(rows)
+
+        batches = [batch async for batch in database.stream("SELECT id, zone FROM t", batch_size=5, columnar=True)]
+
+        assert batches == [{"id": [0, 1, 2], "zone": ["110", "110", "110"]}]
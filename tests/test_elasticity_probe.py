@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+from services.analyst.analyst.core.elasticity_probe import (
+    ARM_WINDOWS_QUERY,
+    bootstrap_lift_intervals,
+    evaluate_probes,
+)
+
+
+class TestElasticityProbeEvaluation:
+    """Test vectorized bootstrap evaluation of probe arms."""
+
+    def test_bootstrap_lift_intervals(self):
+        """CIs bracket the point lift; arms without data come back as NaN."""
+        rng = np.random.default_rng(7)
+        control = rng.normal(10.0, 1.0, 60)
+        treated = rng.normal(11.0, 1.0, 45)
+
+        lift, low, high = bootstrap_lift_intervals(
+            [control, treated, np.array([])], [0, 0, 0], n_boot=500, rng=np.random.default_rng(1)
+        )
+
+        assert lift[0] == pytest.approx(0.0)
+        assert low[1] < lift[1] < high[1]
+        assert low[1] > 0
+        assert np.isnan(lift[2]) and np.isnan(low[2])
+
+    @pytest.mark.asyncio
+    async def test_evaluate_probes_single_query_and_upsert(self, mock_db):
+        """All arms of all experiments are read in one query and written in one statement."""
+        created = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        ends = datetime(2024, 5, 15, tzinfo=timezone.utc)
+        experiments = [uuid4(), uuid4()]
+
+        def arm(experiment_id, delta, control, rev):
+            return {
+                "arm_id": uuid4(), "experiment_id": experiment_id, "delta": delta, "control": control,
+                "window_start": created, "window_end": ends, "rev": rev, "occupancy": [0.5] * len(rev),
+            }
+
+        mock_db.fetch.return_value = [
+            arm(experiments[0], 0.0, True, [10.0, 10.5, 9.5, 10.0]),
+            arm(experiments[0], 0.05, False, [11.0, 11.5, 10.5, 11.0]),
+            arm(experiments[1], 0.0, True, [8.0, 8.0]),
+            arm(experiments[1], -0.05, False, []),
+        ]
+
+        results = await evaluate_probes(mock_db, [str(e) for e in experiments])
+
+        assert mock_db.fetch.call_count == 1
+        assert mock_db.execute.call_count == 1
+
+        first = results[str(experiments[0])]
+        assert first[1]["lift_rev_psh"] == pytest.approx(0.1)
+        assert first[1]["samples"] == 4
+        assert results[str(experiments[1])][1]["lift_rev_psh"] is None
+
+        upsert_args = mock_db.execute.call_args[0]
+        assert len(upsert_args[2]) == 4
+        assert upsert_args[11] == [4, 4, 2, 0]
+
+        assert upsert_args[4][0] == ends.date()
+
+    @pytest.mark.asyncio
+    async def test_unapplied_treatment_arms_report_no_lift(self, mock_db):
+        """Only an arm with an applied price change is measured; others persist no lift."""
+        # treatment samples come only from the applied change's live window
+        assert "ELSE h.ts >= arms.applied_start AND h.ts < arms.applied_end" in ARM_WINDOWS_QUERY
+
+        start = datetime(2024, 5, 6, tzinfo=timezone.utc)
+        experiment_id = uuid4()
+        mock_db.fetch.return_value = [
+            {"arm_id": uuid4(), "experiment_id": experiment_id, "delta": delta, "control": delta == 0.0,
+             "window_start": start, "window_end": start, "rev": rev, "occupancy": [0.5] * len(rev)}
+            for delta, rev in ((0.0, [10.0, 10.0, 10.0]), (-0.05, []), (0.05, [10.5, 11.0, 11.5]))
+        ]
+
+        results = (await evaluate_probes(mock_db, [str(experiment_id)]))[str(experiment_id)]
+
+        treated = {arm["delta"]: arm for arm in results if not arm["control"]}
+        assert treated[0.05]["samples"] == 3
+        assert treated[0.05]["lift_rev_psh"] == pytest.approx(0.1)
+        assert treated[-0.05]["samples"] == 0
+        assert treated[-0.05]["lift_rev_psh"] is None
+        assert treated[-0.05]["lift_rev_psh_ci"] == [None, None]
+
+        upsert_args = mock_db.execute.call_args[0]
+        assert upsert_args[7][1] is None and upsert_args[11][1] == 0
+
+
+class TestProbeRunner:
+    """Test bulk probe scheduling and the concurrent evaluation runner."""
+
+    @pytest.mark.asyncio
+    async def test_schedule_inserts_experiments_and_arms_in_bulk(self, mock_db, mock_user_context):
+        """Every zone/daypart/dow target is written with one statement per table."""
+        from services.analyst.analyst.core.probe_runner import ProbeRunner
+        from services.analyst.analyst.deps.auth import UserContext
+
+        ctx = UserContext(**{**mock_user_context, "sub": "dev-user"})
+        scheduled = await ProbeRunner(mock_db).schedule(
+            ctx, ["z-110", "z-221"], ["morning", "evening"], [1, 5], deltas=[-0.05, 0.05]
+        )
+
+        assert len(scheduled) == 8
+        assert mock_db.connection.execute.call_count == 2
+        experiment_args, arm_args = [call[0] for call in mock_db.connection.execute.call_args_list]
+        assert len(experiment_args[1]) == 8
+        assert len(arm_args[1]) == 8 * 3
+
+    @pytest.mark.asyncio
+    async def test_run_once_completes_only_evaluated_experiments(self, mock_db, monkeypatch):
+        """Failed chunks stay active so the next run retries them."""
+        from services.analyst.analyst.core import probe_runner
+
+        ok, broken = uuid4(), uuid4()
+        mock_db.execute.return_value = "UPDATE 2"
+        mock_db.fetch.return_value = [{"id": ok}, {"id": broken}]
+
+        async def _evaluate(db, experiment_ids):
+            if str(broken) in experiment_ids:
+                raise RuntimeError("mart unavailable")
+            return {}
+
+        monkeypatch.setattr(probe_runner, "evaluate_probes", _evaluate)
+
+        result = await probe_runner.ProbeRunner(mock_db, max_workers=2, chunk_size=1).run_once()
+
+        assert result["started"] == 2
+        assert result["completed"] == 1
+        assert result["failed"] == [str(broken)]
+        assert mock_db.execute.call_args[0][1] == [ok]
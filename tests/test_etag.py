@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import Request
+
+from services.analyst.analyst.utils import etag as etag_module
+from services.analyst.analyst.utils.etag import list_etag, matches
+
+
+def _request(query=b"", headers=()):
+    return Request({"type": "http", "method": "GET", "path": "/insights/", "query_string": query,
+                    "headers": list(headers)})
+
+
+class TestEtag:
+    """Test generation-keyed ETags for list endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_etag_follows_generation_zones_and_query(self, mock_db):
+        mock_db.fetchval.return_value = 41
+        base = await list_etag(mock_db, ("insights",), ["z-110", "z-221"], _request(b"limit=50&kind=x"))
+
+        # zone and parameter order do not matter
+        assert base == await list_etag(mock_db, ("insights",), ["z-221", "z-110"], _request(b"kind=x&limit=50"))
+        assert base != await list_etag(mock_db, ("insights",), ["z-110"], _request(b"limit=50&kind=x"))
+        assert base != await list_etag(mock_db, ("insights",), ["z-110", "z-221"], _request(b"limit=10&kind=x"))
+
+        mock_db.fetchval.return_value = 42
+        assert base != await list_etag(mock_db, ("insights",), ["z-110", "z-221"], _request(b"limit=50&kind=x"))
+
+        query, sources, zones = mock_db.fetchval.call_args.args
+        assert "zone_data_generations" in query
+        assert sources == ["insights"] and zones == ["z-110", "z-221"]
+
+    @pytest.mark.asyncio
+    async def test_no_etag_without_generations(self, mock_db, monkeypatch):
+        mock_db.fetchval = AsyncMock(side_effect=RuntimeError('relation "zone_data_generations" does not exist'))
+        assert await list_etag(mock_db, ("insights",), ["z-110"], _request()) is None
+
+        monkeypatch.setattr(etag_module.settings, "conditional_get_enabled", False)
+        mock_db.fetchval = AsyncMock(return_value=1)
+        assert await list_etag(mock_db, ("insights",), ["z-110"], _request()) is None
+        mock_db.fetchval.assert_not_awaited()
+
+    def test_if_none_match(self):
+        etag = '"abc"'
+        assert matches(_request(headers=[(b"if-none-match", b'"zzz", "abc"')]), etag)
+        assert matches(_request(headers=[(b"if-none-match", b'W/"abc"')]), etag)
+        assert matches(_request(headers=[(b"if-none-match", b"*")]), etag)
+        assert not matches(_request(headers=[(b"if-none-match", b'"zzz"')]), etag)
+        assert not matches(_request(), etag)
+        assert not matches(_request(headers=[(b"if-none-match", b"*")]), None)
@@ -0,0 +1,137 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+
+from services.analyst.analyst import events
+from services.analyst.analyst.core import daily_refresh
+from services.analyst.analyst.events import Event, EventBus, NotificationListener, Subscription
+from services.analyst.analyst.routes import events as events_route
+
+
+def _bus(pool=None):
+    database = MagicMock()
+    database._pool = pool
+    database.execute = AsyncMock()
+    return EventBus(database, NotificationListener()), database
+
+
+class TestEvents:
+    """Test the refresh event bus and its SSE stream."""
+
+    def test_subscription_sees_only_its_zones(self):
+        subscription = Subscription(["z-110"], max_queue=2)
+
+        subscription.deliver(Event("1", "refresh.started", ("z-110", "z-221")))
+        subscription.deliver(Event("2", "insight.created", ("z-221",)))
+
+        event = subscription.queue.get_nowait()
+        assert event.zone_ids == ("z-110",)
+        assert subscription.queue.empty()
+
+    def test_full_subscription_drops_oldest(self):
+        subscription = Subscription(["z-110"], max_queue=2)
+        for number in range(3):
+            subscription.deliver(Event(str(number), "refresh.progress", ("z-110",)))
+
+        assert subscription.dropped == 1
+        assert [subscription.queue.get_nowait().id for _ in range(2)] == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_publish_fans_out_and_notifies_other_workers(self):
+        bus, database = _bus(pool=object())
+
+        with bus.subscribe(["z-110"]) as subscription:
+            event = await bus.publish("insight.created", ["z-110"], {"kind": "performance"})
+            assert await subscription.get(timeout=0.1) == event
+
+        channel, payload = database.execute.call_args.args[1:]
+        assert channel == events.EVENTS_CHANNEL
+        message = orjson.loads(payload)
+        assert message["origin"] == bus.origin and message["data"] == {"kind": "performance"}
+
+        # oversized payloads are sent without data rather than rejected by Postgres
+        await bus.publish("insight.created", ["z-110"], {"narrative_text": "x" * 9000})
+        assert orjson.loads(database.execute.call_args.args[2])["data"] == {"truncated": True}
+
+    @pytest.mark.asyncio
+    async def test_notifications_from_other_workers_are_delivered(self):
+        bus, database = _bus()
+        other, _ = _bus()
+
+        with bus.subscribe(["z-110"]) as subscription:
+            foreign = {"origin": other.origin, "id": "x-1", "type": "refresh.completed",
+                       "zone_ids": ["z-110"], "data": {"outcome": "refreshed"}}
+            bus._on_notification(orjson.dumps({**foreign, "origin": bus.origin}).decode())
+            bus._on_notification(orjson.dumps(foreign).decode())
+
+            assert (await subscription.get(timeout=0.1)).id == "x-1"
+            assert subscription.queue.empty()
+        database.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_refresh_events_carry_the_run_id(self, monkeypatch):
+        bus, _ = _bus()
+        monkeypatch.setattr(daily_refresh, "event_bus", bus)
+
+        with bus.subscribe(["z-110"]) as subscription:
+            monkeypatch.setattr(daily_refresh, "_run_daily_refresh", AsyncMock(return_value="refreshed"))
+            await daily_refresh.ensure_daily_refresh(MagicMock(), ["z-110"], force_refresh=True, run_id="run-1")
+
+            event = subscription.queue.get_nowait()
+            assert event.type == "refresh.completed"
+            assert event.data == {"outcome": "refreshed", "run_id": "run-1"}
+
+    @pytest.mark.asyncio
+    async def test_no_events_when_nothing_ran(self, monkeypatch):
+        bus, database = _bus(pool=object())
+        monkeypatch.setattr(daily_refresh, "event_bus", bus)
+
+        with bus.subscribe(["z-110"]) as subscription:
+            for outcome in ("current", "current_after_lock"):
+                monkeypatch.setattr(daily_refresh, "_run_daily_refresh", AsyncMock(return_value=outcome))
+                await daily_refresh.ensure_daily_refresh(MagicMock(), ["z-110"], force_refresh=False)
+
+            assert subscription.queue.empty()
+        database.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failure_is_published_only_for_forced_or_started_runs(self, monkeypatch):
+        bus, _ = _bus()
+        monkeypatch.setattr(daily_refresh, "event_bus", bus)
+        monkeypatch.setattr(daily_refresh, "_stale_data", AsyncMock(return_value=(True, True)))
+        db = MagicMock()
+        db.transaction.side_effect = RuntimeError("boom")
+
+        with bus.subscribe(["z-110"]) as subscription:
+            # a GET whose lock wait fails never started a refresh
+            with pytest.raises(RuntimeError):
+                await daily_refresh.ensure_daily_refresh(db, ["z-110"], force_refresh=False)
+            assert subscription.queue.empty()
+
+            with pytest.raises(RuntimeError):
+                await daily_refresh.ensure_daily_refresh(db, ["z-110"], force_refresh=True, run_id="run-2")
+
+            event = subscription.queue.get_nowait()
+            assert event.type == "refresh.failed"
+            assert event.data == {"error": "boom", "run_id": "run-2"}
+
+    @pytest.mark.asyncio
+    async def test_stream_starts_refresh_and_formats_events(self, monkeypatch):
+        async def fake_refresh(db, zone_ids, force_refresh, run_id=None):
+            await events.event_bus.publish("refresh.progress", ["z-110"], {"stage": "insights", "done": 1, "total": 1})
+
+        monkeypatch.setattr(events_route, "ensure_daily_refresh", fake_refresh)
+        subscribed = asyncio.Event()
+        events_route.start_refresh(MagicMock(), ["z-110"], subscribed=subscribed)
+        stream = events_route._event_stream(["z-110"], subscribed)
+
+        assert await stream.__anext__() == b"retry: 5000\n\n"
+        chunk = await asyncio.wait_for(stream.__anext__(), timeout=1)
+        await stream.aclose()
+
+        header, data = chunk.decode().strip().rsplit("\n", 1)
+        assert "event: refresh.progress" in header
+        assert orjson.loads(data[len("data: "):]) == {"zone_ids": ["z-110"], "stage": "insights", "done": 1, "total": 1}
+        assert events.event_bus._subscriptions == set()
@@ -0,0 +1,83 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from fastapi import Request, Response
+
+from services.analyst.analyst.deps.auth import UserContext
+from services.analyst.analyst.models.insights import InsightListResponse, InsightResponse
+from services.analyst.analyst.routes import recommendations
+from services.analyst.analyst.utils.fast_json import encode_object, encode_rows
+
+
+def _insight_row(metrics_json):
+    return {
+        "id": uuid4(),
+        "location_id": None,
+        "zone_id": "z-110",
+        "kind": "performance",
+        "window": "7d",
+        "metrics_json": metrics_json,
+        "narrative_text": "Occupancy is up",
+        "confidence": Decimal("0.85"),
+        "created_at": datetime(2024, 6, 1, 12, 30, tzinfo=timezone.utc),
+        "created_by": None,
+    }
+
+
+class TestFastJson:
+    """Test the orjson list encoding against the validated model path."""
+
+    def test_matches_pydantic_serialization(self):
+        """Rows encode to the same JSON the response models produce, jsonb included."""
+        rows = [_insight_row('{"occupancy": 0.82, "zones": ["z-110"]}'), _insight_row(None)]
+
+        fast = encode_object({"total": 2, "offset": 0, "limit": 50},
+                             {"insights": encode_rows(rows, raw_columns=("metrics_json",))})
+
+        validated = InsightListResponse(
+            insights=[InsightResponse(**{**row, "metrics_json": json.loads(row["metrics_json"]) if row["metrics_json"] else None})
+                      for row in rows],
+            total=2, offset=0, limit=50,
+        )
+        assert json.loads(fast) == json.loads(validated.model_dump_json())
+
+    def test_raw_columns_are_not_reencoded(self):
+        """jsonb text is spliced in verbatim."""
+        encoded = encode_rows([{"id": 1, "proposal": '{"b": 1, "a": [1.50]}'}], raw_columns=("proposal",))
+
+        assert encoded == b'[{"id":1,"proposal":{"b": 1, "a": [1.50]}}]'
+
+    @pytest.mark.asyncio
+    async def test_list_recommendations_fast_response(self, mock_db, monkeypatch):
+        """The route returns the raw rows with proposal and lift passed through."""
+        async def no_refresh(*args, **kwargs):
+            return None
+
+        monkeypatch.setattr(recommendations, "ensure_daily_refresh", no_refresh)
+        user = UserContext(sub="u", org_id="org", roles=["viewer"], zone_ids=["z-110"], iss="test", exp=0)
+        row = {
+            "id": uuid4(), "location_id": None, "zone_id": "z-110", "type": "price_change",
+            "proposal": '{"changes": []}', "rationale_text": "Raise evening rate",
+            "expected_lift_json": '{"revenue_lift_pct": 0.08}', "confidence": Decimal("0.7"),
+            "requires_approval": True, "memory_ids_used": [], "prompt_version_id": None,
+            "thread_id": None, "status": "draft", "created_at": datetime(2024, 6, 1, tzinfo=timezone.utc),
+        }
+        mock_db.fetch.return_value = [row]
+        mock_db.fetchval.return_value = 1
+
+        request = Request({"type": "http", "method": "GET", "path": "/recommendations/",
+                           "query_string": b"", "headers": []})
+        response = await recommendations.list_recommendations(
+            request=request, response=Response(), zone_id=None, location_id=None, status=None, offset=0, limit=50, refresh=False,
+            user=user, db=mock_db,
+        )
+
+        body = json.loads(response.body)
+        assert body["total"] == 1
+        assert body["recommendations"][0]["proposal"] == {"changes": []}
+        assert body["recommendations"][0]["expected_lift_json"] == {"revenue_lift_pct": 0.08}
+        assert body["recommendations"][0]["confidence"] == 0.7
+        assert body["recommendations"][0]["created_at"] == "2024-06-01T00:00:00Z"
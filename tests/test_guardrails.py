@@ -214,6 +214,96 @@ class TestGuardrails:
         assert result.is_valid  # Should be valid
         assert "Low confidence recommendation (40.0%)" in str(result.warnings)
 
+    @pytest.mark.asyncio
+    async def test_consistency_error_is_isolated_in_a_savepoint(self, mock_db, mock_guardrails_data):
+        """A failed consistency query on the caller's transaction is rolled back to a savepoint."""
+        mock_db.fetch.return_value = mock_guardrails_data
+        conn = mock_db.connection
+        conn.fetch.side_effect = RuntimeError("canceling statement due to statement timeout")
+
+        guardrails = PolicyGuardrails(mock_db)
+        change = PriceChangeCreate(zone_id="z-110", prev_price=5.00, new_price=5.50, change_pct=0.10)
+
+        with patch('services.analyst.analyst.core.policy_guardrails.datetime') as mock_datetime:
+            from datetime import datetime
+            mock_datetime.now.return_value = datetime(2024, 1, 17, 10, 0, 0)
+            [result] = await guardrails.validate_batch([change], conn)
+            single = await guardrails.validate_price_change(change, conn)
+
+        assert result.is_valid and single.is_valid
+        assert conn.transaction.call_count == 2
+        assert conn.transaction.return_value.__aexit__.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_validate_batch_single_consistency_query(self, mock_db, mock_guardrails_data):
+        """Batch validation loads rules once and checks consistency for all zones in one query."""
+        recent_changes = [
+            {"zone_id": "z-110", "new_price": 5.00},
+            {"zone_id": "z-110", "new_price": 5.10},
+            {"zone_id": "z-221", "new_price": 3.00},
+        ]
+        mock_db.fetch.side_effect = [mock_guardrails_data, recent_changes]
+
+        guardrails = PolicyGuardrails(mock_db)
+
+        changes = [
+            PriceChangeCreate(zone_id="z-110", prev_price=5.00, new_price=5.50, change_pct=0.10),
+            PriceChangeCreate(zone_id="z-221", prev_price=3.00, new_price=1.50, change_pct=-0.50),
+            PriceChangeCreate(zone_id="z-221", prev_price=3.00, new_price=4.20, change_pct=0.40),
+        ]
+
+        with patch('services.analyst.analyst.core.policy_guardrails.datetime') as mock_datetime:
+            from datetime import datetime
+            mock_datetime.now.return_value = datetime(2024, 1, 17, 10, 0, 0)  # Wednesday morning
+            results = await guardrails.validate_batch(changes)
+
+        assert [r.is_valid for r in results] == [True, False, False]
+        assert "below minimum" in results[1].reason
+        assert any("differs" in w for w in results[2].warnings)
+        assert mock_db.fetch.call_count == 2
+        assert mock_db.fetch.call_args[0][1] == ["z-110", "z-221"]
+
+    @pytest.mark.asyncio
+    async def test_validate_batch_checks_each_change_against_earlier_ones(self, mock_db, mock_guardrails_data):
+        """Accepted changes in a batch count as recent prices for later changes in the zone."""
+        mock_db.fetch.side_effect = [mock_guardrails_data, [{"zone_id": "z-110", "new_price": 5.00}]]
+
+        guardrails = PolicyGuardrails(mock_db)
+
+        changes = [
+            PriceChangeCreate(zone_id="z-110", prev_price=5.00, new_price=6.40, change_pct=0.10),
+            PriceChangeCreate(zone_id="z-110", prev_price=5.00, new_price=3.90, change_pct=-0.10),
+        ]
+
+        with patch('services.analyst.analyst.core.policy_guardrails.datetime') as mock_datetime:
+            from datetime import datetime
+            mock_datetime.now.return_value = datetime(2024, 1, 17, 10, 0, 0)
+            first, second = await guardrails.validate_batch(changes)
+
+        assert first.is_valid and not any("differs" in w for w in first.warnings)
+        # 3.90 is within 30% of 5.00, but not of the 5.70 average once 6.40 is applied
+        assert any("differs" in w and "$5.70" in w for w in second.warnings)
+
+    @pytest.mark.asyncio
+    async def test_compiled_rules_cached_until_invalidated(self, mock_db, mock_guardrails_data):
+        """Guardrail rows are fetched once per version, not once per validation."""
+        from services.analyst.analyst.core.policy_guardrails import invalidate_guardrails
+
+        mock_db.fetch.side_effect = [mock_guardrails_data, mock_guardrails_data]
+
+        guardrails = PolicyGuardrails(mock_db)
+        first = await guardrails.get_compiled_rules()
+        second = await PolicyGuardrails(mock_db).get_compiled_rules()
+
+        assert first is second
+        assert mock_db.fetch.call_count == 1
+
+        invalidate_guardrails()
+        third = await guardrails.get_compiled_rules()
+
+        assert third.version > first.version
+        assert mock_db.fetch.call_count == 2
+
     def test_guardrail_violation_model(self):
         """Test GuardrailViolation model."""
         violation = GuardrailViolation(
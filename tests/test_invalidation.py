@@ -0,0 +1,79 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+import pytest
+
+from services.analyst.analyst.core.policy_guardrails import invalidate_guardrails
+from services.analyst.analyst.core.prompt_assembler import prompt_template_cache
+from services.analyst.analyst.events import NotificationListener
+from services.analyst.analyst.invalidation import (
+    GUARDRAILS,
+    INVALIDATION_CHANNEL,
+    PROMPT_TEMPLATES,
+    InvalidationBus,
+    invalidation_bus,
+)
+
+
+def _bus(pool=None):
+    database = MagicMock()
+    database._pool = pool
+    database.execute = AsyncMock()
+    listener = NotificationListener()
+    return InvalidationBus(database, listener), database, listener
+
+
+class TestInvalidation:
+    """Test the cross-worker cache invalidation bus."""
+
+    def test_shared_caches_are_registered(self):
+        assert prompt_template_cache.invalidate in invalidation_bus._handlers[PROMPT_TEMPLATES]
+        assert invalidate_guardrails in invalidation_bus._handlers[GUARDRAILS]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_runs_locally_and_notifies(self):
+        bus, database, _ = _bus(pool=object())
+        calls = []
+        bus.register("prompt_templates", lambda: calls.append("prompt_templates"))
+
+        await bus.invalidate("prompt_templates")
+
+        assert calls == ["prompt_templates"]
+        channel, payload = database.execute.call_args.args[1:]
+        assert channel == INVALIDATION_CHANNEL
+        assert orjson.loads(payload) == {"origin": bus.origin, "names": ["prompt_templates"]}
+
+    def test_notifications_invalidate_other_workers(self):
+        bus, _, listener = _bus()
+        calls = []
+        bus.register("guardrails", lambda: calls.append("guardrails"))
+
+        # own notification was already applied locally
+        listener._dispatch(None, 1, INVALIDATION_CHANNEL, orjson.dumps({"origin": bus.origin, "names": ["guardrails"]}).decode())
+        assert calls == []
+
+        # other workers, and database triggers which send no origin
+        listener._dispatch(None, 1, INVALIDATION_CHANNEL, orjson.dumps({"origin": "other", "names": ["guardrails"]}).decode())
+        listener._dispatch(None, 1, INVALIDATION_CHANNEL, '{"names" : ["guardrails"]}')
+        assert calls == ["guardrails", "guardrails"]
+
+    def test_reconnect_invalidates_everything(self):
+        bus, _, listener = _bus()
+        calls = []
+        bus.register("prompt_templates", lambda: calls.append("prompt_templates"))
+        bus.register("memories", lambda: calls.append("memories"))
+
+        for handler in listener._connect_handlers:
+            handler()
+
+        assert sorted(calls) == ["memories", "prompt_templates"]
+
+    def test_failing_handler_does_not_stop_others(self):
+        bus, _, _ = _bus()
+        calls = []
+        bus.register("memories", lambda: 1 / 0)
+        bus.register("memories", lambda: calls.append("memories"))
+
+        bus.invalidate_local("memories")
+
+        assert calls == ["memories"]
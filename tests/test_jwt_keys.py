@@ -0,0 +1,182 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwk, jwt
+
+from services.analyst.analyst.config import settings
+from services.analyst.analyst.deps import auth
+from services.analyst.analyst.deps.jwt_keys import SigningKeys, VerifiedTokenCache
+
+
+def _rsa_key():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+
+PRIVATE_PEM, PUBLIC_PEM = _rsa_key()
+
+
+def _token(kid="key-1", exp=None, private_pem=PRIVATE_PEM):
+    claims = {
+        "sub": "test-user",
+        "org_id": "org-test",
+        "roles": ["viewer"],
+        "zone_ids": ["z-110"],
+        "iss": settings.jwt_issuer,
+        "exp": exp or int(time.time()) + 600,
+    }
+    return jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+def _jwks_client(*key_sets):
+    """httpx client stub returning one JWKS document per call"""
+    responses = []
+    for keys in key_sets:
+        response = MagicMock()
+        response.json.return_value = {
+            "keys": [{**jwk.construct(pem, "RS256").to_dict(), "kid": kid, "use": "sig"} for kid, pem in keys.items()]
+        }
+        responses.append(response)
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=responses)
+    return client
+
+
+def _credentials(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture(autouse=True)
+def fresh_token_cache():
+    auth.verified_tokens.clear()
+    yield
+    auth.verified_tokens.clear()
+
+
+class TestVerifiedTokenCache:
+    """Test the verified-token LRU."""
+
+    def test_entries_expire_at_exp(self):
+        cache = VerifiedTokenCache(10)
+        cache.put("live", "user", time.time() + 60)
+        cache.put("stale", "user", time.time() - 1)
+        cache.put("no-exp", "user", 0)
+
+        assert cache.get("live") == "user"
+        assert cache.get("stale") is None
+        assert cache.get("no-exp") is None
+
+    def test_least_recently_used_is_evicted(self):
+        cache = VerifiedTokenCache(2)
+        expires = time.time() + 60
+        cache.put("a", 1, expires)
+        cache.put("b", 2, expires)
+        cache.get("a")
+        cache.put("c", 3, expires)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+class TestSigningKeys:
+    """Test RS256 key lookup by kid."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_triggers_refresh(self):
+        _, rotated_pem = _rsa_key()
+        client = _jwks_client({"key-1": PUBLIC_PEM}, {"key-1": PUBLIC_PEM, "key-2": rotated_pem})
+        keys = SigningKeys(jwks_url="https://idp.test/jwks.json", client=client)
+
+        assert await keys.get("key-1") is not None
+        keys._attempted_at -= 60
+        assert await keys.get("key-2") is not None
+        assert client.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refresh_is_rate_limited(self):
+        client = _jwks_client({"key-1": PUBLIC_PEM}, {"key-1": PUBLIC_PEM})
+        keys = SigningKeys(jwks_url="https://idp.test/jwks.json", client=client)
+        await keys.refresh()
+
+        with pytest.raises(Exception, match="Unknown signing key"):
+            await keys.get("forged")
+        assert client.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_is_rate_limited(self):
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=httpx.ConnectError("JWKS endpoint down"))
+        keys = SigningKeys(jwks_url="https://idp.test/jwks.json", client=client)
+
+        for kid in ("forged-1", "forged-2", "forged-3"):
+            with pytest.raises(Exception, match="Unknown signing key"):
+                await keys.get(kid)
+        assert client.get.await_count == 1
+
+        keys._attempted_at -= 60
+        with pytest.raises(Exception, match="Unknown signing key"):
+            await keys.get("forged-4")
+        assert client.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_retired_key_clears_listeners(self):
+        client = _jwks_client({"key-1": PUBLIC_PEM, "key-2": PUBLIC_PEM}, {"key-2": PUBLIC_PEM})
+        keys = SigningKeys(jwks_url="https://idp.test/jwks.json", client=client)
+        cleared = []
+        keys.on_keys_removed(lambda: cleared.append(True))
+
+        await keys.refresh()
+        keys._attempted_at -= 60
+        await keys.refresh()
+
+        assert cleared == [True]
+
+
+class TestRS256Auth:
+    """Test get_current_user against RS256 tokens."""
+
+    @pytest.mark.asyncio
+    async def test_rs256_token_is_verified_once(self):
+        keys = SigningKeys(jwks_url="https://idp.test/jwks.json", client=_jwks_client({"key-1": PUBLIC_PEM}))
+        token = _token()
+
+        with patch.object(auth, "signing_keys", keys), patch.object(auth.jwt, "decode", wraps=jwt.decode) as decode:
+            first = await auth.get_current_user(_credentials(token))
+            second = await auth.get_current_user(_credentials(token))
+
+        assert first.sub == "test-user" and first.zone_ids == ["z-110"]
+        assert second is first
+        assert decode.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_static_public_key(self):
+        keys = SigningKeys(public_key_pem=PUBLIC_PEM)
+
+        with patch.object(auth, "signing_keys", keys):
+            user = await auth.get_current_user(_credentials(_token(kid="anything")))
+
+        assert user.sub == "test-user"
+
+    @pytest.mark.asyncio
+    async def test_wrong_signature_is_rejected(self):
+        other_private, _ = _rsa_key()
+        keys = SigningKeys(public_key_pem=PUBLIC_PEM)
+
+        with patch.object(auth, "signing_keys", keys), pytest.raises(HTTPException) as exc_info:
+            await auth.get_current_user(_credentials(_token(private_pem=other_private)))
+
+        assert exc_info.value.status_code == 401
+        assert len(auth.verified_tokens) == 0
@@ -77,6 +77,22 @@ class TestMemoryDistiller:
         call_args = mock_db.fetch.call_args
         assert "z-110" in call_args[0][1]
         assert "pricing optimization" in call_args[0][2]
+        assert "search_tsv @@" in call_args[0][0]
+        assert "ILIKE" not in call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_get_relevant_memories_blank_query_skips_text_search(self, mock_db):
+        """A blank query returns the latest scoped memories without a tsquery."""
+        mock_db.fetch.return_value = []
+
+        distiller = MemoryDistiller(mock_db)
+        await distiller.get_relevant_memories("z-110", "   ", limit=5)
+
+        query, zone_id, limit = mock_db.fetch.call_args[0]
+        assert "search_tsv" not in query
+        assert "m.zone_id = $1" in query
+        assert zone_id == "z-110"
+        assert limit == 5
 
     @pytest.mark.asyncio
     async def test_distill_thread_to_memory_with_llm(self, mock_db, sample_thread_messages, sample_thread_info):
@@ -210,6 +226,25 @@ class TestMemoryDistiller:
         # Verify database call
         mock_db.fetchrow.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_store_memory_writes_text_zone_id(self, mock_db):
+        """Zone scope_refs that are not UUIDs land in the indexed zone_id column."""
+        mock_db.fetchrow.return_value = {"id": 2, "zone_id": "z-110"}
+
+        distiller = MemoryDistiller(mock_db)
+        memory_data = {
+            "scope": "zone",
+            "scope_ref": "z-110",
+            "kind": "context",
+            "content": "Event nights spike demand"
+        }
+
+        await distiller._store_memory(memory_data, 123, None)
+
+        args = mock_db.fetchrow.call_args[0]
+        assert args[2] is None  # scope_ref stays a UUID column
+        assert args[3] == "z-110"
+
     @pytest.mark.asyncio
     async def test_distill_thread_no_messages(self, mock_db):
         """Test distilling thread with no messages."""
@@ -0,0 +1,33 @@
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from services.analyst.analyst.observability import REGISTRY, RequestMetricsMiddleware
+
+
+class TestRequestMetrics:
+    """Test the pure ASGI request metrics middleware."""
+
+    @pytest.mark.asyncio
+    async def test_labels_by_route_template(self):
+        """Requests for different ids share one series keyed by the route template."""
+        async def insight(request):
+            return JSONResponse({"id": request.path_params["insight_id"]})
+
+        app = Starlette(routes=[Route("/insights/{insight_id}", insight)])
+        app.add_middleware(RequestMetricsMiddleware)
+        labels = {"method": "GET", "endpoint": "/insights/{insight_id}"}
+        before = REGISTRY.get_sample_value("level_analyst_requests_total", {**labels, "status": "200"}) or 0
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            for insight_id in ("a1", "b2", "c3"):
+                await client.get(f"/insights/{insight_id}")
+            await client.get("/unknown/path")
+
+        assert REGISTRY.get_sample_value("level_analyst_requests_total", {**labels, "status": "200"}) == before + 3
+        assert REGISTRY.get_sample_value("level_analyst_requests_total", {"method": "GET", "endpoint": "/insights/a1", "status": "200"}) is None
+        assert REGISTRY.get_sample_value("level_analyst_requests_total", {"method": "GET", "endpoint": "<unmatched>", "status": "404"}) >= 1
+        assert REGISTRY.get_sample_value("level_analyst_response_size_bytes_sum", labels) > 0
+        assert REGISTRY.get_sample_value("level_analyst_requests_in_progress", {"method": "GET"}) == 0
@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from services.analyst.analyst import profiling
+from services.analyst.analyst.profiling import ProfileStore, ProfilingMiddleware
+
+
+class TestProfiling:
+    """Test the on-demand profiling middleware and its bounded store."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return ProfileStore(str(tmp_path), max_files=3, max_bytes=10_000_000)
+
+    def _client(self, store, monkeypatch, **overrides):
+        for name, value in {"profiling_sample_rate": 0.0, "profiling_slow_ms": None,
+                            "profiling_token": None, **overrides}.items():
+            monkeypatch.setattr(profiling.settings, name, value)
+
+        async def fast(request):
+            return JSONResponse({"ok": True})
+
+        async def slow(request):
+            await asyncio.sleep(0.05)
+            return JSONResponse({"ok": True})
+
+        app = Starlette(routes=[Route("/fast", fast), Route("/slow", slow)])
+        app.add_middleware(ProfilingMiddleware, store=store)
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    @pytest.mark.asyncio
+    async def test_header_triggers_profile(self, store, monkeypatch):
+        """A request with the trigger header is profiled and its id returned."""
+        async with self._client(store, monkeypatch) as client:
+            plain = await client.get("/fast")
+            profiled = await client.get("/fast", headers={"X-Analyst-Profile": "1"})
+
+        assert "x-profile-id" not in plain.headers
+        profile_id = profiled.headers["x-profile-id"]
+        assert [meta["id"] for meta in store.list()] == [profile_id]
+        assert store.list()[0]["reason"] == "header"
+        assert "<html" in store.path_for(profile_id).read_text().lower()
+
+    @pytest.mark.asyncio
+    async def test_header_requires_token_when_configured(self, store, monkeypatch):
+        """With a token set, only the matching header value triggers profiling."""
+        async with self._client(store, monkeypatch, profiling_token="s3cret") as client:
+            await client.get("/fast", headers={"X-Analyst-Profile": "1"})
+            response = await client.get("/fast", headers={"X-Analyst-Profile": "s3cret"})
+
+        assert [meta["id"] for meta in store.list()] == [response.headers["x-profile-id"]]
+
+    @pytest.mark.asyncio
+    async def test_slow_threshold_keeps_only_slow_requests(self, store, monkeypatch):
+        """Threshold mode discards profiles of requests under the threshold."""
+        async with self._client(store, monkeypatch, profiling_slow_ms=25) as client:
+            await client.get("/fast")
+            await client.get("/slow")
+
+        profiles = store.list()
+        assert [(meta["path"], meta["reason"]) for meta in profiles] == [("/slow", "slow")]
+
+    def test_store_is_bounded_and_rejects_unsafe_ids(self, store):
+        """Oldest profiles are pruned past max_files; ids cannot escape the directory."""
+        for index in range(5):
+            store.save(f"p{index}", "<html></html>", {"created_at": index})
+
+        assert len(store.list()) == 3
+        assert store.path_for("../etc/passwd") is None
+        assert store.path_for("missing") is None
@@ -0,0 +1,91 @@
+import pytest
+from services.analyst.analyst.core.prompt_assembler import PromptAssembler, PromptTemplateCache
+
+
+class TestPromptAssembler:
+    """Test compiled prompt template caching."""
+
+    @pytest.fixture
+    def guardrail_rows(self):
+        return [
+            {
+                "name": "default-guardrails",
+                "json_schema": {"max_change_pct": 0.15, "min_price": 2.0}
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_build_system_prompt_uses_cached_template(self, mock_db, guardrail_rows):
+        """Repeat builds for a zone only interpolate dynamic sections."""
+        mock_db.fetchrow.side_effect = [None, {"system_prompt": "Global prompt"}]
+        mock_db.fetch.return_value = guardrail_rows
+
+        assembler = PromptAssembler(mock_db, cache=PromptTemplateCache(ttl_seconds=300))
+
+        first = await assembler.build_system_prompt("z-110")
+        second = await assembler.build_system_prompt(
+            "z-110",
+            relevant_memories=[{"kind": "canonical", "topic": "pricing", "content": "Fridays run hot"}]
+        )
+
+        assert first.startswith("Global prompt")
+        assert "Maximum price change: 15.0%" in first
+        assert "[CANONICAL/pricing] Fridays run hot" in second
+        assert mock_db.fetchrow.call_count == 2
+        assert mock_db.fetch.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_recompile(self, mock_db, guardrail_rows):
+        """Activation invalidates the cache so the next build reloads the prompt."""
+        mock_db.fetchrow.side_effect = [
+            {"system_prompt": "Zone prompt v1"},
+            {"system_prompt": "Zone prompt v2"},
+        ]
+        mock_db.fetch.return_value = guardrail_rows
+
+        cache = PromptTemplateCache(ttl_seconds=300)
+        assembler = PromptAssembler(mock_db, cache=cache)
+
+        assert (await assembler.build_system_prompt("z-110")).startswith("Zone prompt v1")
+
+        cache.invalidate()
+
+        assert (await assembler.build_system_prompt("z-110")).startswith("Zone prompt v2")
+
+    def test_stale_generation_is_not_cached(self):
+        """A load that raced with an invalidation must not be stored."""
+        from services.analyst.analyst.core.prompt_assembler import CompiledPromptTemplate
+
+        cache = PromptTemplateCache(ttl_seconds=300)
+        generation = cache.generation
+        cache.invalidate()
+
+        cache.put("z-110", CompiledPromptTemplate("stale", ""), generation)
+
+        assert cache.get("z-110") is None
+
+    @pytest.mark.asyncio
+    async def test_load_error_is_not_cached(self, mock_db, guardrail_rows):
+        """A transient guardrail load failure falls back for that call only."""
+        mock_db.fetchrow.return_value = {"system_prompt": "Zone prompt"}
+        mock_db.fetch.side_effect = [ConnectionError("pool exhausted"), guardrail_rows]
+
+        cache = PromptTemplateCache(ttl_seconds=300)
+        assembler = PromptAssembler(mock_db, cache=cache)
+
+        fallback = await assembler.build_system_prompt(
+            "z-110",
+            context_data={"current_rates": [{"daypart": "morning", "tiers": [{"rate_per_hour": 5.5}]}]},
+            relevant_memories=[{"kind": "canonical", "topic": "pricing", "content": "Fridays run hot"}]
+        )
+        assert fallback.startswith("You are Level Analyst")
+        assert "Guardrails are unavailable" in fallback
+        assert "Zone: z-110" in fallback
+        assert "Morning rates: Starting at $5.50/hour" in fallback
+        assert "[CANONICAL/pricing] Fridays run hot" in fallback
+        assert "## OUTPUT REQUIREMENTS" in fallback
+        assert cache.get("z-110") is None
+
+        recovered = await assembler.build_system_prompt("z-110")
+        assert recovered.startswith("Zone prompt")
+        assert "Maximum price change: 15.0%" in recovered
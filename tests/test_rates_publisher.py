@@ -0,0 +1,109 @@
+import httpx
+import pytest
+from uuid import uuid4
+from services.analyst.analyst.core.rates_publisher import (
+    CLAIM_LOCK_ID,
+    CLAIM_QUERY,
+    EXPIRE_QUERY,
+    MARK_FAILED_QUERY,
+    MARK_SENT_QUERY,
+    RatesPublisher,
+    enqueue_rate_changes,
+)
+from tests.rates_api_stub import RatesApiStub
+
+
+class TestRatesPublisher:
+    """Test the rate change outbox and its batched publisher."""
+
+    @pytest.fixture
+    def stub(self):
+        return RatesApiStub()
+
+    def _publisher(self, mock_db, stub, **kwargs):
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub.app), base_url="http://rates.test")
+        return RatesPublisher(mock_db, client=client, batch_size=2, max_in_flight=1, **kwargs)
+
+    def _outbox_rows(self, *keys):
+        return [
+            {
+                "id": index,
+                "idempotency_key": key,
+                "attempts": 1,
+                "payload": {"idempotency_key": key, "zone_id": "z-110", "price": 5.5},
+            }
+            for index, key in enumerate(keys, start=1)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_enqueue_writes_one_row_per_change(self, mock_db):
+        """Outbox rows are written in one statement with deterministic idempotency keys."""
+        change = {"id": uuid4(), "zone_id": "z-110", "location_id": None,
+                  "prev_price": 5.0, "new_price": 5.5, "revert_to": None}
+
+        await enqueue_rate_changes(mock_db.connection, [change], "revert")
+
+        args = mock_db.connection.execute.call_args[0]
+        assert "INSERT INTO rate_change_outbox" in args[0]
+        assert args[5] == [f"{change['id']}:revert"]
+        assert args[4][0]["price"] == 5.0
+
+    @pytest.mark.asyncio
+    async def test_drain_retries_transient_failure_with_same_idempotency_key(self, mock_db, stub):
+        """A 503 is retried in-process and the batch is then marked sent."""
+        stub.fail_next = [503]
+        mock_db.connection.fetch.side_effect = [self._outbox_rows("a:apply", "b:apply"), []]
+
+        totals = await self._publisher(mock_db, stub).drain()
+
+        assert totals == {"sent": 2, "failed": 0, "retry": 0}
+        assert len(stub.requests) == 2
+        keys = {request["headers"]["idempotency-key"] for request in stub.requests}
+        assert len(keys) == 1
+        assert set(stub.applied) == {"a:apply", "b:apply"}
+        mock_db.execute.assert_called_once_with(MARK_SENT_QUERY, [1, 2])
+
+    @pytest.mark.asyncio
+    async def test_rejected_items_are_marked_failed(self, mock_db, stub):
+        """Items the API rejects individually do not block the rest of the batch."""
+        stub.reject_keys = {"b:apply"}
+        mock_db.connection.fetch.side_effect = [self._outbox_rows("a:apply", "b:apply"), []]
+
+        totals = await self._publisher(mock_db, stub).drain()
+
+        assert totals == {"sent": 1, "failed": 1, "retry": 0}
+        executed = [call[0][:2] for call in mock_db.execute.call_args_list]
+        assert (MARK_SENT_QUERY, [1]) in executed
+        assert (MARK_FAILED_QUERY, [2]) in executed
+
+    @pytest.mark.asyncio
+    async def test_claim_runs_under_the_lock_in_one_transaction(self, mock_db, stub):
+        """The claim lock, the expiry and the claim itself share one transaction."""
+        log = []
+        conn = mock_db.connection
+
+        class _Transaction:
+            async def __aenter__(self_inner):
+                log.append("BEGIN")
+
+            async def __aexit__(self_inner, exc_type, exc, tb):
+                log.append("COMMIT")
+                return False
+
+        async def execute(query, *args):
+            log.append(query)
+            return "UPDATE 2" if query == EXPIRE_QUERY else "SELECT 1"
+
+        async def fetch(query, *args):
+            log.append(query)
+            return list(reversed(self._outbox_rows("a:apply", "a:revert")))
+
+        conn.transaction = lambda: _Transaction()
+        conn.execute.side_effect = execute
+        conn.fetch.side_effect = fetch
+
+        rows = await self._publisher(mock_db, stub)._claim()
+
+        assert log == ["BEGIN", "SELECT pg_advisory_xact_lock($1)", EXPIRE_QUERY, CLAIM_QUERY, "COMMIT"]
+        assert conn.execute.call_args_list[0][0][1] == CLAIM_LOCK_ID
+        assert [row["id"] for row in rows] == [1, 2]
@@ -0,0 +1,84 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from services.analyst.analyst.db import Database
+from services.analyst.analyst.server_timing import ServerTimingMiddleware, TimedJSONResponse, record, timed
+
+
+class FakeConnection:
+    async def fetch(self, query, *args):
+        await asyncio.sleep(0.001)
+        return [{"id": 1}]
+
+
+class FakePool:
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection()
+
+
+def _metrics(header):
+    """{'sql': 'sql;dur=1.00;desc="2 calls"', ...}"""
+    return {part.split(";", 1)[0]: part for part in header.split(", ")}
+
+
+class TestServerTiming:
+    """Test the Server-Timing accumulator, header and debug envelope."""
+
+    def _client(self, debug_envelope=False):
+        db = Database()
+        db._pool = FakePool()
+
+        async def insights(request):
+            with timed("auth"):
+                pass
+            rows = await db.fetch("SELECT * FROM insights")
+            rows += await db.fetch("SELECT * FROM insights")
+            record("llm", 0.25)
+            return TimedJSONResponse(rows)
+
+        async def text(request):
+            return PlainTextResponse("ok")
+
+        app = Starlette(routes=[Route("/insights", insights), Route("/text", text)])
+        app.add_middleware(ServerTimingMiddleware, debug_envelope=debug_envelope)
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    @pytest.mark.asyncio
+    async def test_header_breaks_down_request_time(self):
+        """Database, auth, LLM and serialization time is reported per request."""
+        async with self._client() as client:
+            response = await client.get("/insights")
+            plain = await client.get("/text")
+
+        metrics = _metrics(response.headers["server-timing"])
+        assert list(metrics) == ["auth", "db-acquire", "sql", "llm", "serialize", "total"]
+        assert metrics["sql"].endswith('desc="2 calls"')
+        assert metrics["llm"] == "llm;dur=250.00"
+        assert response.json() == [{"id": 1}, {"id": 1}]
+        # Every response gets the header, even with nothing recorded
+        assert _metrics(plain.headers["server-timing"])["sql"] == "sql;dur=0.00"
+
+    @pytest.mark.asyncio
+    async def test_debug_envelope_only_when_enabled_and_requested(self):
+        """The JSON envelope needs both the setting and the request header."""
+        async with self._client() as client:
+            disabled = await client.get("/insights", headers={"X-Timing-Debug": "1"})
+        async with self._client(debug_envelope=True) as client:
+            unrequested = await client.get("/insights")
+            wrapped = await client.get("/insights", headers={"X-Timing-Debug": "1"})
+
+        assert disabled.json() == unrequested.json() == [{"id": 1}, {"id": 1}]
+        body = wrapped.json()
+        assert body["data"] == [{"id": 1}, {"id": 1}]
+        assert body["timing"]["sql"]["count"] == 2
+        assert body["timing"]["total_ms"] >= body["timing"]["sql"]["ms"]
+        assert int(wrapped.headers["content-length"]) == len(wrapped.content)
+        assert json.loads(wrapped.content) == body
@@ -0,0 +1,113 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from services.analyst.analyst import observability
+from services.analyst.analyst.core.insight_generator import InsightGenerator
+from services.analyst.analyst.db import Database
+from services.analyst.analyst.observability import llm_span, record_llm_usage, statement_name
+
+
+class FakeConnection:
+    async def fetch(self, query, *args):
+        return [{"id": 1}, {"id": 2}]
+
+    async def execute(self, query, *args):
+        return "UPDATE 3"
+
+
+class FakePool:
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection()
+
+
+class TestTracing:
+    """Test the child spans around database, LLM and refresh work."""
+
+    @pytest.fixture
+    def exporter(self, monkeypatch):
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        monkeypatch.setattr(observability.settings, "observability_tracing_enabled", True)
+        monkeypatch.setattr(observability, "_tracer", lambda: provider.get_tracer("test"))
+        return exporter
+
+    def test_statement_name_is_operation_and_table(self):
+        """Statement names ignore whitespace, parameters and function calls."""
+        assert statement_name("\n  select * from insights where zone_id = $1") == "SELECT insights"
+        assert statement_name("INSERT INTO recommendations (id) VALUES ($1)") == "INSERT recommendations"
+        assert statement_name("SELECT x FROM unnest($1::text[]) AS x") == "SELECT"
+        assert statement_name("SELECT pg_advisory_lock($1)") == "SELECT"
+
+    @pytest.mark.asyncio
+    async def test_database_calls_record_statement_and_rows(self, exporter):
+        """Every Database call gets a span named after its statement with the row count."""
+        db = Database()
+        db._pool = FakePool()
+
+        await db.fetch("SELECT * FROM insights WHERE zone_id = $1", "z-1")
+        await db.execute("UPDATE insights SET status = 'approved'")
+
+        fetch_span, execute_span = exporter.get_finished_spans()
+        assert fetch_span.name == "SELECT insights"
+        assert fetch_span.attributes["db.system"] == "postgresql"
+        assert fetch_span.attributes["db.row_count"] == 2
+        assert execute_span.name == "UPDATE insights"
+        assert execute_span.attributes["db.row_count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_no_spans_when_tracing_disabled(self, exporter, monkeypatch):
+        """With tracing off the helpers hand out a no-op span."""
+        monkeypatch.setattr(observability.settings, "observability_tracing_enabled", False)
+        db = Database()
+        db._pool = FakePool()
+
+        assert await db.fetch("SELECT * FROM insights") == [{"id": 1}, {"id": 2}]
+        assert exporter.get_finished_spans() == ()
+
+    def test_llm_span_records_model_and_tokens(self, exporter):
+        """LLM spans carry the requested model and the token usage of the response."""
+        response = SimpleNamespace(model="gpt-4o-mini-2024", usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+
+        with llm_span("gpt-4o-mini") as span:
+            record_llm_usage(span, response)
+
+        (finished,) = exporter.get_finished_spans()
+        assert finished.attributes["gen_ai.request.model"] == "gpt-4o-mini"
+        assert finished.attributes["gen_ai.response.model"] == "gpt-4o-mini-2024"
+        assert finished.attributes["gen_ai.usage.input_tokens"] == 120
+        assert finished.attributes["gen_ai.usage.output_tokens"] == 30
+
+    @pytest.mark.asyncio
+    async def test_insight_generation_spans_per_zone_and_type(self, exporter, mock_db):
+        """Each zone gets a span with one child per insight type."""
+        generator = InsightGenerator(mock_db)
+
+        async def no_insights(*args):
+            return []
+
+        async def zone_statistics(zone_id):
+            return {"total_transactions": 10}
+
+        generator._clear_existing_insights = no_insights
+        generator._analyze_cross_zone_patterns = no_insights
+        generator._get_zone_statistics = zone_statistics
+        for name in ("volume", "duration", "revenue", "pattern", "occupancy"):
+            setattr(generator, f"_generate_{name}_insights", no_insights)
+        generator._generate_basic_zone_insight = no_insights
+
+        await generator.generate_insights_for_all_zones(["z-1", "z-2"])
+
+        spans = exporter.get_finished_spans()
+        zone_spans = [span for span in spans if span.name == "insights.zone"]
+        type_spans = [span for span in spans if span.name == "insights.type"]
+        assert [span.attributes["zone_id"] for span in zone_spans] == ["z-1", "z-2"]
+        assert len(type_spans) == 12
+        assert {span.parent.span_id for span in type_spans} == {span.context.span_id for span in zone_spans}
+        assert {span.attributes["insight_type"] for span in type_spans} >= {"volume", "basic_zone"}
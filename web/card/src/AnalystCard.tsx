@@ -23,6 +23,8 @@ export default function AnalystCard() {
   const [priceChanges, setPriceChanges] = useState<PriceChange[]>([])
   const [isLoading, setIsLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
+  const [isRefreshing, setIsRefreshing] = useState(false)
+  const [refreshProgress, setRefreshProgress] = useState<string | null>(null)
   const [selectedInsight, setSelectedInsight] = useState<Insight | null>(null)
   const [isDrawerOpen, setIsDrawerOpen] = useState(false)
   const [isGeneralChatOpen, setIsGeneralChatOpen] = useState(false)
@@ -59,24 +61,25 @@ export default function AnalystCard() {
     setError(null)
 
     try {
-      // Load insights first so daily refresh completes before dependent requests
-      const insightsRes = await apiClient.getInsights({ refresh })
-
-      // Load recommendations and price changes in parallel once insights are available
-      const [recsRes, changesRes] = await Promise.all([
-        apiClient.getRecommendations({ refresh }),
-        apiClient.getPriceChanges(),
-      ])
-
-      if (insightsRes.success && insightsRes.data) {
-        console.log(`🔥 Fresh insights loaded: ${insightsRes.data.insights?.length || 0} total, zones:`,
-          [...new Set(insightsRes.data.insights?.map(i => i.zone_id) || [])].sort())
-        setInsights(insightsRes.data.insights || [])
+      // One round trip: the server refreshes once and loads every section concurrently
+      const dashboardRes = await apiClient.getDashboard({ refresh })
+
+      if (!dashboardRes.success || !dashboardRes.data) {
+        setError(dashboardRes.error || 'Failed to load dashboard')
+        return
+      }
+
+      const dashboard = dashboardRes.data
+
+      if (dashboard.insights) {
+        console.log(`🔥 Fresh insights loaded: ${dashboard.insights.length} total, zones:`,
+          [...new Set(dashboard.insights.map(i => i.zone_id))].sort())
+        setInsights(dashboard.insights)
       }
 
-      if (recsRes.success && recsRes.data) {
+      if (dashboard.recommendations) {
         // Sort recommendations by expected ROI/return (highest first)
-        const sortedRecs = (recsRes.data.recommendations || []).sort((a, b) => {
+        const sortedRecs = dashboard.recommendations.sort((a, b) => {
           const aReturn = a.expected_lift_json?.expected_return || a.expected_lift_json?.revenue_lift || 0
           const bReturn = b.expected_lift_json?.expected_return || b.expected_lift_json?.revenue_lift || 0
           return bReturn - aReturn
@@ -84,18 +87,15 @@ export default function AnalystCard() {
         setRecommendations(sortedRecs)
       }
 
-      if (changesRes.success && changesRes.data) {
-        setPriceChanges(changesRes.data.changes || [])
+      if (dashboard.changes) {
+        setPriceChanges(dashboard.changes)
       }
 
-      // Check for any errors
-      const hasErrors = [insightsRes, recsRes, changesRes].some(res => !res.success)
-      if (hasErrors) {
-        const errorMessages = [insightsRes, recsRes, changesRes]
-          .filter(res => !res.success)
-          .map(res => res.error)
-          .join('; ')
-        setError(errorMessages)
+      // Sections that failed server-side come back null with a message
+      const errorMessages = Object.entries(dashboard.errors || {})
+        .map(([section, message]) => `${section}: ${message}`)
+      if (errorMessages.length > 0) {
+        setError(errorMessages.join('; '))
       }
     } catch (err) {
       setError('Failed to load data from API')
@@ -105,6 +105,55 @@ export default function AnalystCard() {
     }
   }
 
+  // Streams refresh progress; insights and recommendations appear as they are published
+  const refreshData = async () => {
+    setIsRefreshing(true)
+    setError(null)
+    const controller = new AbortController()
+    let runId: string | null = null
+
+    try {
+      const onRunId = (id: string) => { runId = id }
+      await apiClient.streamEvents({ refresh: true, signal: controller.signal, onRunId }, (event) => {
+        // Other viewers' refreshes of the same zones share this stream
+        if (event.type.startsWith('refresh.') && event.data?.run_id !== runId) return
+        switch (event.type) {
+          case 'refresh.started':
+            if (event.data.insights) setInsights([])
+            if (event.data.recommendations) setRecommendations([])
+            break
+          case 'refresh.progress':
+            setRefreshProgress(`Analyzing ${event.data.stage}: ${event.data.done}/${event.data.total} zones`)
+            break
+          case 'insight.created':
+            setInsights(prev => [event.data as Insight, ...prev])
+            break
+          case 'recommendation.created':
+            setRecommendations(prev => [event.data as Recommendation, ...prev])
+            break
+          case 'refresh.failed':
+            setError(`Refresh failed: ${event.data.error}`)
+            controller.abort()
+            break
+          case 'refresh.completed':
+            controller.abort()
+            break
+        }
+      })
+    } catch (err) {
+      if (!controller.signal.aborted) {
+        setError('Refresh stream failed')
+        console.error('Refresh stream error:', err)
+      }
+    } finally {
+      setRefreshProgress(null)
+      setIsRefreshing(false)
+    }
+
+    // Reconcile with the stored lists (full rows, server ordering)
+    await loadData()
+  }
+
   const handleDiscussInsight = (insight: Insight) => {
     setSelectedInsight(insight)
     setIsDrawerOpen(true)
@@ -210,12 +259,12 @@ export default function AnalystCard() {
             </button>
 
             <button
-              onClick={() => loadData({ refresh: true })}
-              disabled={isLoading}
+              onClick={refreshData}
+              disabled={isLoading || isRefreshing}
               className="flex items-center space-x-2 px-4 py-2 bg-gray-100 text-gray-700 rounded-lg hover:bg-gray-200 disabled:opacity-50 transition-colors"
             >
-              <RefreshCw className={`w-4 h-4 ${isLoading ? 'animate-spin' : ''}`} />
-              <span>Refresh</span>
+              <RefreshCw className={`w-4 h-4 ${isLoading || isRefreshing ? 'animate-spin' : ''}`} />
+              <span>{refreshProgress || 'Refresh'}</span>
             </button>
 
             <button
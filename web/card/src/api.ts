@@ -43,8 +43,25 @@ export interface PriceChange {
   created_at: string
 }
 
+export interface Dashboard {
+  insights: Insight[] | null
+  recommendations: Recommendation[] | null
+  changes: PriceChange[] | null
+  zone_summary: any
+  guardrails: { name: string; schema: any }[] | null
+  errors: Record<string, string>
+}
+
+export interface AnalystEvent {
+  id: string
+  type: string
+  data: any
+}
+
 class ApiClient {
   private token: string | null = null
+  // Last body per GET endpoint, revalidated with If-None-Match
+  private etagCache = new Map<string, { etag: string; data: any }>()
 
   setToken(token: string) {
     this.token = token
@@ -55,6 +72,8 @@ class ApiClient {
     options: RequestInit = {}
   ): Promise<ApiResponse<T>> {
     const url = `${API_BASE_URL}${endpoint}`
+    const method = (options.method || 'GET').toUpperCase()
+    const cached = method === 'GET' ? this.etagCache.get(endpoint) : undefined
 
     const headers = {
       'Content-Type': 'application/json',
@@ -62,6 +81,7 @@ class ApiClient {
       'Pragma': 'no-cache',
       'Expires': '0',
       ...(this.token && { Authorization: `Bearer ${this.token}` }),
+      ...(cached && { 'If-None-Match': cached.etag }),
       ...options.headers,
     }
 
@@ -71,11 +91,22 @@ class ApiClient {
         headers,
       })
 
+      if (response.status === 304 && cached) {
+        return {
+          success: true,
+          data: cached.data
+        }
+      }
+
       if (!response.ok) {
         throw new Error(`HTTP ${response.status}: ${response.statusText}`)
       }
 
       const data = await response.json()
+      const etag = response.headers.get('ETag')
+      if (method === 'GET' && etag) {
+        this.etagCache.set(endpoint, { etag, data })
+      }
       return {
         success: true,
         data: data
@@ -89,6 +120,66 @@ class ApiClient {
     }
   }
 
+  async getDashboard(options: { refresh?: boolean } = {}): Promise<ApiResponse<Dashboard>> {
+    const params = new URLSearchParams()
+    if (options.refresh) params.append('refresh', 'true')
+
+    const query = params.toString()
+    return this.request(`/dashboard/${query ? `?${query}` : ''}`)
+  }
+
+  // Server-Sent Events read through fetch, since EventSource cannot send the Authorization header
+  async streamEvents(
+    options: { refresh?: boolean; signal?: AbortSignal; onRunId?: (runId: string) => void },
+    onEvent: (event: AnalystEvent) => void
+  ): Promise<void> {
+    const params = new URLSearchParams()
+    if (options.refresh) params.append('refresh', 'true')
+
+    const query = params.toString()
+    const response = await fetch(`${API_BASE_URL}/events/stream${query ? `?${query}` : ''}`, {
+      headers: {
+        Accept: 'text/event-stream',
+        ...(this.token && { Authorization: `Bearer ${this.token}` }),
+      },
+      signal: options.signal,
+    })
+
+    if (!response.ok || !response.body) {
+      throw new Error(`HTTP ${response.status}: ${response.statusText}`)
+    }
+    // id of the refresh this stream started; its refresh.* events carry it as data.run_id
+    const runId = response.headers.get('X-Refresh-Run-Id')
+    if (runId) options.onRunId?.(runId)
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+    let buffer = ''
+    while (true) {
+      const { value, done } = await reader.read()
+      if (done) return
+      buffer += value
+
+      let boundary = buffer.indexOf('\n\n')
+      while (boundary >= 0) {
+        const block = buffer.slice(0, boundary)
+        buffer = buffer.slice(boundary + 2)
+        boundary = buffer.indexOf('\n\n')
+
+        const event: AnalystEvent = { id: '', type: 'message', data: null }
+        let data = ''
+        for (const line of block.split('\n')) {
+          if (line.startsWith('id: ')) event.id = line.slice(4)
+          else if (line.startsWith('event: ')) event.type = line.slice(7)
+          else if (line.startsWith('data: ')) data += line.slice(6)
+        }
+        if (data) {
+          event.data = JSON.parse(data)
+          onEvent(event)
+        }
+      }
+    }
+  }
+
   async getInsights(options: { zoneId?: string; refresh?: boolean } = {}): Promise<ApiResponse<{ insights: Insight[]; total: number }>> {
     const params = new URLSearchParams()
     if (options.zoneId) params.append('zone_id', options.zoneId)